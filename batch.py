@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Make the modules folder importable when running from the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modules'))
+
+from batch_utils import run_batch
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute returns for a batch of taxpayer records")
+    parser.add_argument("source", help="Directory of taxpayer JSON files, a JSONL file, - for stdin, or a single JSON file")
+    parser.add_argument("--output", "-o", help="Results file (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv", "parquet"), default=None,
+                        help="Output format (default: from the --output extension, else jsonl). "
+                             "csv and parquet collect every line into columns and write them at the end")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--chunksize", type=int, default=64, help="Records per worker task (default: 64)")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="SQLite result cache; households already in it are not recomputed")
+    parser.add_argument("--cache-max-mb", type=float, default=None,
+                        help="Evict least recently used cache entries beyond this size (default: 256)")
+    parser.add_argument("--cents", action="store_true",
+                        help="Compute every line in integer cents, so amounts are exact to the cent")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print time spent per form line and form function across all workers")
+    args = parser.parse_args(argv)
+
+    profile = None
+    if args.profile:
+        from instrument_utils import MemorySink
+        profile = MemorySink()
+
+    cache = counters_before = None
+    cache_max_bytes = int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None
+    if args.cache:
+        from cache_utils import ResultCache
+        cache = ResultCache(args.cache, cache_max_bytes) if cache_max_bytes else ResultCache(args.cache)
+        counters_before = cache.stored_counters()
+
+    output_format = args.format
+    if output_format is None:
+        extension = os.path.splitext(args.output or "")[1].lstrip(".")
+        output_format = extension if extension in ("csv", "parquet") else "jsonl"
+    if output_format == "parquet":
+        if not args.output:
+            parser.error("--format parquet needs --output")
+        try:
+            import pyarrow
+        except ImportError:
+            parser.error("--format parquet needs pyarrow (pip install pyarrow); use --format csv instead")
+
+    processed = errors = 0
+    start = time.perf_counter()
+    if output_format == "jsonl":
+        output = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            for result in run_batch(args.source, workers=args.workers, chunksize=args.chunksize,
+                                    cache_path=args.cache, cache_max_bytes=cache_max_bytes, profile=profile,
+                                    cents=args.cents):
+                processed += 1
+                if "error" in result:
+                    errors += 1
+                output.write(json.dumps(result) + "\n")
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    else:
+        from column_utils import ColumnSink
+        sink = ColumnSink()
+        for record_id, values, error in run_batch(args.source, workers=args.workers, chunksize=args.chunksize,
+                                                  cache_path=args.cache, cache_max_bytes=cache_max_bytes,
+                                                  values=True, profile=profile, cents=args.cents):
+            sink.append(record_id, values, error)
+        processed, errors = len(sink), sink.error_count
+        if output_format == "parquet":
+            sink.write_parquet(args.output)
+        else:
+            sink.write_csv(args.output or sys.stdout)
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed else 0
+    print(f"Processed {processed:,} records ({errors:,} errors) in {elapsed:.2f}s, {rate:,.0f} records/s",
+          file=sys.stderr)
+    if profile is not None:
+        profile.report(sys.stderr)
+    if cache is not None:
+        counters = {name: value - counters_before[name] for name, value in cache.stored_counters().items()}
+        summary = cache.summary(counters)
+        cache.close()
+        print(f"Cache: {summary['hits']:,} hits, {summary['misses']:,} misses ({summary['hit_rate']:.1%}), "
+              f"{summary['line_hits']:,} line hits, {summary['evictions']:,} evictions, "
+              f"{summary['entries']:,} entries ({summary['bytes'] / 1024 / 1024:.1f} MB)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
+import os
+import sys
+
+# Make the modules folder importable when running from the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modules'))
+
 # Import the functions from the module where they're saved
-from tax_utils import get_tax_value, adjust_for_standard_deduction
+from tax_utils import compute_tax, adjust_for_standard_deduction
 
 # Define parameters for the function call
 total_income = 40200  # Example income
@@ -10,8 +16,8 @@ try:
     adjusted_gross_income = adjust_for_standard_deduction(total_income, filing_status)
     taxable_income = adjusted_gross_income
     
-    # Calculate tax value based on adjusted income
-    tax_value = get_tax_value(taxable_income, filing_status)
+    # Calculate tax value based on adjusted income using the shared tax table index
+    tax_value = compute_tax(taxable_income, filing_status)
     print(f"Total income is ${total_income:,}, taxable income is ${taxable_income:,}, and tax is ${tax_value:,}.")
 except ValueError as e:
     print(f"Error: {e}")
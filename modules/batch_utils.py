@@ -0,0 +1,234 @@
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from functools import partial
+from itertools import islice
+
+from return_utils import RETURN_LINES, compute_return, compute_return_values
+from cents_utils import from_cents
+from data_utils import read_file
+from instrument_utils import instrumented
+from record_utils import load_household
+from table_utils import get_tax_table, get_rate_schedule, get_standard_deductions
+
+def iter_record_sources(source):
+    """
+    List the household records in a batch source without parsing them.
+
+    Args:
+        source (str): A directory of taxpayer_information-style JSON files, a JSONL file
+                      with one record per line, "-" to read JSONL from stdin, or a single JSON file.
+
+    Yields:
+        tuple: (record_id, kind, payload) where kind is "file" (payload is a path)
+               or "line" (payload is the raw JSON text).
+    """
+    if source == "-":
+        for line_number, line in enumerate(sys.stdin, start=1):
+            if line.strip():
+                yield f"stdin:{line_number}", "line", line
+    elif os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith(".json"):
+                yield name, "file", os.path.join(source, name)
+    elif source.endswith(".jsonl"):
+        name = os.path.basename(source)
+        with open(source, 'r') as file:
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield f"{name}:{line_number}", "line", line
+    else:
+        yield os.path.basename(source), "file", source
+
+def warm_tables():
+    """Load the shared read-only tax tables so later lookups do no I/O"""
+    get_tax_table()
+    get_rate_schedule()
+    get_standard_deductions()
+
+# Per-process result cache, opened by init_worker when a batch runs with a cache file
+_RESULT_CACHE = None
+
+def init_worker(cache_path=None, cache_max_bytes=None, profile_dir=None):
+    """
+    Pool initializer: load the tax tables and, if cache_path is given, open the result
+    cache. The cache is flushed when the worker exits.
+
+    With profile_dir, the worker's calls are instrumented into a MemorySink whose totals
+    are written to profile_dir when the worker exits (see run_batch's profile).
+    """
+    global _RESULT_CACHE
+    warm_tables()
+    if cache_path:
+        from multiprocessing.util import Finalize
+        from cache_utils import ResultCache
+        _RESULT_CACHE = ResultCache(cache_path, cache_max_bytes) if cache_max_bytes else ResultCache(cache_path)
+        Finalize(_RESULT_CACHE, _RESULT_CACHE.close, exitpriority=10)
+    if profile_dir:
+        from multiprocessing.util import Finalize
+        from instrument_utils import MemorySink, add_sink
+        sink = add_sink(MemorySink())
+        Finalize(sink, _write_profile, args=(sink, os.path.join(profile_dir, f"worker-{os.getpid()}.json")),
+                 exitpriority=10)
+
+def _write_profile(sink, path):
+    with open(path, 'w') as file:
+        json.dump(sink.totals, file)
+
+def close_worker():
+    """Flush and close this process's result cache, if any"""
+    global _RESULT_CACHE
+    if _RESULT_CACHE is not None:
+        _RESULT_CACHE.close()
+        _RESULT_CACHE = None
+
+@instrumented("batch.load_record")
+def _load_record(kind, payload):
+    # Household files are read through data_utils so profiles count their I/O
+    if kind == "file":
+        payload = read_file(payload)
+    return load_household(payload)
+
+def process_record(item, cents=False):
+    """
+    Parse, validate (record_utils.load_household) and compute one record, isolating
+    any error to that record.
+
+    Args:
+        item (tuple): (record_id, kind, payload) from iter_record_sources
+        cents (bool): Compute in integer cents (compute_return(..., cents=True)) and report
+                      dollar amounts that are exact to the cent
+
+    Returns:
+        dict: {"record_id", ...return lines} on success, {"record_id", "error"} on failure.
+    """
+    record_id, kind, payload = item
+    try:
+        household = _load_record(kind, payload)
+        if _RESULT_CACHE is None:
+            result = compute_return(household, cents)
+        else:
+            result = _RESULT_CACHE.compute_return(household, cents)
+    except Exception as e:
+        return {"record_id": record_id, "error": f"{type(e).__name__}: {e}"}
+    if cents:
+        return {"record_id": record_id, **{name: from_cents(value) for name, value in result.items()}}
+    return {"record_id": record_id, **result}
+
+def process_record_values(item, cents=False):
+    """
+    process_record for columnar output: no dict per record.
+
+    Returns:
+        tuple: (record_id, values, None) with one value per name in RETURN_LINES on
+               success, (record_id, None, error message) on failure.
+    """
+    record_id, kind, payload = item
+    try:
+        household = _load_record(kind, payload)
+        if _RESULT_CACHE is None:
+            values = compute_return_values(household, cents)
+        else:
+            result = _RESULT_CACHE.compute_return(household, cents)
+            values = tuple(result[name] for name in RETURN_LINES)
+    except Exception as e:
+        return record_id, None, f"{type(e).__name__}: {e}"
+    if cents:
+        values = tuple(map(from_cents, values))
+    return record_id, values, None
+
+def _map_chunk(func, chunk):
+    # Module-level so the pool can pickle it
+    return [func(item) for item in chunk]
+
+def bounded_imap(pool, func, items, chunksize=1, max_pending=None):
+    """
+    pool.imap with a bound on the work submitted ahead of the consumer.
+
+    Pool.imap reads the whole input in a feeder thread and keeps every result the
+    consumer has not taken yet, so a large input or a slow consumer grows the parent
+    without limit. Here items are read only as chunks are submitted, and at most
+    max_pending chunks are running or waiting to be taken at any time.
+
+    Args:
+        max_pending (int): Chunks in flight. Defaults to two per CPU.
+
+    Yields:
+        func(item) for every item, in input order.
+    """
+    max_pending = max_pending or 2 * (os.cpu_count() or 1)
+    items = iter(items)
+    pending = deque()
+    while True:
+        while len(pending) < max_pending:
+            chunk = list(islice(items, chunksize))
+            if not chunk:
+                break
+            pending.append(pool.apply_async(_map_chunk, (func, chunk)))
+        if not pending:
+            return
+        yield from pending.popleft().get()
+
+def run_batch(source, workers=None, chunksize=64, cache_path=None, cache_max_bytes=None, values=False,
+              profile=None, cents=False):
+    """
+    Compute returns for every record in source across a process pool.
+
+    The tables are loaded in the parent before the pool starts, so forked workers share
+    them copy-on-write (and the compiled data file is shared through the page cache).
+    Results stream back in input order. Records are read as they are sent to the workers,
+    with at most two chunks per worker in flight (see bounded_imap).
+
+    Args:
+        source (str): Directory, JSONL file or JSON file (see iter_record_sources)
+        workers (int): Number of worker processes. None uses every CPU; 1 runs in-process.
+        chunksize (int): Records sent to a worker per task
+        cache_path (str): Optional cache_utils.ResultCache file. Households already in it
+                          (for the current data files) are not recomputed.
+        cache_max_bytes (int): Size limit for the cache file's entries
+        values (bool): Yield process_record_values tuples instead of dicts (for column_utils.ColumnSink)
+        profile (MemorySink): If given, every worker's instrumented calls (per form line,
+                              form and tax function) are added to it once the batch finishes
+        cents (bool): Compute every return in integer cents (see process_record)
+
+    Yields:
+        dict: One result per record (see process_record), or a tuple with values=True.
+    """
+    items = iter_record_sources(source)
+    process = process_record_values if values else process_record
+    if cents:
+        process = partial(process, cents=True)
+
+    if workers == 1:
+        from instrument_utils import add_sink, remove_sink
+        init_worker(cache_path, cache_max_bytes)
+        if profile is not None:
+            add_sink(profile)
+        try:
+            yield from map(process, items)
+        finally:
+            if profile is not None:
+                remove_sink(profile)
+            close_worker()
+        return
+
+    warm_tables()
+    import shutil
+    import tempfile
+    profile_dir = tempfile.mkdtemp(prefix="batch-profile-") if profile is not None else None
+    pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(cache_path, cache_max_bytes, profile_dir))
+    try:
+        yield from bounded_imap(pool, process, items, chunksize, 2 * (workers or os.cpu_count() or 1))
+        # Let the workers exit normally so their result caches are flushed and profiles written
+        pool.close()
+        pool.join()
+        if profile_dir:
+            for name in os.listdir(profile_dir):
+                with open(os.path.join(profile_dir, name), 'r') as file:
+                    profile.merge(json.load(file))
+    finally:
+        pool.terminate()
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from data_utils import CONFIG_PATH, PROJECT_ROOT, load_config
+from graph_utils import GRAPH_INPUTS, ReturnGraph
+from return_utils import RETURN_LINES, compute_return_cents
+from record_utils import dumps, loads, parse_household
+
+# Persistent result cache.
+#
+# Full return results and selected intermediate lines are stored in a SQLite file,
+# keyed by a hash of the normalized household inputs and the data version (a
+# hash of config.json and every tax data file it points to). Changing a tax table
+# therefore changes every key, and the stale entries are dropped when the cache is
+# next opened. Several processes may share one cache file.
+
+# Bump when a form calculation changes, to invalidate results computed by older code
+CACHE_FORMAT = 2
+DEFAULT_MAX_MB = 256
+
+# Intermediate lines cached on their own, so a household that differs only in inputs
+# these lines do not read (e.g. education expenses) reuses them
+CACHED_LINES = ("2441.line_11", "worksheet_a.line_5")
+
+# Writes and last-used updates are batched into one transaction per this many operations
+FLUSH_EVERY = 256
+
+_DATA_VERSION = None
+
+def data_version():
+    """Hash of config.json and every tax data file it references, computed once per process"""
+    global _DATA_VERSION
+    if _DATA_VERSION is None:
+        config = load_config()
+        paths = {path for key, path in config["data_paths"].items()
+                 if key not in ("taxpayer_information", "compiled_tables")}
+        for jurisdictions in config.get("tax_years", {}).values():
+            for year_paths in jurisdictions.values():
+                paths.update(year_paths.values())
+
+        digest = hashlib.sha256(f"format {CACHE_FORMAT}\0".encode())
+        for path in [CONFIG_PATH] + sorted(os.path.join(PROJECT_ROOT, path) for path in paths):
+            with open(path, 'rb') as file:
+                digest.update(os.path.relpath(path, PROJECT_ROOT).encode() + b"\0" + file.read())
+        _DATA_VERSION = digest.hexdigest()
+    return _DATA_VERSION
+
+def _normalized(name, value):
+    """
+    The part of an input value the forms actually read. Dependents reduce to an
+    order-independent tuple of (under 13, under 17, childcare cost), so names, TINs and
+    provider details do not split otherwise identical households.
+    """
+    if name == "dependents":
+        return tuple(sorted((dependent.under_13, dependent.under_17, dependent.annual_cost) for dependent in value))
+    return value
+
+def inputs_key(kind, inputs, version=None, names=None):
+    """
+    Canonical key for a set of graph inputs.
+
+    The inputs are JSON scalars (and the dependents tuple), so their repr in sorted name
+    order is canonical; int and float amounts stay distinct, as they do in the results.
+
+    Args:
+        kind (str): "return" or a line name, so different results never share a key
+        inputs (dict): Input name -> value, with dependents as Dependent records
+        names (list): Only key on these inputs (default: all of them)
+    """
+    canonical = repr((kind, version or data_version(),
+                      tuple((name, _normalized(name, inputs[name])) for name in sorted(names or inputs))))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+_LINE_INPUTS = {}
+
+def line_inputs(name):
+    """The graph inputs a line depends on, directly or indirectly"""
+    if name not in _LINE_INPUTS:
+        _LINE_INPUTS[name] = sorted(ReturnGraph(dict.fromkeys(GRAPH_INPUTS)).input_dependencies(name))
+    return _LINE_INPUTS[name]
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of return results and intermediate lines.
+
+    Entries are evicted least recently used first once their total size exceeds
+    max_bytes. Hit and miss counts are kept per instance (stats) and accumulated in
+    the file across processes (stored_counters).
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, version=None):
+        """
+        Args:
+            path (str): SQLite file, created if missing
+            max_bytes (int): Approximate size limit of the stored values
+            version (str): Data version the keys include. Defaults to data_version().
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version or data_version()
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self.pending_puts = {}
+        self.pending_touches = set()
+        self.stats = {"hits": 0, "misses": 0, "line_hits": 0, "line_misses": 0, "evictions": 0}
+        self._flushed = dict(self.stats)
+
+    def _create_schema(self):
+        with self._transaction():
+            self.connection.execute("CREATE TABLE IF NOT EXISTS entries "
+                                    "(key TEXT PRIMARY KEY, value TEXT, size INTEGER, last_used REAL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)")
+            stored = self.connection.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if stored is None or stored[0] != self.version:
+                # Entries for other data versions can never be hit again
+                self.connection.execute("DELETE FROM entries")
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('bytes', 0)")
+
+    def _transaction(self):
+        connection = self.connection
+        class Transaction:
+            def __enter__(self):
+                connection.execute("BEGIN IMMEDIATE")
+            def __exit__(self, exc_type, exc, traceback):
+                connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return Transaction()
+
+    def get_many(self, keys):
+        """Return {key: value} for the keys that are cached"""
+        found = {key: self.pending_puts[key] for key in keys if key in self.pending_puts}
+        missing = [key for key in keys if key not in found]
+        if missing:
+            rows = self.connection.execute(
+                f"SELECT key, value FROM entries WHERE key IN ({','.join('?' * len(missing))})", missing).fetchall()
+            for key, value in rows:
+                found[key] = loads(value)
+                self.pending_touches.add(key)
+            self._maybe_flush()
+        return found
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        return self.get_many([key]).get(key)
+
+    def put(self, key, value):
+        self.pending_puts[key] = value
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self.pending_puts) + len(self.pending_touches) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Write pending entries and last-used times, evict if over budget and store the counters"""
+        now = time.time()
+        rows = []
+        for key, value in self.pending_puts.items():
+            text = dumps(value)
+            rows.append((key, text, len(key) + len(text), now))
+        with self._transaction():
+            execute = self.connection.execute
+            inserted = self.connection.executemany("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?)", rows).rowcount
+            self.connection.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                        [(now, key) for key in self.pending_touches])
+            if inserted == len(rows):
+                execute("UPDATE meta SET value = value + ? WHERE name = 'bytes'", (sum(row[2] for row in rows),))
+            else:
+                # Another process stored some of the same keys first; recount
+                execute("UPDATE meta SET value = (SELECT COALESCE(SUM(size), 0) FROM entries) WHERE name = 'bytes'")
+            total, = execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()
+            if total > self.max_bytes:
+                total = self._evict(total)
+            for name, value in self.stats.items():
+                execute("INSERT INTO meta VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                        (f"count.{name}", value - self._flushed[name]))
+        self._flushed = dict(self.stats)
+        self.pending_puts.clear()
+        self.pending_touches.clear()
+
+    def _evict(self, total):
+        """Delete least recently used entries until 90% of max_bytes is left (inside flush's transaction)"""
+        target = self.max_bytes * 0.9
+        while total > target:
+            rows = self.connection.execute("SELECT key, size FROM entries ORDER BY last_used LIMIT 512").fetchall()
+            if not rows:
+                total = 0
+                break
+            for key, size in rows:
+                if total <= target:
+                    break
+                self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                self.stats["evictions"] += 1
+        self.connection.execute("UPDATE meta SET value = ? WHERE name = 'bytes'", (total,))
+        return total
+
+    def compute_return(self, data, cents=False):
+        """
+        compute_return with caching: the whole result by household key, and on a miss the
+        CACHED_LINES by the inputs each one reads.
+
+        Args:
+            data (dict or Household): Taxpayer record
+            cents (bool): Integer-cents results (compute_return(..., cents=True)), cached
+                          under their own keys
+
+        Returns:
+            dict: One value per name in RETURN_LINES.
+        """
+        household = parse_household(data)
+        inputs = household.graph_inputs()
+        key = inputs_key("return_cents" if cents else "return", inputs, self.version)
+        result = self.get(key)
+        if result is not None:
+            self.stats["hits"] += 1
+            return result
+        self.stats["misses"] += 1
+
+        if cents:
+            result = dict(zip(RETURN_LINES, compute_return_cents(inputs)))
+            self.put(key, result)
+            return result
+
+        graph = ReturnGraph(inputs)
+        line_keys = {name: inputs_key(name, inputs, self.version, line_inputs(name)) for name in CACHED_LINES}
+        found = self.get_many(list(line_keys.values()))
+        for name, line_key in line_keys.items():
+            if line_key in found:
+                self.stats["line_hits"] += 1
+                graph.values[name] = found[line_key][0]
+            else:
+                self.stats["line_misses"] += 1
+
+        result = {name: graph[line_name] for name, line_name in RETURN_LINES.items()}
+        for name, line_key in line_keys.items():
+            if line_key not in found:
+                self.put(line_key, [graph[name]])
+        self.put(key, result)
+        return result
+
+    def stored_counters(self):
+        """Counters accumulated in the file by every process that has flushed to it"""
+        rows = self.connection.execute("SELECT name, value FROM meta WHERE name LIKE 'count.%'").fetchall()
+        counters = {name: 0 for name in self.stats}
+        counters.update({name[len("count."):]: value for name, value in rows})
+        return counters
+
+    def summary(self, counters=None):
+        """
+        Returns:
+            dict: Counters (this instance's unless given) plus hit_rate, entries and bytes.
+        """
+        counters = dict(self.stats if counters is None else counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        counters["entries"], = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        counters["bytes"], = self.connection.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()
+        return counters
+
+    def close(self):
+        if self.connection is not None:
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+# Example usage:
+if __name__ == "__main__":
+    import tempfile
+    from data_utils import load_taxpayer_information
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(os.path.join(directory, "results.sqlite"))
+        print(cache.compute_return(load_taxpayer_information()))
+        print(cache.compute_return(load_taxpayer_information()))
+        print(cache.summary())
+        cache.close()
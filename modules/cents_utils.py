@@ -0,0 +1,300 @@
+import bisect
+from decimal import Decimal, ROUND_HALF_UP
+
+from table_utils import FILING_STATUSES, RATE_SCALE, CENTS_SCALE
+from forms_utils import form_2441_credit_allowed
+from year_utils import get_tax_year_data
+
+# Integer-cents computation core.
+#
+# Dollar amounts are held as integer cents and rates as integer parts per million
+# (RATE_SCALE), so every product is an exact integer and each line is rounded to the
+# cent once, half up, with integer division. Results match Decimal arithmetic with
+# ROUND_HALF_UP to the cent without Decimal's per-operation cost.
+
+def to_cents(amount):
+    """Convert a dollar amount (int, float or str) to integer cents, rounding half up"""
+    if isinstance(amount, int):
+        return amount * CENTS_SCALE
+    return int((Decimal(str(amount)) * CENTS_SCALE).to_integral_value(ROUND_HALF_UP))
+
+def from_cents(cents):
+    """Convert integer cents back to dollars as a float (exact for any realistic amount)"""
+    return cents / CENTS_SCALE
+
+def to_rate(rate):
+    """Convert a rate such as 0.22 to integer parts per million, refusing rates that would lose precision"""
+    scaled = Decimal(str(rate)) * RATE_SCALE
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"Rate {rate} has more precision than 1/{RATE_SCALE}")
+    return int(scaled)
+
+def div_half_up(numerator, denominator):
+    """Integer division of numerator by a positive denominator, rounding halves up"""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+def apply_rate(cents, rate_ppm):
+    """cents * rate, rounded half up to the cent"""
+    return div_half_up(cents * rate_ppm, RATE_SCALE)
+
+
+class CentsEngine:
+    """
+    Exact version of the tax table, rate schedule, standard deduction, Form 2441,
+    Form 8863 and child tax credit for one tax year, in integer cents.
+
+    The float functions in tax_utils and forms_utils are unchanged; this engine is for
+    callers that need results that reconcile to the cent. compute_return(data, cents=True)
+    and batch.py --cents run whole returns through it.
+    """
+
+    def __init__(self, year_data):
+        """
+        Args:
+            year_data (TaxYearData): From year_utils.get_tax_year_data
+        """
+        self.year_data = year_data
+        tax_table = year_data.tax_table
+        self.tax_table = tax_table
+        self.table_limit_cents = to_cents(100000)
+        self.table_columns = {status: [to_cents(value) for value in tax_table.columns[status]]
+                              for status in FILING_STATUSES}
+
+        rate_schedule = year_data.rate_schedule
+        self.statuses = rate_schedule.statuses
+        self.bracket_minimums = {status: [to_cents(minimum) for minimum in rate_schedule.minimums[status]]
+                                 for status in self.statuses}
+        self.bracket_maximums = {status: [None if maximum is None else to_cents(maximum)
+                                          for maximum in rate_schedule.maximums[status]]
+                                 for status in self.statuses}
+        self.bracket_rates = {status: [to_rate(rate) for rate in rate_schedule.rates[status]]
+                              for status in self.statuses}
+        # Subtract amounts scaled to cents * RATE_SCALE, so a bracket is one multiply and one subtract
+        self.bracket_subtract_amounts = {status: [to_cents(amount) * RATE_SCALE
+                                                  for amount in rate_schedule.subtract_amounts[status]]
+                                         for status in self.statuses}
+
+        self.standard_deductions = {status: to_cents(amount) for status, amount in year_data.standard_deductions.items()}
+
+        thresholds = year_data.credit_thresholds
+        self.form_2441_percentages = [(to_cents(minimum), None if maximum == float("inf") else to_cents(maximum),
+                                       to_rate(rate))
+                                      for minimum, maximum, rate in thresholds.form_2441_percentages]
+        self.form_8863_income_limits = {status: to_cents(amount)
+                                        for status, amount in thresholds.form_8863_income_limits.items()}
+        self.form_8863_phaseout_ranges = {status: to_cents(amount)
+                                          for status, amount in thresholds.form_8863_phaseout_ranges.items()}
+        child_tax_credit = thresholds.child_tax_credit
+        self.credit_per_qualifying_child = to_cents(child_tax_credit["credit_per_qualifying_child"])
+        self.child_tax_credit_threshold = to_cents(child_tax_credit["threshold"])
+
+        # NumPy arrays for tax_cents_batch, built on first use
+        self._table_arrays = None
+        self._bracket_arrays = {}
+
+    def taxable_income_cents(self, income_cents, filing_status):
+        """Form 1040 line 15: income minus the standard deduction, floored at zero"""
+        if filing_status not in self.standard_deductions:
+            raise ValueError(f"Invalid filing status. Must be one of: {list(self.standard_deductions)}")
+        return max(0, income_cents - self.standard_deductions[filing_status])
+
+    def tax_cents(self, taxable_income_cents, filing_status):
+        """
+        Form 1040 line 16 in cents: the tax table below $100,000, the rate schedule from
+        $100,000, validating the filing status the way compute_tax does.
+
+        Returns:
+            int: Tax in cents.
+            None: If no band or bracket contains the income.
+        """
+        if taxable_income_cents < self.table_limit_cents:
+            filing_status = filing_status.lower()
+            if filing_status not in FILING_STATUSES:
+                raise ValueError(f"Invalid filing status. Must be one of: {list(FILING_STATUSES)}")
+            # Cents / 100 is exact enough that it never crosses a whole-dollar band boundary
+            index = self.tax_table.find_index(taxable_income_cents / CENTS_SCALE)
+            return None if index is None else self.table_columns[filing_status][index]
+
+        if filing_status not in self.statuses:
+            raise ValueError(f"Invalid filing status. Available options are: {self.statuses}")
+        minimums = self.bracket_minimums[filing_status]
+        index = bisect.bisect_right(minimums, taxable_income_cents) - 1
+        if index < 0:
+            return None
+        maximum = self.bracket_maximums[filing_status][index]
+        if maximum is not None and taxable_income_cents >= maximum:
+            return None
+        scaled = taxable_income_cents * self.bracket_rates[filing_status][index] - self.bracket_subtract_amounts[filing_status][index]
+        return div_half_up(scaled, RATE_SCALE)
+
+    def form_2441_credit_cents(self, creditable_expenses_cents, agi_cents):
+        """Form 2441 line 9: line 6 times the line 8 percentage for the AGI"""
+        for minimum, maximum, rate in self.form_2441_percentages:
+            if minimum <= agi_cents and (maximum is None or agi_cents < maximum):
+                return apply_rate(creditable_expenses_cents, rate)
+        return apply_rate(creditable_expenses_cents, to_rate(0.20))
+
+    def form_2441_cents(self, qualifying_expenses_cents, qualifying_person_count, earned_income_cents, agi_cents,
+                        tax_liability_cents):
+        """
+        Form 2441 lines 3 to 11 in cents, as process_form_2441_part_ii computes them.
+
+        Args:
+            qualifying_expenses_cents (int): Childcare expenses of the qualifying persons (lines 2 and 3)
+            qualifying_person_count (int): Number of qualifying persons
+            earned_income_cents (int): Line 5 (the lower earned income when married filing jointly)
+            agi_cents (int): Form 1040 line 11, for the line 8 percentage
+            tax_liability_cents (int): Form 1040 line 18, for the line 10 limit
+
+        Returns:
+            int: Line 11 credit.
+        """
+        line_3 = min(qualifying_expenses_cents, to_cents(3000 if qualifying_person_count == 1 else 6000))
+        line_6 = min(line_3, earned_income_cents)
+        line_9 = self.form_2441_credit_cents(line_6, agi_cents)
+        line_10 = max(0, tax_liability_cents)
+        return min(line_9, line_10)
+
+    def form_8863_cents(self, filing_status, agi_cents, qualified_expenses_cents):
+        """
+        Form 8863 lines 27-30, 1-8 and 9 (American Opportunity Credit) in cents.
+
+        The phase-out ratio is rounded half up to three places, as on line 6. The
+        nonrefundable part is line 7 minus the refundable part, so the two always sum
+        to line 7 exactly.
+
+        Returns:
+            tuple: (line 30 credit, line 8 refundable, nonrefundable remainder)
+        """
+        # Lines 27 to 30
+        line_27 = min(qualified_expenses_cents, to_cents(4000))
+        line_28 = max(0, line_27 - to_cents(2000))
+        line_30 = line_27 if line_28 == 0 else div_half_up(line_28 * 25, 100) + to_cents(2000)
+
+        # Lines 2 to 6 (no education credits when married filing separately)
+        if filing_status == "married_filing_separately":
+            return line_30, 0, 0
+        limits, ranges = self.form_8863_income_limits, self.form_8863_phaseout_ranges
+        line_4 = limits.get(filing_status, limits["default"]) - agi_cents
+        if line_4 <= 0:
+            return line_30, 0, 0
+        line_5 = ranges.get(filing_status, ranges["default"])
+        ratio_thousandths = 1000 if line_4 >= line_5 else div_half_up(line_4 * 1000, line_5)
+
+        # Lines 7 and 8
+        line_7 = div_half_up(line_30 * ratio_thousandths, 1000)
+        refundable = div_half_up(line_7 * 40, 100)
+        return line_30, refundable, line_7 - refundable
+
+    def child_tax_credit_line_12_cents(self, agi_cents, qualifying_children):
+        """Child tax credit worksheet lines 3 to 12 in cents, as child_tax_credit_line_12 computes them"""
+        credit = qualifying_children * self.credit_per_qualifying_child
+        difference = agi_cents - self.child_tax_credit_threshold
+        if difference >= 0:
+            return credit
+        return credit - max(0, (difference // to_cents(1000)) * to_cents(50))
+
+    def return_cents(self, filing_status, total_income_cents, earned_income_cents, qualifying_expenses_cents,
+                     qualifying_person_count, qualifying_children, qualified_education_expenses_cents):
+        """
+        Every return_utils.RETURN_LINES amount for one return, in cents.
+
+        Args:
+            earned_income_cents (int): Form 2441 line 5
+            qualifying_expenses_cents, qualifying_person_count: Form 2441 lines 2 and 3 inputs
+            qualifying_children (int): Children under 17 for the child tax credit
+
+        Returns:
+            tuple: (taxable income, tax, Form 2441 credit, Form 8863 refundable, Form 8863
+                   nonrefundable, Credit Limit Worksheet A line 5, child tax credit,
+                   Schedule 3 line 8), in RETURN_LINES order.
+        """
+        taxable_income = self.taxable_income_cents(total_income_cents, filing_status)
+        tax = self.tax_cents(taxable_income, filing_status) or 0
+        dependent_care_credit = 0
+        if form_2441_credit_allowed(filing_status):
+            dependent_care_credit = self.form_2441_cents(qualifying_expenses_cents, qualifying_person_count,
+                                                         earned_income_cents, total_income_cents, tax)
+        _, refundable, nonrefundable = self.form_8863_cents(filing_status, total_income_cents,
+                                                            qualified_education_expenses_cents)
+        credit_limit = tax - dependent_care_credit
+        child_tax_credit = min(credit_limit, self.child_tax_credit_line_12_cents(total_income_cents,
+                                                                                 qualifying_children))
+        return (taxable_income, tax, dependent_care_credit, refundable, nonrefundable, credit_limit,
+                child_tax_credit, dependent_care_credit)
+
+    def tax_cents_batch(self, taxable_incomes_cents, filing_status):
+        """
+        Vectorized tax_cents for an int64 array of incomes sharing one (valid, lowercase)
+        filing status. Requires NumPy.
+
+        Returns:
+            numpy.ndarray: int64 tax in cents, -1 where no band or bracket contains the income.
+        """
+        import numpy as np
+        incomes = np.asarray(taxable_incomes_cents, dtype=np.int64)
+        taxes = np.full(incomes.shape, -1, dtype=np.int64)
+
+        below = incomes < self.table_limit_cents
+        if below.any():
+            if self._table_arrays is None:
+                self._table_arrays = (
+                    np.asarray([to_cents(bound) for bound in self.tax_table.lower_bounds], dtype=np.int64),
+                    np.asarray([to_cents(bound) for bound in self.tax_table.upper_bounds], dtype=np.int64),
+                    {status: np.asarray(self.table_columns[status], dtype=np.int64) for status in FILING_STATUSES},
+                )
+            lower_bounds, upper_bounds, columns = self._table_arrays
+            column = columns[filing_status]
+            index = np.searchsorted(lower_bounds, incomes[below], side='right') - 1
+            clipped = np.clip(index, 0, len(lower_bounds) - 1)
+            found = (index >= 0) & (incomes[below] < upper_bounds[clipped])
+            taxes[below] = np.where(found, column[clipped], -1)
+
+        above = ~below
+        if above.any():
+            arrays = self._bracket_arrays.get(filing_status)
+            if arrays is None:
+                arrays = self._bracket_arrays[filing_status] = (
+                    np.asarray(self.bracket_minimums[filing_status], dtype=np.int64),
+                    np.asarray([np.iinfo(np.int64).max if maximum is None else maximum
+                                for maximum in self.bracket_maximums[filing_status]], dtype=np.int64),
+                    np.asarray(self.bracket_rates[filing_status], dtype=np.int64),
+                    np.asarray(self.bracket_subtract_amounts[filing_status], dtype=np.int64),
+                )
+            minimums, maximums, rates, subtract_amounts = arrays
+            index = np.searchsorted(minimums, incomes[above], side='right') - 1
+            clipped = np.clip(index, 0, len(minimums) - 1)
+            found = (index >= 0) & (incomes[above] < maximums[clipped])
+            scaled = incomes[above] * rates[clipped] - subtract_amounts[clipped]
+            taxes[above] = np.where(found, (2 * scaled + RATE_SCALE) // (2 * RATE_SCALE), -1)
+        return taxes
+
+
+_ENGINES = {}
+
+def get_cents_engine(tax_year=None, jurisdiction=None):
+    """Return the CentsEngine for a tax year, rebuilding it if the year's tables were reloaded"""
+    year_data = get_tax_year_data(tax_year, jurisdiction)
+    key = (year_data.tax_year, year_data.jurisdiction)
+    engine = _ENGINES.get(key)
+    if engine is None or engine.year_data is not year_data:
+        engine = _ENGINES[key] = CentsEngine(year_data)
+    return engine
+
+def compute_tax_cents(taxable_income, filing_status, tax_year=None, jurisdiction=None):
+    """
+    compute_tax in exact arithmetic.
+
+    Args:
+        taxable_income: Dollars (int, float or str), converted with to_cents
+
+    Returns:
+        int: Tax in cents, or None where compute_tax returns None.
+    """
+    return get_cents_engine(tax_year, jurisdiction).tax_cents(to_cents(taxable_income), filing_status)
+
+# Example usage:
+if __name__ == "__main__":
+    engine = get_cents_engine()
+    print(from_cents(engine.tax_cents(to_cents(140800.37), "married_filing_jointly")))
+    print([from_cents(cents) for cents in engine.form_8863_cents("single", to_cents(83333), to_cents(4000))])
@@ -0,0 +1,114 @@
+import csv
+import math
+from array import array
+
+from return_utils import RETURN_LINES
+
+class ColumnSink:
+    """
+    Accumulates batch results column by column.
+
+    Every return line is an array('d') (8 bytes per household, NaN for a failed record),
+    record IDs and error messages are plain lists, and nothing is built per household
+    beyond the appended values. The columns are written in bulk as CSV, or as Parquet
+    when pyarrow is installed.
+
+    Example:
+        sink = ColumnSink()
+        for record_id, values, error in run_batch(source, values=True):
+            sink.append(record_id, values, error)
+        sink.write("results.csv")
+    """
+
+    def __init__(self, lines=None):
+        """
+        Args:
+            lines (iterable): Result names, in the order values are appended. Defaults to RETURN_LINES.
+        """
+        self.lines = list(RETURN_LINES if lines is None else lines)
+        self.record_ids = []
+        self.errors = []
+        self.columns = [array('d') for _ in self.lines]
+        self.error_count = 0
+
+    def __len__(self):
+        return len(self.record_ids)
+
+    def append(self, record_id, values=None, error=None):
+        """
+        Add one household.
+
+        Args:
+            record_id (str): Identifier written in the record_id column
+            values (sequence): One value per line, in self.lines order. None for a failed record.
+            error (str): Error message for a failed record
+        """
+        self.record_ids.append(record_id)
+        self.errors.append(error)
+        if values is None:
+            self.error_count += 1
+            for column in self.columns:
+                column.append(math.nan)
+        else:
+            for column, value in zip(self.columns, values):
+                column.append(math.nan if value is None else value)
+
+    def column(self, name):
+        """The array('d') for one line"""
+        return self.columns[self.lines.index(name)]
+
+    def to_numpy(self):
+        """
+        Returns:
+            dict: Line name -> float64 NumPy array sharing the column's memory. Requires NumPy.
+        """
+        import numpy as np
+        return {name: np.frombuffer(column, dtype=np.float64) for name, column in zip(self.lines, self.columns)}
+
+    def write_csv(self, path):
+        """
+        Write record_id, one column per line and error; failed records have empty line values.
+        Rows are formatted one at a time, so no per-value strings are held for the whole sink.
+
+        Args:
+            path: File path, or an open text stream (e.g. sys.stdout) to write to
+        """
+        if not isinstance(path, str):
+            self._write_csv_rows(path)
+            return path
+        with open(path, 'w', newline='') as file:
+            self._write_csv_rows(file)
+        return path
+
+    def _write_csv_rows(self, file):
+        writer = csv.writer(file)
+        writer.writerow(["record_id", *self.lines, "error"])
+        writer.writerows((record_id, *["" if value != value else repr(value) for value in values], error)
+                         for record_id, error, *values in zip(self.record_ids, self.errors, *self.columns))
+
+    def write_parquet(self, path):
+        """
+        Write the columns as a Parquet file (failed records hold NaN and their error).
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Writing Parquet requires pyarrow (pip install pyarrow); use CSV instead")
+        import numpy as np
+        table = pyarrow.table({
+            "record_id": pyarrow.array(self.record_ids, type=pyarrow.string()),
+            **{name: pyarrow.array(np.frombuffer(column, dtype=np.float64)) for name, column in zip(self.lines, self.columns)},
+            "error": pyarrow.array(self.errors, type=pyarrow.string()),
+        })
+        pyarrow.parquet.write_table(table, path)
+        return path
+
+    def write(self, path):
+        """Write CSV or Parquet, chosen by the file extension (.parquet, otherwise CSV)"""
+        if path.endswith(".parquet"):
+            return self.write_parquet(path)
+        return self.write_csv(path)
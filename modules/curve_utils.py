@@ -0,0 +1,205 @@
+import bisect
+from fractions import Fraction
+
+from table_utils import FILING_STATUSES, get_tax_table, get_rate_schedule
+
+def round_half_up(amount):
+    """Round a Fraction to the nearest whole dollar, halves rounding up (as the IRS tax table does)"""
+    return (amount + Fraction(1, 2)).__floor__()
+
+def _table_midpoint(tax_table, index):
+    return Fraction(tax_table.lower_bounds[index] + tax_table.upper_bounds[index], 2)
+
+def _piece_matches(tax_table, column, index, rate, subtract_amount):
+    """True if the bracket formula at the band midpoint rounds to the table value"""
+    return round_half_up(rate * _table_midpoint(tax_table, index) - subtract_amount) == column[index]
+
+def derive_table_brackets(filing_status, tax_table=None, rate_schedule=None, slope_window=40):
+    """
+    Recover the statutory brackets below $100,000 from the tax table.
+
+    The IRS builds each tax table row by applying the bracket formula to the midpoint of
+    the band and rounding to whole dollars. Starting from the first rate schedule bracket
+    (which continues below $100,000), this walks the table downward; where the formula
+    stops reproducing the table, the slope of the rows below gives the next rate and
+    continuity at the band boundary gives its subtract amount.
+
+    Args:
+        filing_status (str): One of FILING_STATUSES
+        tax_table (TaxTable): Defaults to the process-wide table
+        rate_schedule (RateSchedule): Defaults to the process-wide schedule
+        slope_window (int): Number of rows used to estimate a bracket's rate
+
+    Returns:
+        list: (minimum, rate, subtract_amount) per bracket, lowest first, with rates and
+              subtract amounts as Fractions. The last entry is the schedule bracket that
+              starts below $100,000.
+
+    Raises:
+        ValueError: If a table row cannot be explained by any bracket formula.
+    """
+    tax_table = tax_table or get_tax_table()
+    rate_schedule = rate_schedule or get_rate_schedule()
+    column = tax_table.columns[filing_status]
+
+    rate = Fraction(str(rate_schedule.rates[filing_status][0]))
+    subtract_amount = Fraction(str(rate_schedule.subtract_amounts[filing_status][0]))
+    brackets = []
+    last_matched = len(column)
+
+    index = len(column) - 1
+    while index >= 0:
+        if _piece_matches(tax_table, column, index, rate, subtract_amount):
+            last_matched = index
+            index -= 1
+            continue
+
+        # Estimate the lower bracket's rate from the slope of the rows below this one
+        low = max(0, index - slope_window)
+        if low == index:
+            raise ValueError(f"Cannot derive a bracket for {filing_status} below {tax_table.upper_bounds[index]}")
+        slope = Fraction(column[index] - column[low]) / (_table_midpoint(tax_table, index) - _table_midpoint(tax_table, low))
+        new_rate = Fraction(round(slope * 100), 100)
+
+        # The breakpoint is a band boundary between this row and the rows the upper bracket matched
+        best = None
+        for boundary_index in range(index, min(last_matched, index + slope_window) + 1):
+            breakpoint = tax_table.upper_bounds[boundary_index] if boundary_index < len(column) else tax_table.upper_bounds[-1]
+            new_subtract = subtract_amount - (rate - new_rate) * breakpoint
+            upper_ok = all(_piece_matches(tax_table, column, i, rate, subtract_amount)
+                           for i in range(boundary_index + 1, min(last_matched, boundary_index + slope_window) + 1)
+                           if i < len(column))
+            if not upper_ok:
+                continue
+            run = 0
+            for i in range(boundary_index, max(-1, boundary_index - slope_window * 4), -1):
+                if not _piece_matches(tax_table, column, i, new_rate, new_subtract):
+                    break
+                run += 1
+            if run and (best is None or run > best[0]):
+                best = (run, breakpoint, boundary_index, new_subtract)
+
+        if best is None:
+            raise ValueError(f"Tax table row {tax_table.lower_bounds[index]}-{tax_table.upper_bounds[index]} "
+                             f"for {filing_status} does not follow any bracket formula")
+
+        _, breakpoint, boundary_index, new_subtract = best
+        brackets.append((breakpoint, rate, subtract_amount))
+        rate, subtract_amount = new_rate, new_subtract
+        last_matched = boundary_index
+        index = boundary_index - 1
+
+    brackets.append((tax_table.lower_bounds[0], rate, subtract_amount))
+    brackets.reverse()
+    return brackets
+
+
+class TaxCurve:
+    """
+    Piecewise view of the tax function for one filing status.
+
+    Combines the tax table (below $100,000), the brackets derived from it and the rate
+    schedule (from $100,000) so that each query is a bisect over precomputed lists:
+
+    - tax_at(x): the same amount compute_tax returns
+    - marginal_rate(x): the statutory rate of the bracket containing x
+    - next_breakpoint(x): the next bracket boundary above x
+    - income_for_tax(target): the lowest income whose tax is at least target
+    """
+
+    def __init__(self, filing_status, tax_table=None, rate_schedule=None):
+        self.filing_status = filing_status
+        self.tax_table = tax_table or get_tax_table()
+        self.rate_schedule = rate_schedule or get_rate_schedule()
+        self.table_limit = 100000
+
+        derived = derive_table_brackets(filing_status, self.tax_table, self.rate_schedule)
+        minimums = [minimum for minimum, _, _ in derived]
+        rates = [float(rate) for _, rate, _ in derived]
+        subtract_amounts = [float(amount) for _, _, amount in derived]
+
+        # The last derived bracket is the first schedule bracket; append the rest of the schedule
+        schedule_minimums = self.rate_schedule.minimums[filing_status]
+        for minimum, rate, amount in zip(schedule_minimums[1:], self.rate_schedule.rates[filing_status][1:],
+                                         self.rate_schedule.subtract_amounts[filing_status][1:]):
+            minimums.append(minimum)
+            rates.append(rate)
+            subtract_amounts.append(amount)
+
+        self.bracket_minimums = minimums
+        self.bracket_rates = rates
+        self.bracket_subtract_amounts = subtract_amounts
+
+        # Tax at the start of each schedule bracket, for the inverse lookup above the table
+        self.schedule_minimums = list(schedule_minimums)
+        self.schedule_taxes = [self.rate_schedule.compute(minimum, filing_status) for minimum in self.schedule_minimums]
+        self.table_column = self.tax_table.columns[filing_status]
+
+    def tax_at(self, taxable_income):
+        """Tax at taxable_income, matching compute_tax (None where compute_tax returns None)"""
+        if taxable_income < self.table_limit:
+            return self.tax_table.lookup(taxable_income, self.filing_status)
+        return self.rate_schedule.compute(taxable_income, self.filing_status)
+
+    def bracket_index(self, taxable_income):
+        """Index into bracket_minimums of the bracket containing taxable_income"""
+        return max(0, bisect.bisect_right(self.bracket_minimums, taxable_income) - 1)
+
+    def marginal_rate(self, taxable_income):
+        """Statutory marginal rate at taxable_income"""
+        return self.bracket_rates[self.bracket_index(taxable_income)]
+
+    def next_breakpoint(self, taxable_income):
+        """
+        The next bracket boundary strictly above taxable_income.
+
+        Returns:
+            float: The boundary where the marginal rate next changes.
+            None: If taxable_income is already in the top bracket.
+        """
+        index = bisect.bisect_right(self.bracket_minimums, taxable_income)
+        return self.bracket_minimums[index] if index < len(self.bracket_minimums) else None
+
+    def income_for_tax(self, target_tax):
+        """
+        Inverse lookup: the lowest taxable income whose tax is at least target_tax.
+
+        Below $100,000 this is the lower bound of the first table band reaching the target;
+        above it, the bracket formula is solved for income.
+        """
+        if target_tax <= self.table_column[0]:
+            return self.tax_table.lower_bounds[0]
+        if target_tax <= self.table_column[-1]:
+            index = bisect.bisect_left(self.table_column, target_tax)
+            return self.tax_table.lower_bounds[index]
+
+        # Find the schedule bracket whose tax range contains the target
+        index = max(0, bisect.bisect_right(self.schedule_taxes, target_tax) - 1)
+        rate = self.rate_schedule.rates[self.filing_status][index]
+        subtract_amount = self.rate_schedule.subtract_amounts[self.filing_status][index]
+        return max(self.schedule_minimums[index], (target_tax + subtract_amount) / rate)
+
+
+_TAX_CURVES = {}
+
+def get_tax_curve(filing_status):
+    """
+    Return the process-wide TaxCurve for filing_status, rebuilding it if
+    reload_tax_tables() has since swapped the underlying tables.
+    """
+    if filing_status not in FILING_STATUSES:
+        raise ValueError(f"Invalid filing status. Must be one of: {list(FILING_STATUSES)}")
+    tax_table, rate_schedule = get_tax_table(), get_rate_schedule()
+    curve = _TAX_CURVES.get(filing_status)
+    if curve is None or curve.tax_table is not tax_table or curve.rate_schedule is not rate_schedule:
+        curve = _TAX_CURVES[filing_status] = TaxCurve(filing_status, tax_table, rate_schedule)
+    return curve
+
+if __name__ == "__main__":
+    curve = get_tax_curve("married_filing_jointly")
+    for minimum, rate in zip(curve.bracket_minimums, curve.bracket_rates):
+        print(f"From ${minimum:,}: {rate:.0%}")
+    print(f"Tax at $85,000: ${curve.tax_at(85000):,}")
+    print(f"Marginal rate at $85,000: {curve.marginal_rate(85000):.0%}")
+    print(f"Next breakpoint above $85,000: ${curve.next_breakpoint(85000):,}")
+    print(f"Income for $20,000 of tax: ${curve.income_for_tax(20000):,.2f}")
@@ -0,0 +1,105 @@
+import json
+import os
+import time
+
+from instrument_utils import record_io
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, 'config.json')
+
+# Parsed data keyed by cache key -> (file signatures, value)
+_CACHE = {}
+_STATS = {"hits": 0, "misses": 0}
+
+def _signature(path):
+    """Return the (mtime, size) pair used to detect that a file has changed"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def cached(key, paths, loader):
+    """
+    Return loader() memoized under key until any file in paths changes.
+
+    A file counts as changed when its modification time or size differs from the
+    values recorded when the entry was loaded.
+
+    Args:
+        key: Hashable cache key.
+        paths (list): Files the loaded value depends on.
+        loader (callable): Called with no arguments to (re)build the value.
+
+    Returns:
+        The cached or freshly loaded value. Callers must treat it as read-only.
+    """
+    signature = tuple(_signature(path) for path in paths)
+    entry = _CACHE.get(key)
+    if entry is not None and entry[0] == signature:
+        _STATS["hits"] += 1
+        return entry[1]
+
+    _STATS["misses"] += 1
+    value = loader()
+    _CACHE[key] = (signature, value)
+    return value
+
+def read_file(path):
+    """Read a file's bytes (uncached), reporting the I/O to instrument_utils"""
+    with open(path, 'rb') as file:
+        raw = file.read()
+    record_io(files_opened=1, bytes_read=len(raw))
+    return raw
+
+def read_json_file(path):
+    """Read and parse a JSON file (uncached), reporting the I/O to instrument_utils"""
+    raw = read_file(path)
+    start = time.perf_counter()
+    value = json.loads(raw)
+    record_io(json_parse_seconds=time.perf_counter() - start)
+    return value
+
+def load_json(path):
+    """Load a JSON file through the cache"""
+    path = os.path.abspath(path)
+    return cached(('json', path), [path], lambda: read_json_file(path))
+
+def load_config():
+    """Load configuration from config.json"""
+    return load_json(CONFIG_PATH)
+
+def data_path(key):
+    """Resolve a data_paths entry from config.json relative to the project root"""
+    return os.path.join(PROJECT_ROOT, load_config()['data_paths'][key])
+
+def load_taxpayer_information(file_path=None):
+    """
+    Load a taxpayer information JSON file.
+
+    Only the configured sample file goes through the cache. Any other path is read
+    uncached, so streaming over many household files does not grow the cache by one
+    entry per file.
+
+    Args:
+        file_path (str): Path to the file. Defaults to data_paths.taxpayer_information in config.json.
+
+    Returns:
+        dict: The parsed taxpayer record.
+    """
+    default_path = data_path('taxpayer_information')
+    if file_path is None or os.path.abspath(file_path) == os.path.abspath(default_path):
+        return load_json(default_path)
+    return read_json_file(file_path)
+
+def cache_stats():
+    """
+    Return cache counters.
+
+    Returns:
+        dict: {"hits": int, "misses": int, "entries": int}
+    """
+    return {"hits": _STATS["hits"], "misses": _STATS["misses"], "entries": len(_CACHE)}
+
+def clear_cache():
+    """Drop every cached entry and reset the hit/miss counters"""
+    _CACHE.clear()
+    _STATS["hits"] = 0
+    _STATS["misses"] = 0
@@ -0,0 +1,74 @@
+import sys
+from datetime import date
+from functools import lru_cache
+
+from year_utils import default_tax_year
+
+def intern_text(value):
+    """Intern a string so repeated provider names, EINs and addresses share one object"""
+    return sys.intern(value) if type(value) is str else value
+
+class Dependent:
+    """
+    One dependent, parsed once and shared by Form 2441 and the child tax credit worksheet.
+
+    Attributes:
+        name (str)
+        age (int): Age in the tax year (tax year minus birth year, as calculate_age computes it)
+        under_13 (bool): Qualifying person for Form 2441 (disabled persons over 13 are not handled)
+        under_17 (bool): Qualifying child for the child tax credit
+        has_childcare (bool): The record has a non-empty childcare block
+        annual_cost (float): Childcare annual_cost, 0 if none
+        provider_ein, provider_name, provider_address: Childcare provider details (interned), None if none
+    """
+    __slots__ = ("name", "age", "under_13", "under_17", "has_childcare", "annual_cost",
+                 "provider_ein", "provider_name", "provider_address")
+
+    def __init__(self, name, age, childcare=None):
+        self.name = name
+        self.age = age
+        self.under_13 = age < 13
+        self.under_17 = age < 17
+        childcare = childcare or {}
+        self.has_childcare = bool(childcare)
+        self.annual_cost = childcare.get("annual_cost", 0)
+        self.provider_ein = intern_text(childcare.get("ein"))
+        self.provider_name = intern_text(childcare.get("provider_name"))
+        self.provider_address = intern_text(childcare.get("address"))
+
+    def _key(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, Dependent) and self._key() == other._key()
+
+    def __repr__(self):
+        return f"Dependent({self.name!r}, age={self.age}, annual_cost={self.annual_cost}, provider_ein={self.provider_ein!r})"
+
+@lru_cache(maxsize=8192)
+def birth_year(date_of_birth):
+    """Parse a YYYY-MM-DD date of birth (raising ValueError if malformed) and return its year"""
+    return date.fromisoformat(date_of_birth).year
+
+def normalize_dependent(dependent, tax_year=None):
+    """Build a Dependent from one entry of a taxpayer record's dependents list"""
+    if isinstance(dependent, Dependent):
+        return dependent
+    tax_year = tax_year or default_tax_year()
+    return Dependent(dependent.get("name"), tax_year - birth_year(dependent.get("date_of_birth")),
+                     dependent.get("childcare"))
+
+def normalize_dependents(dependents, tax_year=None):
+    """
+    Parse a dependents list in one pass. Entries that are already Dependent records are
+    passed through, so callers can normalize once and hand the result to every form.
+
+    Args:
+        dependents (list): Dependent dicts shaped like data/taxpayer_information.json
+        tax_year (int): Tax year ages are measured against. Defaults to default_tax_year in config.json.
+
+    Returns:
+        tuple: One Dependent per entry, in order.
+    """
+    tax_year = tax_year or default_tax_year()
+    return tuple(normalize_dependent(dependent, tax_year) for dependent in dependents)
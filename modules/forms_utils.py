@@ -1,31 +1,45 @@
 import json
 from datetime import datetime
-
-def process_form_2441_part_i(data):
+from data_utils import data_path, load_taxpayer_information
+from instrument_utils import instrumented
+from dependent_utils import normalize_dependents
+from record_utils import parse_dependents
+from year_utils import default_tax_year, get_tax_year_data
+
+@instrumented()
+def process_form_2441_part_i(data, dependents=None, registry=None):
     """
     Process Form 2441 Part I - Care Provider Information
     Returns a tuple of (should_proceed_to_part_ii, care_provider_info, total_expenses)
+
+    Args:
+        data (dict): Taxpayer information
+        dependents (tuple): data["dependents"] already passed through normalize_dependents, if available
+        registry (ProviderRegistry): If given, this household's payments are added to its provider totals
     """
     care_providers = {}
     total_expenses = 0
+    if dependents is None:
+        dependents = normalize_dependents(data.get("dependents", []), data.get("tax_year"))
+    if registry is not None:
+        registry.add_household(dependents)
     
     # Process each dependent's care provider
-    for dependent in data.get("dependents", []):
-        childcare = dependent.get("childcare", {})
-        if not childcare:
+    for dependent in dependents:
+        if not dependent.has_childcare:
             continue
             
-        provider_ein = childcare.get("ein")
+        provider_ein = dependent.provider_ein
         if provider_ein not in care_providers:
             care_providers[provider_ein] = {
-                "name": childcare.get("provider_name"),
+                "name": dependent.provider_name,
                 "identifying_number": provider_ein,
-                "address": childcare.get("address"),
+                "address": dependent.provider_address,
                 "amount_paid": 0
             }
         
         # Add to provider's total amount
-        annual_cost = childcare.get("annual_cost", 0)
+        annual_cost = dependent.annual_cost
         care_providers[provider_ein]["amount_paid"] += annual_cost
         total_expenses += annual_cost
     
@@ -35,98 +49,130 @@ def process_form_2441_part_i(data):
     
     return should_proceed_to_part_ii, list(care_providers.values()), total_expenses
 
-def calculate_age(birth_date_str):
-    """Calculate age for the tax year (assuming 2023 tax year)"""
+def calculate_age(birth_date_str, tax_year=None):
+    """Calculate age for the tax year (default_tax_year in config.json unless given)"""
     birth_date = datetime.strptime(birth_date_str, "%Y-%m-%d")
-    tax_year_end = datetime(2023, 12, 31)
+    tax_year_end = datetime(tax_year or default_tax_year(), 12, 31)
     return tax_year_end.year - birth_date.year
 
-def calculate_tax_liability_limit(data):
+@instrumented()
+def calculate_tax_liability_limit(data, tax_liability=13382):
     """
     Calculate the tax liability limit for Form 2441 based on Credit Limit Worksheet
     Returns the maximum allowable credit based on tax liability from Form 1040 line 18
     
     If the tax liability is zero or less, returns 0 as no credit can be taken
+
+    Args:
+        data (dict): Taxpayer information
+        tax_liability (float): Tax from Form 1040 line 18 (tax plus Schedule 2, line 3).
+                               Defaults to the sample taxpayer's amount.
     """
-    # Get tax from Form 1040 line 18 (tax plus Schedule 2, line 3)
-    tax_liability = 13382
-    
     # If tax liability is zero or less, no credit can be taken
     if tax_liability <= 0:
         return 0
         
     return tax_liability
 
-def process_form_2441_part_ii(data, total_expenses):
+def form_2441_qualifying_expenses(dependents, tax_year=None):
+    """
+    Form 2441 lines 2 and 3 inputs: childcare expenses for qualifying persons (under 13)
+    Returns a tuple of (qualifying_expenses, qualifying_person_count)
+
+    Args:
+        dependents: Dependent dicts, or Dependent records from normalize_dependents
+        tax_year (int): Tax year ages are measured against, for dependent dicts
+    """
+    qualifying_expenses = 0
+    qualifying_person_count = 0
+    
+    for dependent in normalize_dependents(dependents, tax_year):
+        if dependent.under_13:  # For now, we're not handling disabled persons over 13
+            qualifying_person_count += 1
+            qualifying_expenses += dependent.annual_cost
+
+    return qualifying_expenses, qualifying_person_count
+
+def form_2441_eligible_expenses(qualifying_expenses, qualifying_person_count):
+    """Form 2441 line 3: qualifying expenses capped at $3,000 for one person, $6,000 for two or more"""
+    max_expenses = 3000 if qualifying_person_count == 1 else 6000
+    return min(qualifying_expenses, max_expenses)
+
+def form_2441_earned_income(filing_status, taxpayer_income, spouse_income):
+    """Form 2441 lines 4 and 5: for married filing jointly, use the lower of the two earned incomes"""
+    if filing_status == "married_filing_jointly":
+        return min(taxpayer_income, spouse_income)
+    return taxpayer_income
+
+def form_2441_credit_allowed(filing_status):
+    """
+    Whether a return with this filing status can take the Form 2441 credit. Married filing
+    separately cannot; a spouse who lived apart for the last six months of the year is
+    considered unmarried and claims it as head of household instead.
+    """
+    return filing_status != "married_filing_separately"
+
+def form_2441_applicable_percentage(total_income, tax_year=None, jurisdiction=None):
+    """
+    Form 2441 line 8: credit percentage for the AGI from Form 1040 line 11, using the
+    AGI thresholds in the Credit_Thresholds.json for the tax year and jurisdiction
+    """
+    agi_thresholds = get_tax_year_data(tax_year, jurisdiction).credit_thresholds.form_2441_percentages
+    return next(
+        (rate for min_income, max_income, rate in agi_thresholds
+         if min_income <= total_income < max_income),
+        0.20  # Default percentage
+    )
+
+@instrumented()
+def process_form_2441_part_ii(data, total_expenses, taxpayer_income=60000, spouse_income=75000,
+                              total_income=135000, tax_liability=13382, dependents=None):
     """
     Process Form 2441 Part II - Credit for Child and Dependent Care Expenses
-    Following amounts are hardcoded for now because I don't know how exactly to make it dynamic yet.
+    Following amounts default to the sample taxpayer's values because I don't know how exactly
+    to make it dynamic yet. Batch callers pass them in from each household record.
     - taxpayer_income
     - spouse_income
     - total_income
+    - tax_liability (Form 1040 line 18)
+
+    dependents, if given, is data["dependents"] already passed through normalize_dependents.
     """
     # Validate qualifying persons (under 13 or disabled)
-    qualifying_expenses = 0
-    qualifying_person_count = 0
-    
-    for dependent in data.get("dependents", []):
-        age = calculate_age(dependent.get("date_of_birth"))
-        if age < 13:  # For now, we're not handling disabled persons over 13
-            qualifying_person_count += 1
-            qualifying_expenses += dependent.get("childcare", {}).get("annual_cost", 0)
+    tax_year = data.get("tax_year")
+    jurisdiction = data.get("jurisdiction")
+    qualifying_expenses, qualifying_person_count = form_2441_qualifying_expenses(
+        data.get("dependents", []) if dependents is None else dependents, tax_year)
     
     # Apply expense limits
-    max_expenses = 3000 if qualifying_person_count == 1 else 6000
-    eligible_expenses = min(qualifying_expenses, max_expenses)
+    eligible_expenses = form_2441_eligible_expenses(qualifying_expenses, qualifying_person_count)
     
     # Filing status still matters.
     filing_status = data.get("filing_status")
-    # This is referring to the taxpayer's earned income.
-    taxpayer_income = 60000
-    # If married filing jointly, enter your spouse’s earned income (if you or your spouse was a student
+    # taxpayer_income is referring to the taxpayer's earned income.
+    # spouse_income: If married filing jointly, enter your spouse’s earned income (if you or your spouse was a student
     # or was disabled, see the instructions); all others, enter the amount from line 4 of Form 1040
-    spouse_income = 75000
-    
-    # For married filing jointly, use the lower of the two earned incomes
-    if filing_status == "married_filing_jointly":
-        earned_income = min(taxpayer_income, spouse_income)
-    else:
-        earned_income = taxpayer_income
+    earned_income = form_2441_earned_income(filing_status, taxpayer_income, spouse_income)
     
     # Determine smallest of eligible expenses and earned income
     # This is equivalent to Line 6 on the Form 2441.
     creditable_expenses = min(eligible_expenses, earned_income)
     
-    # Calculate credit percentage based on total income
-    total_income = 135000 # From Form 1040, Line 11
-    
-    # Define AGI thresholds and corresponding percentages
-    agi_thresholds = [
-        (0, 15000, 0.35), (15000, 17000, 0.34), (17000, 19000, 0.33),
-        (19000, 21000, 0.32), (21000, 23000, 0.31), (23000, 25000, 0.30),
-        (25000, 27000, 0.29), (27000, 29000, 0.28), (29000, 31000, 0.27),
-        (31000, 33000, 0.26), (33000, 35000, 0.25), (35000, 37000, 0.24),
-        (37000, 39000, 0.23), (39000, 41000, 0.22), (41000, 43000, 0.21),
-        (43000, float("inf"), 0.20),
-    ]
-    
-    applicable_percentage = next(
-        (rate for min_income, max_income, rate in agi_thresholds 
-         if min_income <= total_income < max_income),
-        0.20  # Default percentage
-    )
+    # Calculate credit percentage based on total income (from Form 1040, Line 11)
+    applicable_percentage = form_2441_applicable_percentage(total_income, tax_year, jurisdiction)
     
-    # Calculate initial credit
-    credit = creditable_expenses * applicable_percentage
+    # Calculate initial credit (none when married filing separately)
+    credit = creditable_expenses * applicable_percentage if form_2441_credit_allowed(filing_status) else 0
     
     # Apply tax liability limit
-    tax_liability_limit = calculate_tax_liability_limit(data)
+    tax_liability_limit = calculate_tax_liability_limit(data, tax_liability)
     tax_liability_limit = min(credit, tax_liability_limit)
     
     # return round(final_credit, 2)
     return tax_liability_limit
 
 
+@instrumented()
 def process_form_2441_part_iii():
     """
     Process Form 2441 Part III - Dependent Care Benefits
@@ -134,26 +180,40 @@ def process_form_2441_part_iii():
     """
     pass
 
-def calculate_form_2441(input_file_path: str, print_output: bool = True) -> float:
+@instrumented()
+def calculate_form_2441(input_file_path, print_output: bool = True, registry=None, strict: bool = False) -> float:
     """
     Calculate Form 2441 Child and Dependent Care Expenses
     
     Args:
-        input_file_path (str): Path to JSON file containing tax data
+        input_file_path (str or dict): Path to JSON file containing tax data, or the
+                                       already-parsed taxpayer record
         print_output (bool): Whether to print calculation details (default: True)
+        registry (ProviderRegistry): Optional cross-household provider index to add Part I payments to
+        strict (bool): Raise on a missing file, invalid JSON or a malformed record (dependents are
+                       checked with record_utils.parse_dependents) instead of printing and returning 0
         
     Returns:
         float: Child and dependent care credit amount
+
+    Raises:
+        ValidationError: With strict, for a malformed dependent, naming the field.
     """
     try:
-        with open(input_file_path, 'r') as file:
-            data = json.load(file)
-            
+        if isinstance(input_file_path, dict):
+            data = input_file_path
+        else:
+            data = load_taxpayer_information(input_file_path)
+
+        # Parse the dependents once for both parts
+        parse = parse_dependents if strict else normalize_dependents
+        dependents = parse(data.get("dependents", []), data.get("tax_year"))
+
         # Process Part I
-        should_proceed_to_part_ii, care_providers, total_expenses = process_form_2441_part_i(data)
+        should_proceed_to_part_ii, care_providers, total_expenses = process_form_2441_part_i(data, dependents, registry)
         
         if should_proceed_to_part_ii:
-            credit = process_form_2441_part_ii(data, total_expenses)
+            credit = process_form_2441_part_ii(data, total_expenses, dependents=dependents)
             if print_output:
                 print(f"\nForm 2441 Part II - Calculated Credit: ${credit:,.2f}")
             return credit
@@ -162,50 +222,33 @@ def calculate_form_2441(input_file_path: str, print_output: bool = True) -> floa
             return 0
             
     except FileNotFoundError:
+        if strict:
+            raise
         if print_output:
             print(f"Error: Input file not found - {input_file_path}")
         return 0
     except json.JSONDecodeError:
+        if strict:
+            raise
         if print_output:
             print(f"Error: Invalid JSON format in {input_file_path}")
         return 0
     except Exception as e:
+        if strict:
+            raise
         if print_output:
             print(f"Error: {str(e)}")
         return 0
 
-# Example usage:
-if __name__ == "__main__":
-    import os
-    import sys
-    
-    # Get the project root directory (assuming forms_utils.py is in modules folder)
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    
-    # Load config
-    try:
-        with open(os.path.join(project_root, 'config.json'), 'r') as config_file:
-            config = json.load(config_file)
-            
-        # Get taxpayer information path from config and make it relative to project root
-        taxpayer_info_path = os.path.join(project_root, config['data_paths']['taxpayer_information'])
-        
-        result = calculate_form_2441(taxpayer_info_path, print_output=False)
-        print(f"\nFinal Form 2441 Credit Amount: ${result:,.2f}")
-    except FileNotFoundError:
-        print("Error: config.json not found")
-        sys.exit(1)
-    except json.JSONDecodeError:
-        print("Error: Invalid config.json format")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        sys.exit(1)
-
-def calculate_form_8863_part_iii(print_output: bool = True) -> float:
+@instrumented()
+def calculate_form_8863_part_iii(print_output: bool = True, qualified_expenses: float = 4000) -> float:
     """
     Calculate Form 8863 Part III - American Opportunity Credit (AOC) for qualified education expenses.
 
+    Args:
+        print_output (bool): If True, prints calculation details to console
+        qualified_expenses (float): Adjusted qualified education expenses for the student
+
     Returns:
         float: Total education credit amount. Returns 0 if no credit is available
               or if there are processing errors.
@@ -218,10 +261,10 @@ def calculate_form_8863_part_iii(print_output: bool = True) -> float:
     # American Opportunity Credit (AOC)
     
     # Line 27 - Don't enter more than $4,000.
-    AdjustedQualifiedEducationExpenses = 4000
+    AdjustedQualifiedEducationExpenses = min(qualified_expenses, 4000)
 
-    # Line 28 - Subtract $2,000 from the amount on line 27.
-    SubtractedQualifiedEducationExpenses = AdjustedQualifiedEducationExpenses - 2000
+    # Line 28 - Subtract $2,000 from the amount on line 27. If zero or less, enter -0-.
+    SubtractedQualifiedEducationExpenses = max(0, AdjustedQualifiedEducationExpenses - 2000)
 
     # Line 29 - Multiply the amount on line 28 by 25% (0.25).
     CreditForQualifiedEducationExpenses = SubtractedQualifiedEducationExpenses * 0.25
@@ -234,47 +277,72 @@ def calculate_form_8863_part_iii(print_output: bool = True) -> float:
 
     return TotalAmericanOpportunityCreditAmount
 
-if __name__ == "__main__":
-    result = calculate_form_8863_part_iii(print_output=False)
-    print(f"\nFinal Form 8863 Part III American Opportunity Credit Amount: ${result:,.2f}")
-
-def calculate_form_8863_part_i(print_output: bool = True) -> float:
+def form_8863_phaseout_ratio(filing_status, adjusted_gross_income, tax_year=None, jurisdiction=None):
     """
-    Calculate the refundable portion of the American Opportunity Credit (AOC)
-    from Form 8863 Part I. The refundable portion is up to 40% of the credit.
-
-    Args:
-        print_output (bool): If True, prints calculation details to console
+    Form 8863 lines 2 to 6: the AOC phase-out ratio for the filing status and AGI, using
+    the limits in the Credit_Thresholds.json for the tax year and jurisdiction.
 
     Returns:
-        float: Refundable portion of the AOC. Returns 0 if no refundable
-              credit is available or if there are processing errors.
-
-    Note:
-        The refundable portion of the AOC allows taxpayers to receive up to
-        40% of the remaining credit as a refund, even if they don't owe any tax.
+        float: Line 6 ratio (1.0 below the phase-out range)
+        None: If line 4 is zero or less, or the filing status is married filing separately,
+              and no education credit is available
     """
-    InitialAmericanOpportunityCreditAmount = calculate_form_8863_part_iii(print_output=False)
+    # Married filing separately cannot take the education credits
+    if filing_status == "married_filing_separately":
+        return None
 
-    filing_status = "married_filing_jointly"
+    thresholds = get_tax_year_data(tax_year, jurisdiction).credit_thresholds
 
     # Maximum income threshold for AOC refundable credit based on filing status
-    # Line 2 on the Form 8863
-    MaxIncomeThresholdForRefundableCredit = 180000 if filing_status == "married_filing_jointly" else 90000
+    # Line 2 on the Form 8863 ($180,000 if married filing jointly; $90,000 otherwise)
+    MaxIncomeThresholdForRefundableCredit = thresholds.form_8863_income_limit(filing_status)
 
     # Line 3 on the Form 8863   
-    AdjustedGrossIncome = 170000
+    AdjustedGrossIncome = adjusted_gross_income
 
     # Line 4 - Subtract AGI from income threshold. If zero or less, no education credit available
     IncomeThresholdMinusAGI = MaxIncomeThresholdForRefundableCredit - AdjustedGrossIncome
     if IncomeThresholdMinusAGI <= 0:
-        return 0
+        return None
 
     # Line 5 - Enter $20,000 if married filing jointly; $10,000 if single, head of household, or qualifying surviving spouse
-    PhaseoutIncomeThreshold = 20000 if filing_status == "married_filing_jointly" else 10000
+    PhaseoutIncomeThreshold = thresholds.form_8863_phaseout_range(filing_status)
 
     # Line 6 - Calculate phase-out ratio (1.0 if above threshold, or decimal ratio if below)
     PhaseoutRatio = 1.0 if IncomeThresholdMinusAGI >= PhaseoutIncomeThreshold else round(IncomeThresholdMinusAGI / PhaseoutIncomeThreshold, 3)
+    return PhaseoutRatio
+
+@instrumented()
+def calculate_form_8863_part_i(print_output: bool = True, filing_status: str = "married_filing_jointly",
+                               adjusted_gross_income: float = 170000, qualified_expenses: float = 4000,
+                               tax_year: int = None, jurisdiction: str = None) -> float:
+    """
+    Calculate the refundable portion of the American Opportunity Credit (AOC)
+    from Form 8863 Part I. The refundable portion is up to 40% of the credit.
+
+    Args:
+        print_output (bool): If True, prints calculation details to console
+        filing_status (str): Filing status used for the phase-out thresholds
+        adjusted_gross_income (float): Form 8863 line 3
+        qualified_expenses (float): Adjusted qualified education expenses passed to Part III
+        tax_year (int): Tax year for the phase-out limits. Defaults to default_tax_year in config.json.
+        jurisdiction (str): Jurisdiction for the phase-out limits. Defaults to default_jurisdiction in config.json.
+
+    Returns:
+        float: Refundable portion of the AOC. Returns 0 if no refundable
+              credit is available or if there are processing errors.
+
+    Note:
+        The refundable portion of the AOC allows taxpayers to receive up to
+        40% of the remaining credit as a refund, even if they don't owe any tax.
+    """
+    InitialAmericanOpportunityCreditAmount = calculate_form_8863_part_iii(print_output=False,
+                                                                          qualified_expenses=qualified_expenses)
+
+    # Lines 2 to 6 - Phase-out ratio. If line 4 is zero or less, no education credit available
+    PhaseoutRatio = form_8863_phaseout_ratio(filing_status, adjusted_gross_income, tax_year, jurisdiction)
+    if PhaseoutRatio is None:
+        return 0
 
     # Line 7 - Multiply line 1 by line 6 to get the phased-out credit amount
     # The note about age requirement is ommitted for the time being.
@@ -284,12 +352,10 @@ def calculate_form_8863_part_i(print_output: bool = True) -> float:
     RefundableAmericanOpportunityCreditAmount = PhasedOutCreditAmount * 0.40
     return RefundableAmericanOpportunityCreditAmount
 
-if __name__ == "__main__":
-    result = calculate_form_8863_part_i(print_output=False)
-    print(f"\nFinal Form 8863 Part I Refundable American Opportunity Credit Amount: ${result:,.2f}")
-
-
-def calculate_form_8863_part_ii(print_output: bool = True) -> float:
+@instrumented()
+def calculate_form_8863_part_ii(print_output: bool = True, filing_status: str = "married_filing_jointly",
+                                adjusted_gross_income: float = 170000, qualified_expenses: float = 4000,
+                                tax_year: int = None, jurisdiction: str = None) -> float:
     """
     Calculate Form 8863 Part II - Nonrefundable Education Credits, which includes
     the non-refundable portion of the American Opportunity Credit (AOC) and the
@@ -297,6 +363,11 @@ def calculate_form_8863_part_ii(print_output: bool = True) -> float:
 
     Args:
         print_output (bool): If True, prints calculation details to console
+        filing_status (str): Filing status used for the phase-out thresholds
+        adjusted_gross_income (float): Form 8863 line 3
+        qualified_expenses (float): Adjusted qualified education expenses passed to Part III
+        tax_year (int): Tax year for the phase-out limits. Defaults to default_tax_year in config.json.
+        jurisdiction (str): Jurisdiction for the phase-out limits. Defaults to default_jurisdiction in config.json.
 
     Returns:
         float: Total nonrefundable education credit amount. Returns 0 if no credit
@@ -308,12 +379,39 @@ def calculate_form_8863_part_ii(print_output: bool = True) -> float:
     """
     # Calculate initial nonrefundable education credits by subtracting the refundable portion 
     # from the total phased out credit amount (remaining 60% of AOC)
-    InitialNonrefundableEducationCredits = calculate_form_8863_part_i(print_output=False) / 0.4 * 0.6
+    InitialNonrefundableEducationCredits = calculate_form_8863_part_i(
+        print_output=False, filing_status=filing_status, adjusted_gross_income=adjusted_gross_income,
+        qualified_expenses=qualified_expenses, tax_year=tax_year, jurisdiction=jurisdiction) / 0.4 * 0.6
     TotalLifetimeLearningCredit = 0
     NonrefundableEducationCredits = InitialNonrefundableEducationCredits
 
     return NonrefundableEducationCredits
 
+# Example usage:
 if __name__ == "__main__":
+    import sys
+
+    try:
+        # Get taxpayer information path from config (relative to the project root)
+        taxpayer_info_path = data_path('taxpayer_information')
+
+        result = calculate_form_2441(taxpayer_info_path, print_output=False)
+        print(f"\nFinal Form 2441 Credit Amount: ${result:,.2f}")
+    except FileNotFoundError:
+        print("Error: config.json not found")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print("Error: Invalid config.json format")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    result = calculate_form_8863_part_iii(print_output=False)
+    print(f"\nFinal Form 8863 Part III American Opportunity Credit Amount: ${result:,.2f}")
+
+    result = calculate_form_8863_part_i(print_output=False)
+    print(f"\nFinal Form 8863 Part I Refundable American Opportunity Credit Amount: ${result:,.2f}")
+
     result = calculate_form_8863_part_ii(print_output=False)
     print(f"\nFinal Form 8863 Part II Nonrefundable Education Credits Amount: ${result:,.2f}")
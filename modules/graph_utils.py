@@ -0,0 +1,327 @@
+from tax_utils import adjust_for_standard_deduction, compute_tax
+from forms_utils import (calculate_tax_liability_limit, form_2441_qualifying_expenses, form_2441_eligible_expenses,
+                         form_2441_earned_income, form_2441_applicable_percentage, calculate_form_8863_part_iii,
+                         form_8863_phaseout_ratio, form_2441_credit_allowed)
+from worksheet_utils import credit_limit_worksheet_a_line_5, count_qualifying_children, child_tax_credit_line_12
+from schedule_utils import schedule3_part_i_total
+from dependent_utils import normalize_dependents
+from record_utils import Household, person_wages
+from instrument_utils import ACTIVE_SINKS, call_instrumented
+
+# Inputs every return graph starts from (see household_inputs)
+GRAPH_INPUTS = (
+    "dependents",
+    "filing_status",
+    "total_income",
+    "taxpayer_income",
+    "spouse_income",
+    "qualified_education_expenses",
+    "tax_year",
+    "jurisdiction",
+)
+
+# Form line name -> (dependency names, function of the dependency values)
+RETURN_NODES = {}
+
+def line(name, *dependencies):
+    """Register the decorated function as the form line `name` computed from `dependencies`"""
+    def register(func):
+        RETURN_NODES[name] = (dependencies, func)
+        return func
+    return register
+
+def household_inputs(data):
+    """
+    Pull the per-household inputs the forms need out of a taxpayer record
+    shaped like data/taxpayer_information.json.
+
+    A Household from record_utils.parse_household is already validated and parsed,
+    and supplies the same inputs directly.
+
+    Returns:
+        dict: One value per name in GRAPH_INPUTS.
+    """
+    if isinstance(data, Household):
+        return data.graph_inputs()
+    income = data["income"]
+    total_income = income["total_income"]
+
+    taxpayer_income = person_wages(income, data.get("taxpayer"), 0)
+    spouse_income = person_wages(income, data.get("spouse"), 1) if data.get("spouse") else None
+
+    return {
+        "dependents": data.get("dependents", []),
+        "filing_status": data["filing_status"],
+        "total_income": total_income,
+        "taxpayer_income": total_income if taxpayer_income is None else taxpayer_income,
+        "spouse_income": 0 if spouse_income is None else spouse_income,
+        "qualified_education_expenses": data.get("education", {}).get("qualified_expenses", 0),
+        # None selects default_tax_year / default_jurisdiction from config.json
+        "tax_year": data.get("tax_year"),
+        "jurisdiction": data.get("jurisdiction"),
+    }
+
+# Dependents, parsed once for Form 2441 and the child tax credit
+
+@line("household.dependents", "dependents", "tax_year")
+def _normalized_dependents(dependents, tax_year):
+    return normalize_dependents(dependents, tax_year)
+
+# Form 1040
+
+@line("1040.line_15", "total_income", "filing_status", "tax_year", "jurisdiction")
+def _taxable_income(total_income, filing_status, tax_year, jurisdiction):
+    return adjust_for_standard_deduction(total_income, filing_status, tax_year, jurisdiction)
+
+@line("1040.line_16", "1040.line_15", "filing_status", "tax_year", "jurisdiction")
+def _tax(taxable_income, filing_status, tax_year, jurisdiction):
+    return compute_tax(taxable_income, filing_status, tax_year, jurisdiction) or 0
+
+@line("1040.line_18", "1040.line_16")
+def _tax_plus_schedule_2(tax):
+    # Schedule 2, line 3 is not captured yet
+    return tax
+
+# Form 2441
+
+@line("2441.qualifying_persons", "household.dependents")
+def _qualifying_persons(dependents):
+    return form_2441_qualifying_expenses(dependents)
+
+@line("2441.line_3", "2441.qualifying_persons")
+def _eligible_expenses(qualifying_persons):
+    return form_2441_eligible_expenses(*qualifying_persons)
+
+@line("2441.line_5", "filing_status", "taxpayer_income", "spouse_income")
+def _earned_income(filing_status, taxpayer_income, spouse_income):
+    return form_2441_earned_income(filing_status, taxpayer_income, spouse_income)
+
+@line("2441.line_6", "2441.line_3", "2441.line_5")
+def _creditable_expenses(eligible_expenses, earned_income):
+    return min(eligible_expenses, earned_income)
+
+@line("2441.line_8", "total_income", "tax_year", "jurisdiction")
+def _applicable_percentage(total_income, tax_year, jurisdiction):
+    return form_2441_applicable_percentage(total_income, tax_year, jurisdiction)
+
+@line("2441.line_9", "2441.line_6", "2441.line_8", "filing_status")
+def _initial_credit(creditable_expenses, applicable_percentage, filing_status):
+    return creditable_expenses * applicable_percentage if form_2441_credit_allowed(filing_status) else 0
+
+@line("2441.line_10", "1040.line_18")
+def _tax_liability_limit(tax_liability):
+    return calculate_tax_liability_limit(None, tax_liability)
+
+@line("2441.line_11", "2441.line_9", "2441.line_10")
+def _dependent_care_credit(credit, tax_liability_limit):
+    return min(credit, tax_liability_limit)
+
+# Form 8863
+
+@line("8863.line_30", "qualified_education_expenses")
+def _american_opportunity_credit(qualified_expenses):
+    return calculate_form_8863_part_iii(print_output=False, qualified_expenses=qualified_expenses)
+
+@line("8863.line_6", "filing_status", "total_income", "tax_year", "jurisdiction")
+def _phaseout_ratio(filing_status, adjusted_gross_income, tax_year, jurisdiction):
+    return form_8863_phaseout_ratio(filing_status, adjusted_gross_income, tax_year, jurisdiction)
+
+@line("8863.line_7", "8863.line_30", "8863.line_6")
+def _phased_out_credit(initial_credit, phaseout_ratio):
+    return None if phaseout_ratio is None else initial_credit * phaseout_ratio
+
+@line("8863.line_8", "8863.line_7")
+def _refundable_credit(phased_out_credit):
+    return 0 if phased_out_credit is None else phased_out_credit * 0.40
+
+@line("8863.line_19", "8863.line_8")
+def _nonrefundable_credit(refundable_credit):
+    # Remaining 60% of the phased out AOC, as in calculate_form_8863_part_ii
+    return refundable_credit / 0.4 * 0.6
+
+# Credit Limit Worksheet A and the child tax credit
+
+@line("worksheet_a.line_5", "1040.line_16", "2441.line_11")
+def _credit_limit(tax, dependent_care_credit):
+    return credit_limit_worksheet_a_line_5(tax, dependent_care_credit)
+
+@line("child_credit.line_4", "household.dependents")
+def _qualifying_children(dependents):
+    return count_qualifying_children(dependents)
+
+@line("child_credit.line_12", "total_income", "child_credit.line_4", "tax_year", "jurisdiction")
+def _credit_before_limit(adjusted_gross_income, qualifying_children, tax_year, jurisdiction):
+    return child_tax_credit_line_12(adjusted_gross_income, qualifying_children, tax_year, jurisdiction)
+
+@line("child_credit.line_14", "worksheet_a.line_5", "child_credit.line_12")
+def _child_tax_credit(credit_limit, credit_before_limit):
+    return min(credit_limit, credit_before_limit)
+
+# Schedule 3
+
+@line("schedule_3.line_8", "2441.line_11")
+def _total_nonrefundable_credits(dependent_care_credit):
+    return schedule3_part_i_total(dependent_care_credit)
+
+
+def _dependents_index(nodes):
+    """Map each input or line name to the lines that use it directly"""
+    dependents = {}
+    for name, (dependencies, _) in nodes.items():
+        for dependency in dependencies:
+            dependents.setdefault(dependency, []).append(name)
+    return dependents
+
+def _topological_order(nodes):
+    """Map each line name to its position in an order where dependencies come first"""
+    order = {}
+    def visit(name):
+        if name in order or name not in nodes:
+            return
+        for dependency in nodes[name][0]:
+            visit(dependency)
+        order[name] = len(order)
+    for name in nodes:
+        visit(name)
+    return order
+
+_RETURN_DEPENDENTS = _dependents_index(RETURN_NODES)
+_RETURN_ORDER = _topological_order(RETURN_NODES)
+
+class ReturnGraph:
+    """
+    Per-return dependency graph of form lines.
+
+    Each line is computed on first request and cached, so shared sub-results such as
+    the Form 1040 tax or the Form 2441 credit are computed at most once per return.
+    set_input() invalidates only the lines downstream of the changed input.
+
+    While instrumentation is on (instrument_utils.instrument), each line evaluation is
+    reported as "graph.<line name>". Dependencies are evaluated before the call, so the
+    time is the line's own.
+    """
+
+    def __init__(self, inputs, nodes=None):
+        self.nodes = RETURN_NODES if nodes is None else nodes
+        self.dependents = _RETURN_DEPENDENTS if nodes is None else _dependents_index(nodes)
+        self.order = _RETURN_ORDER if nodes is None else _topological_order(nodes)
+        self.inputs = dict(inputs)
+        self.values = {}
+        self.computed = 0
+
+    @classmethod
+    def from_household(cls, data):
+        """Build a graph for a taxpayer record shaped like data/taxpayer_information.json"""
+        return cls(household_inputs(data))
+
+    def __getitem__(self, name):
+        if name in self.inputs:
+            return self.inputs[name]
+        if name in self.values:
+            return self.values[name]
+
+        value = self._evaluate(name)
+        self.values[name] = value
+        self.computed += 1
+        return value
+
+    def _evaluate(self, name):
+        """Compute one line from its (computed or cached) dependencies"""
+        dependencies, func = self.nodes[name]
+        arguments = [self[dependency] for dependency in dependencies]
+        if ACTIVE_SINKS:
+            return call_instrumented(f"graph.{name}", func, *arguments)
+        return func(*arguments)
+
+    def compute(self, names=None):
+        """
+        Return {name: value} for the requested lines (default: every line).
+        """
+        return {name: self[name] for name in (self.nodes if names is None else names)}
+
+    def input_dependencies(self, name):
+        """Return the set of inputs that the line `name` depends on, directly or indirectly"""
+        if name in self.inputs:
+            return {name}
+        found = set()
+        for dependency in self.nodes[name][0]:
+            found |= self.input_dependencies(dependency)
+        return found
+
+    def _drop(self, name):
+        """Remove a cached line and everything downstream of it"""
+        pending = [name]
+        seen = set()
+        while pending:
+            line_name = pending.pop()
+            if line_name not in seen:
+                seen.add(line_name)
+                self.values.pop(line_name, None)
+                pending.extend(self.dependents.get(line_name, ()))
+
+    def update(self, name, value):
+        """
+        Change one input and eagerly recompute the cached lines downstream of it.
+
+        Lines are recomputed in dependency order. A line whose new value equals its
+        cached value does not dirty the lines that depend on it, so an edit that is
+        absorbed early (for example by a min() against a limit) stops there. Lines
+        that were never computed stay lazy.
+
+        Returns:
+            tuple: (recomputed, changed) sets of line names.
+        """
+        if name not in self.inputs:
+            raise KeyError(f"Unknown input {name!r}. Must be one of: {list(self.inputs)}")
+        recomputed, changed = set(), set()
+        if self.inputs[name] == value:
+            return recomputed, changed
+
+        self.inputs[name] = value
+        dirty = set(self.dependents.get(name, ()))
+        while dirty:
+            line_name = min(dirty, key=self.order.__getitem__)
+            dirty.discard(line_name)
+            if line_name not in self.values:
+                continue
+
+            try:
+                new_value = self._evaluate(line_name)
+            except Exception:
+                # The new input stays. Uncache this line and every line still waiting to be
+                # recomputed, with their dependents, so none keeps a value from the old inputs
+                # and the error resurfaces on access
+                for stale_name in (line_name, *dirty):
+                    self._drop(stale_name)
+                raise
+            self.computed += 1
+            recomputed.add(line_name)
+            if new_value != self.values[line_name]:
+                self.values[line_name] = new_value
+                changed.add(line_name)
+                dirty.update(self.dependents.get(line_name, ()))
+        return recomputed, changed
+
+    def set_input(self, name, value):
+        """
+        Change one input and drop every cached line that depends on it.
+
+        Returns:
+            set: Names of the lines that will be recomputed on next access.
+        """
+        if name not in self.inputs:
+            raise KeyError(f"Unknown input {name!r}. Must be one of: {list(self.inputs)}")
+        if self.inputs[name] == value:
+            return set()
+
+        self.inputs[name] = value
+        stale = set()
+        pending = list(self.dependents.get(name, ()))
+        while pending:
+            line_name = pending.pop()
+            if line_name in stale:
+                continue
+            stale.add(line_name)
+            self.values.pop(line_name, None)
+            pending.extend(self.dependents.get(line_name, ()))
+        return stale
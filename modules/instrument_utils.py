@@ -0,0 +1,182 @@
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+# Active sinks. Instrumented functions check this list first and call straight through when it is empty.
+_SINKS = []
+
+# I/O counters for each instrumented call in progress, innermost last
+_FRAMES = []
+
+# The active sink list itself, for hot loops that test it before calling call_instrumented
+# instead of paying for a wrapper on every call. Do not modify it directly (use add_sink).
+ACTIVE_SINKS = _SINKS
+
+def instrumented(name=None):
+    """
+    Decorator that reports each call of the decorated function to the active sinks.
+
+    Every event is a dict:
+        {"name", "seconds", "files_opened", "bytes_read", "json_parse_seconds", "depth"}
+    plus "error" if the call raised. I/O counters are inclusive: a file read by a nested
+    call also counts towards the calls that enclose it.
+
+    Args:
+        name (str): Event name. Defaults to "<module>.<function>".
+    """
+    def decorate(func):
+        event_name = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _SINKS:
+                return func(*args, **kwargs)
+            return _call(event_name, func, args, kwargs)
+        return wrapper
+    return decorate
+
+def call_instrumented(event_name, func, *args):
+    """Call func(*args), reporting the call as event_name to the active sinks"""
+    return _call(event_name, func, args, {})
+
+def _call(event_name, func, args, kwargs):
+    frame = [0, 0, 0.0]
+    _FRAMES.append(frame)
+    error = None
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        _FRAMES.pop()
+        event = {
+            "name": event_name,
+            "seconds": seconds,
+            "files_opened": frame[0],
+            "bytes_read": frame[1],
+            "json_parse_seconds": frame[2],
+            "depth": len(_FRAMES),
+        }
+        if error is not None:
+            event["error"] = error
+        for sink in list(_SINKS):
+            sink.record(event)
+
+def record_io(files_opened=0, bytes_read=0, json_parse_seconds=0.0):
+    """Add file I/O to every instrumented call in progress (a no-op when none is)"""
+    for frame in _FRAMES:
+        frame[0] += files_opened
+        frame[1] += bytes_read
+        frame[2] += json_parse_seconds
+
+def add_sink(sink):
+    """Start sending events to sink (any object with a record(event) method)"""
+    _SINKS.append(sink)
+    return sink
+
+def remove_sink(sink):
+    """Stop sending events to sink"""
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+class MemorySink:
+    """Aggregates events in memory per function name"""
+
+    def __init__(self):
+        self.totals = {}
+
+    def record(self, event):
+        totals = self.totals.get(event["name"])
+        if totals is None:
+            totals = self.totals[event["name"]] = {
+                "calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0,
+                "files_opened": 0, "bytes_read": 0, "json_parse_seconds": 0.0,
+            }
+        totals["calls"] += 1
+        totals["errors"] += "error" in event
+        totals["seconds"] += event["seconds"]
+        totals["max_seconds"] = max(totals["max_seconds"], event["seconds"])
+        totals["files_opened"] += event["files_opened"]
+        totals["bytes_read"] += event["bytes_read"]
+        totals["json_parse_seconds"] += event["json_parse_seconds"]
+
+    def merge(self, totals):
+        """Add totals from another MemorySink (its .totals, e.g. sent back from a worker process)"""
+        for name, other in totals.items():
+            mine = self.totals.get(name)
+            if mine is None:
+                self.totals[name] = dict(other)
+                continue
+            for key, value in other.items():
+                mine[key] = max(mine[key], value) if key == "max_seconds" else mine[key] + value
+
+    def summary(self):
+        """
+        Returns:
+            list: One dict per function name with its totals, slowest total time first.
+        """
+        rows = [{"name": name, **totals} for name, totals in self.totals.items()]
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    def report(self, stream=None):
+        """Print the summary as a table"""
+        stream = stream or sys.stdout
+        print(f"{'function':<58}{'calls':>8}{'total ms':>11}{'max ms':>9}{'files':>7}{'bytes':>10}{'parse ms':>10}",
+              file=stream)
+        for row in self.summary():
+            print(f"{row['name']:<58}{row['calls']:>8}{row['seconds'] * 1000:>11.2f}{row['max_seconds'] * 1000:>9.2f}"
+                  f"{row['files_opened']:>7}{row['bytes_read']:>10}{row['json_parse_seconds'] * 1000:>10.2f}",
+                  file=stream)
+
+
+class JsonlTraceSink:
+    """Writes every event as one JSON line, with the wall-clock time it finished"""
+
+    def __init__(self, stream):
+        """
+        Args:
+            stream: An open text stream or a path to append to
+        """
+        self.owns_stream = isinstance(stream, str)
+        self.stream = open(stream, 'a') if self.owns_stream else stream
+
+    def record(self, event):
+        self.stream.write(json.dumps({"time": time.time(), **event}) + "\n")
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+@contextmanager
+def instrument(*sinks):
+    """
+    Enable instrumentation for the duration of a with block.
+
+    Example:
+        with instrument() as stats:
+            calculate_form_2441(data, print_output=False)
+        stats.report()
+
+    Args:
+        sinks: Sinks to attach. Defaults to a new MemorySink.
+
+    Yields:
+        The first sink.
+    """
+    sinks = sinks or (MemorySink(),)
+    for sink in sinks:
+        add_sink(sink)
+    try:
+        yield sinks[0]
+    finally:
+        for sink in sinks:
+            remove_sink(sink)
@@ -0,0 +1,379 @@
+import multiprocessing
+import os
+import re
+
+from return_utils import RETURN_LINES, compute_return_batch
+from record_utils import parse_household
+
+# Monte Carlo planning over uncertain incomes and expenses.
+#
+# Each household is simulated by drawing N variations of its income, childcare costs
+# and education expenses and evaluating the whole return for all of them at once with
+# return_utils.compute_return_batch. Samples are drawn in fixed-size chunks, each with
+# its own seed derived from (seed, household, chunk), so results do not depend on the
+# number of worker processes that computed them.
+
+# Lines summarized per household: the return lines plus two planning totals
+SIMULATED_LINES = tuple(RETURN_LINES) + ("total_credits", "net_liability")
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+DEFAULT_CHUNK_SAMPLES = 65536
+
+# Inputs a distribution can be given for. "annual_cost" applies to every qualifying
+# person (under 13); "dependents[i].annual_cost" to one dependent, by position.
+SAMPLED_INPUTS = ("total_income", "taxpayer_income", "spouse_income", "qualified_education_expenses", "annual_cost")
+_DEPENDENT_COST = re.compile(r"dependents\[(\d+)\]\.annual_cost$")
+
+
+class Distribution:
+    """Base class: sample(rng, size) returns a float array of draws"""
+
+    def sample(self, rng, size):
+        raise NotImplementedError
+
+    def draw(self, rng, size, base):
+        """Draws for an input whose record value is base (ignored unless the distribution is Relative)"""
+        return self.sample(rng, size)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in vars(self).items())})"
+
+class Fixed(Distribution):
+    def __init__(self, value):
+        self.value = value
+
+    def sample(self, rng, size):
+        import numpy as np
+        return np.full(size, self.value, dtype=np.float64)
+
+class Uniform(Distribution):
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng, size):
+        return rng.uniform(self.low, self.high, size)
+
+class Normal(Distribution):
+    """Normal draws, clipped below at minimum (0 by default, since amounts are not negative; None to disable)"""
+
+    def __init__(self, mean, sd, minimum=0.0):
+        self.mean = mean
+        self.sd = sd
+        self.minimum = minimum
+
+    def sample(self, rng, size):
+        import numpy as np
+        values = rng.normal(self.mean, self.sd, size)
+        return values if self.minimum is None else np.maximum(values, self.minimum)
+
+class LogNormal(Distribution):
+    """Log-normal draws with the given median and sigma (standard deviation of the log)"""
+
+    def __init__(self, median, sigma):
+        self.median = median
+        self.sigma = sigma
+
+    def sample(self, rng, size):
+        import math
+        return rng.lognormal(math.log(self.median), self.sigma, size)
+
+class Triangular(Distribution):
+    def __init__(self, low, mode, high):
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    def sample(self, rng, size):
+        return rng.triangular(self.low, self.mode, self.high, size)
+
+class Relative(Distribution):
+    """Multipliers of the household's own value, e.g. Relative(Normal(1.0, 0.1)) for ±10% income"""
+
+    def __init__(self, distribution):
+        self.distribution = distribution
+
+    def sample(self, rng, size):
+        return self.distribution.sample(rng, size)
+
+    def draw(self, rng, size, base):
+        return base * self.distribution.sample(rng, size)
+
+DISTRIBUTIONS = {
+    "fixed": Fixed,
+    "uniform": Uniform,
+    "normal": Normal,
+    "lognormal": LogNormal,
+    "triangular": Triangular,
+}
+
+def parse_distribution(spec, path=""):
+    """
+    Build a Distribution from its JSON form: a number (fixed), {"normal": {"mean": ..., "sd": ...}},
+    {"uniform": {"low": ..., "high": ...}}, {"lognormal": {"median": ..., "sigma": ...}},
+    {"triangular": {"low": ..., "mode": ..., "high": ...}} or {"relative": <spec>}.
+
+    Raises:
+        ValueError: For an unknown kind or missing parameters.
+    """
+    if isinstance(spec, Distribution):
+        return spec
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return Fixed(spec)
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise ValueError(f"{path}: expected a number or an object with one distribution kind, got {spec!r}")
+    (kind, parameters), = spec.items()
+    if kind == "relative":
+        return Relative(parse_distribution(parameters, path))
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"{path}: unknown distribution {kind!r}, expected one of {list(DISTRIBUTIONS) + ['relative']}")
+    if isinstance(parameters, dict):
+        try:
+            return DISTRIBUTIONS[kind](**parameters)
+        except TypeError as e:
+            raise ValueError(f"{path}: bad parameters for {kind}: {e}")
+    return DISTRIBUTIONS[kind](parameters)
+
+def parse_distributions(specs):
+    """
+    Build {input name: Distribution} from a JSON object keyed by SAMPLED_INPUTS names
+    or "dependents[i].annual_cost".
+
+    Raises:
+        ValueError: For an unknown input name or a bad distribution.
+    """
+    distributions = {}
+    for name, spec in specs.items():
+        if name not in SAMPLED_INPUTS and not _DEPENDENT_COST.match(name):
+            raise ValueError(f"{name}: cannot be sampled, expected one of {list(SAMPLED_INPUTS)} "
+                             f"or dependents[i].annual_cost")
+        distributions[name] = parse_distribution(spec, name)
+    return distributions
+
+
+def sample_inputs(household, distributions, size, rng, wages_follow_income=True):
+    """
+    Draw size variations of a household's inputs.
+
+    Inputs without a distribution keep the household's value. When total_income varies
+    and a wage input has no distribution of its own, wages_follow_income scales that
+    wage by the same ratio as total_income, so Form 2441 earned income moves with AGI.
+
+    Returns:
+        dict: compute_return_batch keyword arguments, arrays of length size.
+    """
+    import numpy as np
+
+    inputs = household.graph_inputs()
+    sampled = {}
+    for name in ("total_income", "taxpayer_income", "spouse_income", "qualified_education_expenses"):
+        if name in distributions:
+            sampled[name] = distributions[name].draw(rng, size, inputs[name])
+        else:
+            sampled[name] = np.full(size, inputs[name], dtype=np.float64)
+
+    if wages_follow_income and "total_income" in distributions and inputs["total_income"]:
+        ratio = sampled["total_income"] / inputs["total_income"]
+        for name in ("taxpayer_income", "spouse_income"):
+            if name not in distributions:
+                sampled[name] = sampled[name] * ratio
+
+    qualifying_expenses = np.zeros(size)
+    qualifying_persons = 0
+    for index, dependent in enumerate(household.dependents):
+        if not dependent.under_13:
+            continue
+        qualifying_persons += 1
+        distribution = distributions.get(f"dependents[{index}].annual_cost", distributions.get("annual_cost"))
+        if distribution is None:
+            qualifying_expenses += dependent.annual_cost
+        else:
+            qualifying_expenses += distribution.draw(rng, size, dependent.annual_cost)
+
+    return {
+        "filing_status": household.filing_status,
+        "total_income": sampled["total_income"],
+        "taxpayer_income": sampled["taxpayer_income"],
+        "spouse_income": sampled["spouse_income"],
+        "qualifying_expenses": qualifying_expenses,
+        "qualifying_persons": qualifying_persons,
+        "qualifying_children": sum(1 for dependent in household.dependents if dependent.under_17),
+        "qualified_education_expenses": sampled["qualified_education_expenses"],
+        "tax_year": household.tax_year,
+        "jurisdiction": household.jurisdiction,
+    }
+
+def simulate_samples(household, distributions, size, rng, wages_follow_income=True):
+    """
+    Evaluate size sampled variations of one household.
+
+    Returns:
+        dict: One float64 array per name in SIMULATED_LINES. total_credits is the Form 2441
+              credit, both Form 8863 amounts and the child tax credit; net_liability is the
+              tax minus total_credits.
+    """
+    lines = compute_return_batch(**sample_inputs(household, distributions, size, rng, wages_follow_income))
+    lines["total_credits"] = (lines["form_2441_credit"] + lines["form_8863_refundable"]
+                              + lines["form_8863_nonrefundable"] + lines["child_tax_credit"])
+    lines["net_liability"] = lines["tax"] - lines["total_credits"]
+    return lines
+
+def chunk_rng(seed, household_index, chunk_index):
+    """The random generator for one chunk of one household, independent of how chunks are scheduled"""
+    import numpy as np
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(household_index, chunk_index)))
+
+def _simulate_chunk(task):
+    household_index, chunk_index, household, distributions, size, seed, wages_follow_income = task
+    try:
+        rng = chunk_rng(seed, household_index, chunk_index)
+        lines = simulate_samples(household, distributions, size, rng, wages_follow_income)
+    except Exception as e:
+        return household_index, None, f"{type(e).__name__}: {e}"
+    return household_index, lines, None
+
+def summarize(lines, quantiles=DEFAULT_QUANTILES):
+    """
+    Quantiles and mean of each simulated line.
+
+    Returns:
+        dict: {"samples": n, "mean": {line: value}, "quantiles": {line: {"p5": value, ...}}}
+    """
+    import numpy as np
+    names = [name for name in SIMULATED_LINES if name in lines]
+    stacked = np.stack([lines[name] for name in names])
+    values = np.quantile(stacked, quantiles, axis=1)
+    labels = [f"p{quantile * 100:g}" for quantile in quantiles]
+    return {
+        "samples": stacked.shape[1],
+        "mean": dict(zip(names, stacked.mean(axis=1).tolist())),
+        "quantiles": {name: dict(zip(labels, values[:, row].tolist())) for row, name in enumerate(names)},
+    }
+
+def simulate_batch(households, distributions, samples=10000, seed=0, quantiles=DEFAULT_QUANTILES,
+                   workers=None, chunk_samples=DEFAULT_CHUNK_SAMPLES, wages_follow_income=True):
+    """
+    Simulate many households across a process pool.
+
+    Every household's samples are split into chunks of chunk_samples, and the chunks of
+    all households are spread over the workers, so a single household with millions of
+    samples uses every core too. Summaries stream back in input order. At most two chunks
+    per worker are in flight (batch_utils.bounded_imap), so the parent holds the current
+    household's finished chunks plus those, not the whole input.
+
+    Args:
+        households (iterable): (record_id, record) pairs; a record is a dict or Household,
+                               or an Exception for a record that failed to load
+        distributions (dict): Input name -> Distribution (see parse_distributions)
+        samples (int): Draws per household
+        seed (int): Base seed; the same seed gives the same results for any worker count
+        quantiles (sequence): Quantiles reported for every line, between 0 and 1
+        workers (int): Worker processes. None uses every CPU; 1 runs in-process.
+        chunk_samples (int): Draws evaluated per task
+        wages_follow_income (bool): See sample_inputs
+
+    Yields:
+        dict: {"record_id", **summarize(...)} per household, or {"record_id", "error"}.
+
+    Raises:
+        ValueError: If samples or chunk_samples is less than 1 (raised by the call itself,
+                    not on first iteration).
+    """
+    if samples < 1:
+        raise ValueError(f"samples must be at least 1, got {samples}")
+    if chunk_samples < 1:
+        raise ValueError(f"chunk_samples must be at least 1, got {chunk_samples}")
+    return _simulate_batch(households, distributions, samples, seed, quantiles, workers, chunk_samples,
+                           wages_follow_income)
+
+def _simulate_batch(households, distributions, samples, seed, quantiles, workers, chunk_samples,
+                    wages_follow_income):
+    from batch_utils import bounded_imap, warm_tables
+
+    record_ids = []
+
+    def tasks():
+        for household_index, (record_id, record) in enumerate(households):
+            record_ids.append(record_id)
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                household = parse_household(record)
+            except Exception as e:
+                yield household_index, -1, f"{type(e).__name__}: {e}", None, 0, seed, wages_follow_income
+                continue
+            for chunk_index, start in enumerate(range(0, samples, chunk_samples)):
+                size = min(chunk_samples, samples - start)
+                yield household_index, chunk_index, household, distributions, size, seed, wages_follow_income
+
+    def summaries(results):
+        current, chunks, error = None, [], None
+        for household_index, lines, chunk_error in results:
+            if household_index != current:
+                if current is not None:
+                    yield finish(current, chunks, error)
+                current, chunks, error = household_index, [], None
+            if chunk_error is not None:
+                error = error or chunk_error
+            else:
+                chunks.append(lines)
+        if current is not None:
+            yield finish(current, chunks, error)
+
+    def finish(household_index, chunks, error):
+        import numpy as np
+        record_id = record_ids[household_index]
+        if error is not None:
+            return {"record_id": record_id, "error": error}
+        lines = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+        return {"record_id": record_id, **summarize(lines, quantiles)}
+
+    warm_tables()
+    if workers == 1:
+        yield from summaries(map(_run_task, tasks()))
+        return
+
+    pool = multiprocessing.Pool(workers, initializer=warm_tables)
+    try:
+        yield from summaries(bounded_imap(pool, _run_task, tasks(), 1, 2 * (workers or os.cpu_count() or 1)))
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+
+def _run_task(task):
+    # Module-level so the pool can pickle it; load errors travel as chunk index -1
+    if task[1] == -1:
+        return task[0], None, task[2]
+    return _simulate_chunk(task)
+
+def simulate(data, distributions, samples=10000, seed=0, quantiles=DEFAULT_QUANTILES, workers=1,
+             chunk_samples=DEFAULT_CHUNK_SAMPLES, wages_follow_income=True):
+    """
+    Simulate one household (dict or Household).
+
+    Returns:
+        dict: summarize(...) output for the household.
+
+    Raises:
+        ValueError: If the record is invalid or cannot be computed (e.g. a filing status
+                    with no standard deduction), or samples is less than 1.
+    """
+    result, = simulate_batch([(None, data)], distributions, samples, seed, quantiles, workers,
+                             chunk_samples, wages_follow_income)
+    if "error" in result:
+        raise ValueError(result["error"])
+    del result["record_id"]
+    return result
+
+# Example usage:
+if __name__ == "__main__":
+    import json
+    from data_utils import load_taxpayer_information
+    result = simulate(load_taxpayer_information(), {
+        "total_income": Relative(Normal(1.0, 0.15)),
+        "annual_cost": Triangular(3000, 5000, 9000),
+        "qualified_education_expenses": Uniform(0, 5000),
+    }, samples=100000)
+    print(json.dumps(result["quantiles"]["net_liability"], indent=4))
+    print(json.dumps(result["quantiles"]["total_credits"], indent=4))
@@ -0,0 +1,380 @@
+from tax_utils import adjust_for_standard_deduction, compute_tax
+from forms_utils import (process_form_2441_part_ii, calculate_form_8863_part_i, calculate_form_8863_part_ii,
+                         calculate_form_8863_part_iii, form_8863_phaseout_ratio, form_2441_applicable_percentage,
+                         form_2441_credit_allowed)
+from worksheet_utils import credit_limit_worksheet_a_line_5, child_tax_credit_line_12
+from record_utils import parse_household
+
+# Filing-status and credit-allocation search.
+#
+# A married couple can file one joint return, or two separate returns between which
+# the dependents (with their childcare costs) and the education expenses are divided.
+# The education expenses are those of one student, whose credit is claimed on a single
+# return, so they go entirely to one spouse; the search never splits them. Plans are
+# the best within that restriction, not over every possible division of the expenses.
+# Each separate return is married filing separately, or head of household for a spouse
+# who is considered unmarried and claims at least one dependent. Dependents are assigned
+# one at a time in a depth-first branch and bound: at every node, the tax each spouse
+# owes under its possible statuses (from the tax table and rate schedule brackets) caps
+# the nonrefundable credits still reachable, giving a lower bound on the combined
+# liability, and branches that cannot beat the best plan found so far are cut.
+#
+# The credits only depend on a return's dependents through (childcare cost of those
+# under 13, number under 13, number under 17), so returns are memoized on that summary
+# and dependents with the same summary are interchangeable.
+
+SEPARATE_STATUSES = ("married_filing_separately", "head_of_household")
+
+def _summary_add(summary, dependent):
+    cost, under_13, under_17 = summary
+    if dependent.under_13:
+        cost, under_13 = cost + dependent.annual_cost, under_13 + 1
+    return cost, under_13, under_17 + dependent.under_17
+
+
+class FilingOptimizer:
+    """
+    Best filing status and allocation of dependents and education expenses for one household,
+    with the education expenses claimed in full on one return (they are not split).
+
+    The objective is the combined net liability (tax minus the Form 2441 credit, both
+    Form 8863 amounts and the child tax credit) over the returns filed. Each return is
+    evaluated with the scalar form functions (compute_tax, process_form_2441_part_ii,
+    calculate_form_8863_part_i and part_ii, the child tax credit worksheet).
+
+    A married filing separately return gets no Form 8863 credit (form_8863_phaseout_ratio)
+    and no Form 2441 credit (form_2441_credit_allowed), as in every engine. A spouse who
+    lived apart and claims a qualifying person gets the credit as head of household.
+
+    A filing status with no standard deduction in the year's data cannot be computed;
+    plans that need it are skipped and the reason is reported under "unavailable".
+
+    Attributes:
+        stats (dict): nodes, pruned, duplicates, evaluations and memo_hits of the last search
+    """
+
+    def __init__(self, data, considered_unmarried=False):
+        """
+        Args:
+            data (dict or Household): Taxpayer record shaped like data/taxpayer_information.json
+            considered_unmarried (bool): The spouses lived apart for the last six months of the
+                                         year, so a spouse who claims a dependent may file as head
+                                         of household instead of married filing separately
+        """
+        self.household = parse_household(data)
+        self.considered_unmarried = considered_unmarried
+        inputs = self.household.graph_inputs()
+        self.married = self.household.filing_status in ("married_filing_jointly", "married_filing_separately")
+        self.tax_year = self.household.tax_year
+        self.jurisdiction = self.household.jurisdiction
+        self.total_income = inputs["total_income"]
+        self.taxpayer_income = inputs["taxpayer_income"]
+        self.spouse_income = inputs["spouse_income"]
+        self.education = inputs["qualified_education_expenses"]
+        self._returns = {}
+        self._taxes = {}
+        self._bounds = {}
+        self.unavailable = {}
+        self.stats = {"nodes": 0, "pruned": 0, "duplicates": 0, "evaluations": 0, "memo_hits": 0}
+
+    # One return
+
+    def _tax(self, filing_status, adjusted_gross_income):
+        """Form 1040 line 16 for a status and AGI, or None if the status cannot be computed"""
+        key = (filing_status, adjusted_gross_income)
+        if key not in self._taxes:
+            try:
+                taxable_income = adjust_for_standard_deduction(adjusted_gross_income, filing_status,
+                                                               self.tax_year, self.jurisdiction)
+                self._taxes[key] = (taxable_income,
+                                    compute_tax(taxable_income, filing_status, self.tax_year, self.jurisdiction) or 0)
+            except ValueError as e:
+                self.unavailable.setdefault(filing_status, str(e))
+                self._taxes[key] = None
+        return self._taxes[key]
+
+    def evaluate_return(self, filing_status, adjusted_gross_income, earned_income, spouse_earned_income,
+                        dependents, education):
+        """
+        Evaluate one return, memoized on everything the lines depend on.
+
+        Args:
+            filing_status (str): One of FILING_STATUSES
+            adjusted_gross_income (float): Form 1040 line 11
+            earned_income, spouse_earned_income (float): Form 2441 lines 4 and 5 inputs
+            dependents (tuple): Dependent records claimed on this return
+            education (float): Qualified education expenses claimed on this return
+
+        Returns:
+            dict: The RETURN_LINES values plus total_credits and net_liability, or None if
+                  the filing status cannot be computed.
+        """
+        summary = (0, 0, 0)
+        for dependent in dependents:
+            summary = _summary_add(summary, dependent)
+        key = (filing_status, adjusted_gross_income, earned_income, spouse_earned_income, summary, education)
+        if key in self._returns:
+            self.stats["memo_hits"] += 1
+            return self._returns[key]
+        self.stats["evaluations"] += 1
+
+        computed = self._tax(filing_status, adjusted_gross_income)
+        if computed is None:
+            self._returns[key] = None
+            return None
+        taxable_income, tax = computed
+        record = {"filing_status": filing_status, "tax_year": self.tax_year, "jurisdiction": self.jurisdiction}
+        form_2441_credit = process_form_2441_part_ii(record, 0, earned_income, spouse_earned_income,
+                                                     adjusted_gross_income, tax, dependents)
+        refundable = calculate_form_8863_part_i(False, filing_status, adjusted_gross_income, education,
+                                                self.tax_year, self.jurisdiction)
+        nonrefundable = calculate_form_8863_part_ii(False, filing_status, adjusted_gross_income, education,
+                                                    self.tax_year, self.jurisdiction)
+        credit_limit = credit_limit_worksheet_a_line_5(tax, form_2441_credit)
+        child_tax_credit = min(credit_limit, child_tax_credit_line_12(adjusted_gross_income, summary[2], self.tax_year,
+                                                                              self.jurisdiction))
+        total_credits = form_2441_credit + refundable + nonrefundable + child_tax_credit
+        result = {
+            "taxable_income": taxable_income,
+            "tax": tax,
+            "form_2441_credit": form_2441_credit,
+            "form_8863_refundable": refundable,
+            "form_8863_nonrefundable": nonrefundable,
+            "credit_limit_worksheet_a": credit_limit,
+            "child_tax_credit": child_tax_credit,
+            "schedule_3_total": form_2441_credit,
+            "total_credits": total_credits,
+            "net_liability": tax - total_credits,
+        }
+        self._returns[key] = result
+        return result
+
+    # Bounds
+
+    def _education_bound(self, incomes):
+        """Most Form 8863 credit any one return could get from all of the education expenses"""
+        initial_credit = calculate_form_8863_part_iii(print_output=False, qualified_expenses=self.education)
+        best = 0
+        for filing_status, adjusted_gross_income in incomes:
+            ratio = form_8863_phaseout_ratio(filing_status, adjusted_gross_income, self.tax_year, self.jurisdiction)
+            if ratio is not None:
+                best = max(best, initial_credit * ratio)
+        return best
+
+    def _liability_bound(self, filing_status, adjusted_gross_income, earned_income, cost, under_13, under_17):
+        """
+        Lowest net liability (before education credits) a separate return could reach if
+        it also claimed dependents with the given childcare cost and counts: the Form 2441
+        credit at the most creditable expenses plus the full child tax credit, capped at
+        the tax (Credit Limit Worksheet A), or None if the status cannot be computed.
+        """
+        key = (filing_status, adjusted_gross_income, earned_income, cost, under_13, under_17)
+        if key in self._bounds:
+            return self._bounds[key]
+        computed = self._tax(filing_status, adjusted_gross_income)
+        if computed is None:
+            self._bounds[key] = None
+            return None
+        tax = computed[1]
+        cap = 3000 if under_13 == 1 else 6000
+        form_2441_credit = 0
+        if form_2441_credit_allowed(filing_status):
+            form_2441_credit = (min(cost, cap, earned_income)
+                                * form_2441_applicable_percentage(adjusted_gross_income, self.tax_year,
+                                                                  self.jurisdiction))
+        child_tax_credit = child_tax_credit_line_12(adjusted_gross_income, under_17, self.tax_year, self.jurisdiction)
+        self._bounds[key] = tax - max(0, min(max(tax, 0), form_2441_credit + child_tax_credit))
+        return self._bounds[key]
+
+    # Plans
+
+    def separate_incomes(self):
+        """
+        (taxpayer AGI, spouse AGI) for separate returns: each spouse's wages, with income
+        other than wages divided in proportion to the wages (all to the taxpayer if neither
+        has wages).
+        """
+        wages = self.taxpayer_income + self.spouse_income
+        other_income = self.total_income - wages
+        share = self.taxpayer_income / wages if wages else 1
+        return self.taxpayer_income + other_income * share, self.spouse_income + other_income * (1 - share)
+
+    def _separate_statuses(self, claimed):
+        if self.considered_unmarried and claimed:
+            return SEPARATE_STATUSES
+        return SEPARATE_STATUSES[:1]
+
+    def joint_plan(self):
+        """The joint return (or, for an unmarried taxpayer, the best of single and head of household)"""
+        dependents = self.household.dependents
+        if self.married:
+            candidates = [("married_filing_jointly", self.spouse_income)]
+        else:
+            candidates = [("single", 0)] + ([("head_of_household", 0)] if dependents else [])
+        best = None
+        for filing_status, spouse_income in candidates:
+            result = self.evaluate_return(filing_status, self.total_income, self.taxpayer_income, spouse_income,
+                                          dependents, self.education)
+            if result is not None and (best is None or result["net_liability"] < best["returns"][0]["net_liability"]):
+                best = self._plan([("taxpayer", filing_status, dependents, self.education, self.total_income, result)])
+        return best
+
+    def _plan(self, returns):
+        plan_returns = []
+        for person, filing_status, dependents, education, adjusted_gross_income, result in returns:
+            plan_returns.append({
+                "person": person,
+                "filing_status": filing_status,
+                "total_income": adjusted_gross_income,
+                "dependents": [dependent.name for dependent in dependents],
+                "qualified_education_expenses": education,
+                **result,
+            })
+        return {
+            "filing": "joint" if len(plan_returns) == 1 else "separate",
+            "net_liability": sum(entry["net_liability"] for entry in plan_returns),
+            "total_credits": sum(entry["total_credits"] for entry in plan_returns),
+            "returns": plan_returns,
+        }
+
+    def separate_plan(self, best_liability=float("inf")):
+        """
+        Branch and bound over the separate-return allocations.
+
+        Args:
+            best_liability (float): Only plans below this combined net liability are returned
+
+        Returns:
+            dict: The best separate plan, or None if none beats best_liability or none can be computed.
+        """
+        incomes = self.separate_incomes()
+        earned = (self.taxpayer_income, self.spouse_income)
+        # Most valuable dependents first, so good plans are found early and prune more
+        dependents = sorted(self.household.dependents,
+                            key=lambda dependent: (-(dependent.annual_cost if dependent.under_13 else 0),
+                                                   -dependent.under_17))
+        # Childcare cost, under 13 and under 17 counts of the dependents from index i on
+        remaining = [(0, 0, 0)] * (len(dependents) + 1)
+        for index in range(len(dependents) - 1, -1, -1):
+            remaining[index] = _summary_add(remaining[index + 1], dependents[index])
+        education_bound = self._education_bound(
+            [(filing_status, income) for income in incomes for filing_status in SEPARATE_STATUSES])
+
+        # Past these caps a return's lines no longer change: Form 2441 line 6 stops at the
+        # $6,000 limit or the earned income, only one versus several qualifying persons
+        # matters, and children beyond those whose credit covers the largest tax add nothing.
+        # Capping the summaries lets equivalent allocations meet in `visited`.
+        per_child = child_tax_credit_line_12(0, 1, self.tax_year, self.jurisdiction) or 1
+        caps = []
+        for person in (0, 1):
+            taxes = [computed[1] for computed in (self._tax(filing_status, incomes[person])
+                                                  for filing_status in SEPARATE_STATUSES) if computed is not None]
+            caps.append((max(0, min(6000, earned[person])), 2, int(max(taxes, default=0) // per_child) + 1))
+
+        def capped(summary, person):
+            return tuple(min(value, cap) for value, cap in zip(summary, caps[person]))
+
+        best = {"liability": best_liability, "plan": None}
+        visited = set()
+        assigned = ([], [])
+
+        def person_bound(person, summary, index):
+            # Lowest liability this spouse can reach with everything still unassigned
+            cost, under_13, under_17 = summary
+            rest_cost, rest_under_13, rest_under_17 = remaining[index]
+            statuses = self._separate_statuses(len(assigned[person]) + len(dependents) - index)
+            bounds = [bound for bound in (
+                self._liability_bound(filing_status, incomes[person], earned[person], cost + rest_cost,
+                                      under_13 + rest_under_13, under_17 + rest_under_17)
+                for filing_status in statuses) if bound is not None]
+            return min(bounds) if bounds else None
+
+        def leaf():
+            choices = []
+            for person in (0, 1):
+                claimed = tuple(assigned[person])
+                options = []
+                for filing_status in self._separate_statuses(claimed):
+                    # All of the education expenses on this return or none of them
+                    for education in (self.education, 0):
+                        result = self.evaluate_return(filing_status, incomes[person], earned[person], 0, claimed,
+                                                      education)
+                        if result is not None:
+                            options.append((filing_status, education, result))
+                choices.append(options)
+            for status_0, education_0, result_0 in choices[0]:
+                for status_1, education_1, result_1 in choices[1]:
+                    if education_0 + education_1 != self.education:
+                        continue
+                    liability = result_0["net_liability"] + result_1["net_liability"]
+                    if liability < best["liability"]:
+                        best["liability"] = liability
+                        best["plan"] = self._plan([
+                            ("taxpayer", status_0, tuple(assigned[0]), education_0, incomes[0], result_0),
+                            ("spouse", status_1, tuple(assigned[1]), education_1, incomes[1], result_1)])
+
+        def search(index, summaries):
+            self.stats["nodes"] += 1
+            state = (index, summaries, bool(assigned[0]), bool(assigned[1]))
+            if state in visited:
+                self.stats["duplicates"] += 1
+                return
+            visited.add(state)
+
+            bounds = [person_bound(person, summaries[person], index) for person in (0, 1)]
+            # Only a strictly lower liability replaces the best plan, so ties are cut too
+            # (the margin absorbs float rounding between the bound and the form lines)
+            if None in bounds or bounds[0] + bounds[1] - education_bound >= best["liability"] - 1e-6:
+                self.stats["pruned"] += 1
+                return
+            if index == len(dependents):
+                leaf()
+                return
+            for person in (0, 1):
+                assigned[person].append(dependents[index])
+                next_summaries = list(summaries)
+                next_summaries[person] = capped(_summary_add(summaries[person], dependents[index]), person)
+                search(index + 1, tuple(next_summaries))
+                assigned[person].pop()
+
+        search(0, ((0, 0, 0), (0, 0, 0)))
+        return best["plan"]
+
+    def best(self):
+        """
+        Returns:
+            dict: {"filing": "joint" or "separate", "net_liability", "total_credits", "returns": [one
+                  entry per return with its person, filing status, dependents, education expenses and
+                  lines], "alternatives": {"joint" / "separate": net liability or None}, "unavailable":
+                  {filing status: reason}}
+
+        Raises:
+            ValueError: If no filing status can be computed for the household.
+        """
+        self.stats = dict.fromkeys(self.stats, 0)
+        joint = self.joint_plan()
+        alternatives = {"joint": joint["net_liability"] if joint else None, "separate": None}
+        best = joint
+        if self.married:
+            # Any separate plan must beat the joint return, which prunes most of the tree at once
+            separate = self.separate_plan(joint["net_liability"] if joint else float("inf"))
+            if separate is not None:
+                alternatives["separate"] = separate["net_liability"]
+                best = separate
+        if best is None:
+            raise ValueError(f"No filing status can be computed: {self.unavailable}")
+        return {**best, "alternatives": alternatives, "unavailable": dict(self.unavailable)}
+
+def optimize_filing(data, considered_unmarried=False):
+    """
+    Best filing status and allocation for one household; see FilingOptimizer.best.
+    """
+    return FilingOptimizer(data, considered_unmarried).best()
+
+# Example usage:
+if __name__ == "__main__":
+    import json
+    from data_utils import load_taxpayer_information
+    optimizer = FilingOptimizer(load_taxpayer_information(), considered_unmarried=True)
+    print(json.dumps(optimizer.best(), indent=4))
+    print(optimizer.stats)
@@ -0,0 +1,120 @@
+import sys
+
+from dependent_utils import normalize_dependents
+from stream_utils import JsonlError, iter_jsonl, write_jsonl
+
+class Provider:
+    """One care provider and its totals across every household registered so far"""
+    __slots__ = ("ein", "name", "address", "amount_paid", "households", "dependents")
+
+    def __init__(self, ein, name, address):
+        self.ein = ein
+        self.name = name
+        self.address = address
+        self.amount_paid = 0
+        self.households = 0
+        self.dependents = 0
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class ProviderRegistry:
+    """
+    Cross-household index of care providers keyed by EIN.
+
+    Each provider is stored once, with interned name and address strings (the first
+    name and address seen for an EIN are kept). Registering a household adds its
+    childcare payments to the provider totals, so a batch can produce a provider-level
+    report in the same pass that computes Form 2441.
+
+    Example:
+        registry = ProviderRegistry()
+        for data in records:
+            calculate_form_2441(data, print_output=False, registry=registry)
+        registry.report()   # total paid per EIN across the batch
+    """
+
+    def __init__(self):
+        self.providers = {}
+        self.households = 0
+
+    def __len__(self):
+        return len(self.providers)
+
+    def get(self, ein):
+        """Return the Provider for ein, or None"""
+        return self.providers.get(ein)
+
+    def add_household(self, dependents):
+        """
+        Add one household's childcare payments to the provider totals.
+
+        Args:
+            dependents: The household's dependents, as dicts or Dependent records
+
+        Returns:
+            list: The Provider records this household paid, in first-seen order.
+        """
+        providers = self.providers
+        paid = {}
+        for dependent in normalize_dependents(dependents):
+            if not dependent.has_childcare:
+                continue
+            ein = dependent.provider_ein
+            provider = providers.get(ein)
+            if provider is None:
+                provider = providers[ein] = Provider(ein, dependent.provider_name, dependent.provider_address)
+            provider.amount_paid += dependent.annual_cost
+            provider.dependents += 1
+            if ein not in paid:
+                paid[ein] = provider
+                provider.households += 1
+        self.households += 1
+        return list(paid.values())
+
+    def report(self):
+        """
+        Returns:
+            list: One dict per provider (ein, name, address, amount_paid, households,
+                  dependents), largest amount_paid first.
+        """
+        rows = [provider.as_dict() for provider in self.providers.values()]
+        return sorted(rows, key=lambda row: row["amount_paid"], reverse=True)
+
+def aggregate_providers(records, registry=None):
+    """
+    Build a provider registry from a stream of household records in one pass.
+
+    Args:
+        records: Iterable of taxpayer dicts, or a JSONL stream/path/"-"
+        registry (ProviderRegistry): Registry to add to. Defaults to a new one.
+
+    Returns:
+        tuple: (registry, skipped) where skipped counts unparseable lines and records
+               whose dependents cannot be parsed (e.g. a missing or malformed date_of_birth).
+    """
+    if registry is None:
+        registry = ProviderRegistry()
+    if isinstance(records, str) or hasattr(records, "read"):
+        records = iter_jsonl(records, invalid="yield")
+
+    skipped = 0
+    for data in records:
+        if isinstance(data, JsonlError):
+            skipped += 1
+            continue
+        try:
+            registry.add_household(data.get("dependents", []))
+        except (ValueError, TypeError):
+            # Dependents are parsed in full before any totals change, so the registry is untouched
+            skipped += 1
+    return registry, skipped
+
+# Example usage:
+#   python modules/provider_utils.py < households.jsonl > providers.jsonl
+if __name__ == "__main__":
+    registry, skipped = aggregate_providers(sys.argv[1] if len(sys.argv) > 1 else "-")
+    write_jsonl(registry.report())
+    print(f"{len(registry):,} providers across {registry.households:,} households ({skipped:,} records skipped)",
+          file=sys.stderr)
@@ -0,0 +1,292 @@
+import json
+
+from table_utils import FILING_STATUSES
+from dependent_utils import Dependent, birth_year
+from year_utils import default_tax_year
+
+# Household records.
+#
+# parse_household validates a taxpayer record shaped like data/taxpayer_information.json
+# in one pass and builds slotted records from it. Every problem is reported as a
+# ValidationError naming the exact field (e.g. "dependents[1].childcare.annual_cost"),
+# instead of surfacing later as a KeyError or TypeError inside a form.
+
+class ValidationError(ValueError):
+    """A household record that does not match the expected shape"""
+
+    def __init__(self, path, message):
+        super().__init__(f"{path}: {message}" if path else message)
+        self.path = path
+
+
+# JSON backend: orjson when installed, the standard library otherwise
+
+_LOADS = None
+_DUMPS = None
+JSON_BACKEND = None
+
+def _select_backend():
+    global _LOADS, _DUMPS, JSON_BACKEND
+    try:
+        import orjson
+        _LOADS, JSON_BACKEND = orjson.loads, "orjson"
+        _DUMPS = lambda value: orjson.dumps(value).decode()
+    except ImportError:
+        _LOADS, JSON_BACKEND = json.loads, "json"
+        _DUMPS = lambda value: json.dumps(value, separators=(",", ":"))
+
+def loads(raw):
+    """
+    Parse JSON text or bytes with the fastest available backend.
+
+    Raises:
+        json.JSONDecodeError: On invalid JSON (orjson's error is a subclass of it).
+    """
+    if _LOADS is None:
+        _select_backend()
+    return _LOADS(raw)
+
+def dumps(value):
+    """Serialize value to compact JSON text with the fastest available backend"""
+    if _DUMPS is None:
+        _select_backend()
+    return _DUMPS(value)
+
+
+# Field checks. Each takes the value and its path for the error message.
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _number(value, path):
+    if not _is_number(value):
+        raise ValidationError(path, f"expected a number, got {type(value).__name__}")
+    return value
+
+def _optional_number(container, key, path, default=0):
+    value = container.get(key)
+    return default if value is None else _number(value, f"{path}.{key}" if path else key)
+
+def _optional_text(container, key, path):
+    value = container.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ValidationError(f"{path}.{key}" if path else key, f"expected a string, got {type(value).__name__}")
+    return value
+
+def _object(value, path):
+    if not isinstance(value, dict):
+        raise ValidationError(path, f"expected an object, got {type(value).__name__}")
+    return value
+
+
+class Person:
+    """
+    Taxpayer or spouse.
+
+    Attributes:
+        name (str), tin (str), date_of_birth (str): As given, None if missing
+        wages (float): Wages from the income block, None if the record has none for this person
+    """
+    __slots__ = ("name", "tin", "date_of_birth", "wages")
+
+    def __init__(self, name=None, tin=None, date_of_birth=None, wages=None):
+        self.name = name
+        self.tin = tin
+        self.date_of_birth = date_of_birth
+        self.wages = wages
+
+    def __repr__(self):
+        return f"Person({self.name!r}, wages={self.wages})"
+
+
+class Household:
+    """
+    One validated taxpayer record.
+
+    Attributes:
+        filing_status (str): One of FILING_STATUSES
+        taxpayer (Person)
+        spouse (Person): None if the record has no spouse
+        dependents (tuple): Dependent records (see dependent_utils)
+        total_income (float): income.total_income (Form 1040 line 11)
+        qualified_education_expenses (float): education.qualified_expenses, 0 if missing
+        tax_year (int): None for default_tax_year in config.json
+        jurisdiction (str): None for default_jurisdiction in config.json
+    """
+    __slots__ = ("filing_status", "taxpayer", "spouse", "dependents", "total_income",
+                 "qualified_education_expenses", "tax_year", "jurisdiction")
+
+    def __init__(self, filing_status, taxpayer, spouse, dependents, total_income,
+                 qualified_education_expenses=0, tax_year=None, jurisdiction=None):
+        self.filing_status = filing_status
+        self.taxpayer = taxpayer
+        self.spouse = spouse
+        self.dependents = dependents
+        self.total_income = total_income
+        self.qualified_education_expenses = qualified_education_expenses
+        self.tax_year = tax_year
+        self.jurisdiction = jurisdiction
+
+    def graph_inputs(self):
+        """The inputs graph_utils.household_inputs builds from the equivalent dict"""
+        taxpayer_wages = self.taxpayer.wages
+        spouse_wages = self.spouse.wages if self.spouse is not None else None
+        return {
+            "dependents": self.dependents,
+            "filing_status": self.filing_status,
+            "total_income": self.total_income,
+            "taxpayer_income": self.total_income if taxpayer_wages is None else taxpayer_wages,
+            "spouse_income": 0 if spouse_wages is None else spouse_wages,
+            "qualified_education_expenses": self.qualified_education_expenses,
+            "tax_year": self.tax_year,
+            "jurisdiction": self.jurisdiction,
+        }
+
+    def __repr__(self):
+        return (f"Household({self.filing_status!r}, total_income={self.total_income}, "
+                f"dependents={len(self.dependents)})")
+
+
+def person_income_key(income, person, position):
+    """
+    Find the key of a person's entry in the income block of a taxpayer record.
+
+    The income block is keyed by lowercase first name (e.g. "basset"); if that key is
+    missing, the person-level entries are matched by position (taxpayer first, spouse second).
+
+    Returns:
+        str: The key, or None if the person has no entry.
+    """
+    first_name = ((person or {}).get("name") or "").split(" ")[0].lower()
+    if first_name in income and isinstance(income[first_name], dict):
+        return first_name
+
+    people = [key for key, entry in income.items() if isinstance(entry, dict)]
+    if position < len(people):
+        return people[position]
+    return None
+
+def person_wages(income, person, position):
+    """A person's wages from the income block (see person_income_key), None if they have no entry"""
+    key = person_income_key(income, person, position)
+    return None if key is None else income[key].get("wages", 0)
+
+def _parse_person(data, key, income, position):
+    person = _object(data[key], key) if data.get(key) is not None else {}
+    name = _optional_text(person, "name", key)
+    income_key = person_income_key(income, person, position)
+    wages = None if income_key is None else income[income_key].get("wages", 0)
+    if wages is not None:
+        _number(wages, f"income.{income_key}.wages")
+    return Person(name, _optional_text(person, "tin", key), _optional_text(person, "date_of_birth", key), wages)
+
+def _parse_childcare(childcare, path):
+    """The validated childcare block, with a missing or null annual_cost stored as 0"""
+    if childcare is None:
+        return None
+    _object(childcare, path)
+    if not childcare:
+        return childcare
+    for key in ("provider_name", "ein", "address"):
+        _optional_text(childcare, key, path)
+    annual_cost = _optional_number(childcare, "annual_cost", path)
+    if childcare.get("annual_cost") is not annual_cost:
+        childcare = dict(childcare, annual_cost=annual_cost)
+    return childcare
+
+def parse_dependents(dependents, tax_year=None):
+    """
+    Validate a dependents list and build Dependent records in one pass.
+
+    Raises:
+        ValidationError: For the first dependent field that is missing or malformed.
+    """
+    if not isinstance(dependents, (list, tuple)):
+        raise ValidationError("dependents", f"expected a list, got {type(dependents).__name__}")
+    tax_year = tax_year or default_tax_year()
+    parsed = []
+    for index, dependent in enumerate(dependents):
+        path = f"dependents[{index}]"
+        if isinstance(dependent, Dependent):
+            parsed.append(dependent)
+            continue
+        _object(dependent, path)
+        date_of_birth = dependent.get("date_of_birth")
+        if not isinstance(date_of_birth, str):
+            raise ValidationError(f"{path}.date_of_birth", "required YYYY-MM-DD date")
+        try:
+            year = birth_year(date_of_birth)
+        except ValueError:
+            raise ValidationError(f"{path}.date_of_birth", f"not a YYYY-MM-DD date: {date_of_birth!r}")
+        childcare = _parse_childcare(dependent.get("childcare"), f"{path}.childcare")
+        parsed.append(Dependent(_optional_text(dependent, "name", path), tax_year - year, childcare))
+    return tuple(parsed)
+
+def parse_household(data):
+    """
+    Validate a taxpayer record and build a Household from it in one pass.
+
+    Args:
+        data (dict or Household): Parsed JSON shaped like data/taxpayer_information.json.
+                                  A Household is returned unchanged.
+
+    Raises:
+        ValidationError: For the first field that is missing or malformed.
+    """
+    if isinstance(data, Household):
+        return data
+    _object(data, "")
+
+    filing_status = data.get("filing_status")
+    if filing_status not in FILING_STATUSES:
+        raise ValidationError("filing_status", f"expected one of {list(FILING_STATUSES)}, got {filing_status!r}")
+
+    if "income" not in data:
+        raise ValidationError("income", "required")
+    income = _object(data["income"], "income")
+    if "total_income" not in income:
+        raise ValidationError("income.total_income", "required")
+    total_income = _number(income["total_income"], "income.total_income")
+
+    tax_year = data.get("tax_year")
+    if tax_year is not None and (not isinstance(tax_year, int) or isinstance(tax_year, bool)):
+        raise ValidationError("tax_year", f"expected an integer year, got {tax_year!r}")
+    jurisdiction = _optional_text(data, "jurisdiction", "")
+
+    education = _object(data["education"], "education") if data.get("education") is not None else {}
+
+    return Household(
+        filing_status,
+        _parse_person(data, "taxpayer", income, 0),
+        _parse_person(data, "spouse", income, 1) if data.get("spouse") else None,
+        parse_dependents(data.get("dependents", []), tax_year),
+        total_income,
+        _optional_number(education, "qualified_expenses", "education"),
+        tax_year,
+        jurisdiction,
+    )
+
+def load_household(raw):
+    """
+    Parse and validate one JSON household record (str or bytes).
+
+    Raises:
+        ValidationError: For invalid JSON or an invalid record.
+    """
+    try:
+        data = loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValidationError("", f"invalid JSON: {e}") from e
+    return parse_household(data)
+
+# Example usage:
+if __name__ == "__main__":
+    from data_utils import data_path
+    with open(data_path("taxpayer_information"), "rb") as file:
+        household = load_household(file.read())
+    print(household, household.taxpayer, household.dependents)
+    try:
+        parse_household({"filing_status": "single", "income": {"total_income": 50000},
+                         "dependents": [{"name": "A", "date_of_birth": "2015-02-30"}]})
+    except ValidationError as e:
+        print(f"ValidationError: {e}")
@@ -0,0 +1,174 @@
+from graph_utils import ReturnGraph, household_inputs
+
+# Lines produced by compute_return, in output order, and the form line each one reads
+RETURN_LINES = {
+    "taxable_income": "1040.line_15",
+    "tax": "1040.line_16",
+    "form_2441_credit": "2441.line_11",
+    "form_8863_refundable": "8863.line_8",
+    "form_8863_nonrefundable": "8863.line_19",
+    "credit_limit_worksheet_a": "worksheet_a.line_5",
+    "child_tax_credit": "child_credit.line_14",
+    "schedule_3_total": "schedule_3.line_8",
+}
+
+def compute_return(data, cents=False):
+    """
+    Run the full computation for one household record: standard deduction, tax,
+    Form 2441, Form 8863 Parts I and II, Credit Limit Worksheet A, the child tax
+    credit and Schedule 3 Part I.
+
+    Every form line is evaluated once through a ReturnGraph, so shared results
+    (the Form 1040 tax, the Form 2441 credit) are not recomputed.
+
+    Args:
+        data (dict): Taxpayer record shaped like data/taxpayer_information.json
+        cents (bool): Compute in integer cents with cents_utils.CentsEngine, rounding each
+                      line half up to the cent once, instead of in floats
+
+    Returns:
+        dict: One value per name in RETURN_LINES (integer cents with cents=True).
+    """
+    return dict(zip(RETURN_LINES, compute_return_values(data, cents)))
+
+def compute_return_values(data, cents=False):
+    """
+    compute_return without the dict: a tuple with one value per name in RETURN_LINES,
+    in order, for columnar sinks.
+    """
+    if cents:
+        return compute_return_cents(household_inputs(data))
+    graph = ReturnGraph.from_household(data)
+    return tuple(graph[line_name] for line_name in RETURN_LINES.values())
+
+def compute_return_cents(inputs):
+    """
+    The RETURN_LINES values in integer cents for one household's graph inputs (see
+    graph_utils.household_inputs), computed by the year's CentsEngine.
+
+    Returns:
+        tuple: One int per name in RETURN_LINES, in order.
+    """
+    from cents_utils import get_cents_engine, to_cents
+    from dependent_utils import normalize_dependents
+    from forms_utils import form_2441_qualifying_expenses, form_2441_earned_income
+    from worksheet_utils import count_qualifying_children
+
+    dependents = normalize_dependents(inputs["dependents"], inputs["tax_year"])
+    qualifying_expenses, qualifying_person_count = form_2441_qualifying_expenses(dependents)
+    filing_status = inputs["filing_status"]
+    earned_income = form_2441_earned_income(filing_status, to_cents(inputs["taxpayer_income"]),
+                                            to_cents(inputs["spouse_income"]))
+    engine = get_cents_engine(inputs["tax_year"], inputs["jurisdiction"])
+    return engine.return_cents(filing_status, to_cents(inputs["total_income"]), earned_income,
+                               to_cents(qualifying_expenses), qualifying_person_count,
+                               count_qualifying_children(dependents), to_cents(inputs["qualified_education_expenses"]))
+
+def _round_ratio(ratios):
+    """
+    round(ratio, 3) for an array, matching Python's correctly rounded float round().
+    NumPy rounds ratio * 1000, which can land on the wrong side of a half; those few
+    near-ties are rounded one at a time.
+    """
+    import numpy as np
+    rounded = np.round(ratios, 3)
+    scaled = ratios * 1000
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_tie):
+        rounded.flat[index] = round(float(ratios.flat[index]), 3)
+    return rounded
+
+def compute_return_batch(filing_status, total_income, taxpayer_income, spouse_income, qualifying_expenses,
+                         qualifying_persons, qualifying_children, qualified_education_expenses,
+                         tax_year=None, jurisdiction=None):
+    """
+    Vectorized compute_return for many variations of one household: the same lines,
+    evaluated over arrays with the formulas of the scalar form functions. The tax goes
+    through compute_tax_batch, so the process-wide tables are reused. Requires NumPy.
+
+    Args:
+        filing_status (str): One filing status for every element
+        total_income, taxpayer_income, spouse_income (array-like): Form 1040 line 11 and
+            the Form 2441 earned incomes
+        qualifying_expenses (array-like): Childcare costs of the qualifying persons (under 13)
+        qualifying_persons (array-like): Number of qualifying persons for Form 2441
+        qualifying_children (array-like): Number of children under 17 for the child tax credit
+        qualified_education_expenses (array-like): Form 8863 line 27 input
+        tax_year (int), jurisdiction (str): As in compute_return's record fields
+
+    Returns:
+        dict: One float64 array per name in RETURN_LINES, all of the broadcast shape.
+
+    Raises:
+        ValueError: If the filing status has no standard deduction, as
+                    adjust_for_standard_deduction does.
+    """
+    import numpy as np
+    from forms_utils import form_2441_credit_allowed
+    from table_utils import get_standard_deductions
+    from tax_utils import compute_tax_batch
+    from year_utils import get_tax_year_data
+
+    arrays = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in (
+        total_income, taxpayer_income, spouse_income, qualifying_expenses, qualifying_persons,
+        qualifying_children, qualified_education_expenses)))
+    (total_income, taxpayer_income, spouse_income, qualifying_expenses, qualifying_persons,
+     qualifying_children, qualified_education_expenses) = arrays
+
+    # Form 1040 lines 15 to 18
+    if tax_year is None and jurisdiction is None:
+        deductions = get_standard_deductions()
+    else:
+        deductions = get_tax_year_data(tax_year, jurisdiction).standard_deductions
+    if filing_status not in deductions:
+        raise ValueError(f"Invalid filing status. Must be one of: {list(deductions.keys())}")
+    taxable_income = np.maximum(0, total_income - deductions[filing_status])
+    tax = np.nan_to_num(compute_tax_batch(taxable_income, filing_status, tax_year, jurisdiction), nan=0.0)
+
+    # Form 2441
+    thresholds = get_tax_year_data(tax_year, jurisdiction).credit_thresholds
+    eligible_expenses = np.minimum(qualifying_expenses, np.where(qualifying_persons == 1, 3000, 6000))
+    if filing_status == "married_filing_jointly":
+        earned_income = np.minimum(taxpayer_income, spouse_income)
+    else:
+        earned_income = taxpayer_income
+    percentage = np.full(total_income.shape, 0.20)
+    # Reversed so the first matching row wins, as in form_2441_applicable_percentage
+    for min_income, max_income, rate in reversed(thresholds.form_2441_percentages):
+        percentage[(min_income <= total_income) & (total_income < max_income)] = rate
+    initial_credit = np.minimum(eligible_expenses, earned_income) * percentage
+    if not form_2441_credit_allowed(filing_status):
+        initial_credit = np.zeros(total_income.shape)
+    dependent_care_credit = np.minimum(initial_credit, np.where(tax <= 0, 0, tax))
+
+    # Form 8863
+    adjusted_expenses = np.minimum(qualified_education_expenses, 4000)
+    excess_expenses = np.maximum(0, adjusted_expenses - 2000)
+    opportunity_credit = np.where(excess_expenses == 0, adjusted_expenses, excess_expenses * 0.25 + 2000)
+    income_room = thresholds.form_8863_income_limit(filing_status) - total_income
+    phaseout_range = thresholds.form_8863_phaseout_range(filing_status)
+    phaseout_ratio = np.where(income_room >= phaseout_range, 1.0, _round_ratio(income_room / phaseout_range))
+    refundable = np.where(income_room > 0, opportunity_credit * phaseout_ratio * 0.40, 0.0)
+    if filing_status == "married_filing_separately":
+        # No education credits when married filing separately, as in form_8863_phaseout_ratio
+        refundable = np.zeros(total_income.shape)
+    nonrefundable = refundable / 0.4 * 0.6
+
+    # Credit Limit Worksheet A and the child tax credit
+    credit_limit = tax - dependent_care_credit
+    child_tax_credit = thresholds.child_tax_credit
+    credit_before_limit = qualifying_children * child_tax_credit["credit_per_qualifying_child"]
+    difference = total_income - child_tax_credit["threshold"]
+    credit_before_limit = np.where(difference >= 0, credit_before_limit,
+                                   credit_before_limit - np.maximum(0, (difference // 1000) * 50))
+
+    return {
+        "taxable_income": taxable_income,
+        "tax": tax,
+        "form_2441_credit": dependent_care_credit,
+        "form_8863_refundable": refundable,
+        "form_8863_nonrefundable": nonrefundable,
+        "credit_limit_worksheet_a": credit_limit,
+        "child_tax_credit": np.minimum(credit_limit, credit_before_limit),
+        "schedule_3_total": dependent_care_credit,
+    }
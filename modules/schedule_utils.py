@@ -1,33 +1,37 @@
-import os
-import json
+from data_utils import data_path
 from worksheet_utils import calculate_credit_limit_worksheet_a
 from forms_utils import calculate_form_2441
+from instrument_utils import instrumented
 
-def load_config():
-    """Load configuration from config.json"""
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
-    with open(config_path, 'r') as f:
-        return json.load(f)
-
-CONFIG = load_config()
+def schedule3_part_i_total(credit_for_child_and_dependent_care: float) -> float:
+    '''
+    Total Schedule 3 Part I nonrefundable credits from the individual credit lines.
+    Currently only line 2 (Form 2441) is captured.
+    '''
+    TotalNonrefundableCredits = credit_for_child_and_dependent_care
+    return TotalNonrefundableCredits
 
-def schedule3_Form1040(file_path: str) -> float:
+@instrumented()
+def schedule3_Form1040(file_path, print_output: bool = True, strict: bool = False) -> float:
     ''' 
     Currently, this function attempts to capture only Part I of Schedule 3, which deals with nonrefundable credits.
     
     Args:
-        file_path (str): Path to the taxpayer information JSON file
+        file_path (str or dict): Path to the taxpayer information JSON file, or the already-parsed record
+        print_output (bool): Whether Form 2441 prints its calculation details (default: True)
+        strict (bool): Raise on a missing file, invalid JSON or a malformed record instead of
+                       counting the Form 2441 credit as 0 (see calculate_form_2441)
     
     Returns:
         float: Total nonrefundable credits from Schedule 3
     '''
     # Part I: Nonrefundable credits
-    CreditforChildandDependentCareExpenses = calculate_form_2441(file_path, print_output=True)
-    TotalNonrefundableCredits = CreditforChildandDependentCareExpenses
+    CreditforChildandDependentCareExpenses = calculate_form_2441(file_path, print_output=print_output, strict=strict)
+    TotalNonrefundableCredits = schedule3_part_i_total(CreditforChildandDependentCareExpenses)
     return TotalNonrefundableCredits    
 
 if __name__ == "__main__":
-    taxpayer_info_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), CONFIG['data_paths']['taxpayer_information'])
+    taxpayer_info_path = data_path('taxpayer_information')
     result = schedule3_Form1040(taxpayer_info_path)
     print(f"Total Nonrefundable Credits: ${result:,.2f}")    
 
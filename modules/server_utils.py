@@ -0,0 +1,348 @@
+import asyncio
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_utils import warm_tables
+from table_utils import FILING_STATUSES
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+class RequestError(ValueError):
+    """A request the server rejects, with the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _content_length(headers):
+    """
+    Parse the Content-Length header (0 if absent).
+
+    Raises:
+        RequestError: 400 if it is not a non-negative integer, 413 if it is over MAX_BODY_BYTES.
+    """
+    value = headers.get("content-length", "")
+    if not value:
+        return 0
+    if not (value.isascii() and value.isdigit()):
+        raise RequestError(400, f"Invalid Content-Length {value!r}")
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"Body over {MAX_BODY_BYTES} bytes")
+    return length
+
+# Work functions. These run in the worker processes, so they take and return plain data.
+
+def compute_taxes(items):
+    """
+    Compute the tax for a batch of (taxable_income, filing_status, tax_year, jurisdiction) items,
+    one compute_tax_batch call per (tax_year, jurisdiction). Falls back to compute_tax when NumPy
+    is not installed.
+
+    Returns:
+        list: {"tax": float or None} or {"error": str} per item, in order.
+    """
+    from tax_utils import compute_tax, compute_tax_batch
+
+    results = [None] * len(items)
+    groups = {}
+    for index, item in enumerate(items):
+        # A malformed item fails on its own rather than taking the whole batch down
+        try:
+            _, _, tax_year, jurisdiction = item
+            groups.setdefault((tax_year, jurisdiction), []).append(index)
+        except Exception as e:
+            results[index] = {"error": f"{type(e).__name__}: {e}"}
+
+    for (tax_year, jurisdiction), indexes in groups.items():
+        incomes = [items[index][0] for index in indexes]
+        statuses = [items[index][1] for index in indexes]
+        try:
+            try:
+                taxes = compute_tax_batch(incomes, statuses, tax_year, jurisdiction).tolist()
+                taxes = [None if math.isnan(tax) else tax for tax in taxes]
+            except ImportError:
+                taxes = [compute_tax(income, status, tax_year, jurisdiction) for income, status in zip(incomes, statuses)]
+        except Exception as e:
+            for index in indexes:
+                results[index] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        for index, tax in zip(indexes, taxes):
+            results[index] = {"tax": tax}
+    return results
+
+def _form_2441(data):
+    from forms_utils import calculate_form_2441
+    return {"form_2441_credit": calculate_form_2441(data, print_output=False, strict=True)}
+
+def _schedule3(data):
+    from schedule_utils import schedule3_Form1040
+    return {"schedule_3_total": schedule3_Form1040(data, print_output=False, strict=True)}
+
+def _form_8863(data):
+    from forms_utils import calculate_form_8863_part_iii, calculate_form_8863_part_i, calculate_form_8863_part_ii
+    filing_status = data["filing_status"]
+    adjusted_gross_income = data["adjusted_gross_income"]
+    qualified_expenses = data.get("qualified_expenses", 0)
+    tax_year = data.get("tax_year")
+    jurisdiction = data.get("jurisdiction")
+    return {
+        "american_opportunity_credit": calculate_form_8863_part_iii(False, qualified_expenses),
+        "refundable": calculate_form_8863_part_i(False, filing_status, adjusted_gross_income, qualified_expenses,
+                                                 tax_year, jurisdiction),
+        "nonrefundable": calculate_form_8863_part_ii(False, filing_status, adjusted_gross_income, qualified_expenses,
+                                                     tax_year, jurisdiction),
+    }
+
+def _return(data):
+    from return_utils import compute_return
+    from record_utils import parse_household
+    return compute_return(parse_household(data))
+
+RECORD_ENDPOINTS = {
+    "/form_2441": _form_2441,
+    "/schedule3": _schedule3,
+    "/form_8863": _form_8863,
+    "/return": _return,
+}
+
+def compute_records(path, payloads):
+    """
+    Run one record endpoint over a batch of payloads, isolating errors to their payload.
+
+    Returns:
+        list: The endpoint result or {"error": str} per payload, in order.
+    """
+    func = RECORD_ENDPOINTS[path]
+    results = []
+    for payload in payloads:
+        try:
+            results.append(func(payload))
+        except Exception as e:
+            results.append({"error": f"{type(e).__name__}: {e}"})
+    return results
+
+def _tax_item(payload):
+    """Validate a /tax payload the way compute_tax does and return a compute_taxes item"""
+    try:
+        taxable_income = float(payload["taxable_income"])
+        filing_status = payload["filing_status"]
+    except (KeyError, TypeError, ValueError):
+        raise RequestError(400, "Expected {\"taxable_income\": number, \"filing_status\": str}")
+    # compute_tax lowercases the status for the tax table but not for the rate schedule
+    status = filing_status.lower() if isinstance(filing_status, str) and taxable_income < 100000 else filing_status
+    if status not in FILING_STATUSES:
+        raise RequestError(400, f"Invalid filing status. Must be one of: {list(FILING_STATUSES)}")
+    tax_year, jurisdiction = payload.get("tax_year"), payload.get("jurisdiction")
+    if tax_year is not None and (not isinstance(tax_year, int) or isinstance(tax_year, bool)):
+        raise RequestError(400, f"Expected an integer tax_year, got {tax_year!r}")
+    if jurisdiction is not None and not isinstance(jurisdiction, str):
+        raise RequestError(400, f"Expected a string jurisdiction, got {jurisdiction!r}")
+    return taxable_income, status, tax_year, jurisdiction
+
+
+class MicroBatcher:
+    """
+    Collects concurrent submissions and runs them as one batch.
+
+    A batch is flushed when it reaches max_batch items or window seconds after its
+    first item arrived, whichever comes first.
+    """
+
+    def __init__(self, run_batch, window=0.002, max_batch=256):
+        """
+        Args:
+            run_batch: Coroutine function taking a list of items and returning a list of results
+            window (float): Seconds to wait for more items after the first
+            max_batch (int): Flush as soon as this many items are pending
+        """
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = []
+        self.flush_handle = None
+        self.running = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((item, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        self.batches += 1
+        self.items += len(batch)
+        task = asyncio.ensure_future(self._run(batch))
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+
+    async def _run(self, batch):
+        try:
+            results = await self.run_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class TaxServer:
+    """
+    Asyncio HTTP server for quotes and returns.
+
+    Endpoints (JSON request and response bodies):
+        POST /tax         {"taxable_income", "filing_status", "tax_year"?, "jurisdiction"?} -> {"tax"}
+        POST /form_2441   taxpayer record -> {"form_2441_credit"}
+        POST /schedule3   taxpayer record -> {"schedule_3_total"}
+        POST /form_8863   {"filing_status", "adjusted_gross_income", "qualified_expenses", "tax_year"?}
+        POST /return      taxpayer record -> the lines from return_utils.compute_return
+        GET  /health      -> {"status": "ok", "batches": {...}}
+
+    Concurrent requests to the same endpoint are micro-batched: /tax requests become one
+    compute_tax_batch call, and record endpoints are sent to a worker as one task. The work
+    runs in a process pool whose workers load the tax tables once at startup.
+    """
+
+    def __init__(self, workers=None, batch_window_ms=2, max_batch=256):
+        """
+        Args:
+            workers (int): Worker processes. None uses every CPU; 0 runs batches in a thread
+                           of this process instead.
+            batch_window_ms (float): How long a batch waits for more requests
+            max_batch (int): Largest batch sent to a worker
+        """
+        warm_tables()
+        self.executor = None
+        if workers != 0:
+            self.executor = ProcessPoolExecutor(workers, initializer=warm_tables)
+        window = batch_window_ms / 1000
+        self.batchers = {"/tax": MicroBatcher(self._run_taxes, window, max_batch)}
+        for path in RECORD_ENDPOINTS:
+            self.batchers[path] = MicroBatcher(self._record_runner(path), window, max_batch)
+        self.server = None
+
+    async def _run_taxes(self, items):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, compute_taxes, items)
+
+    def _record_runner(self, path):
+        async def run(payloads):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, compute_records, path, payloads)
+        return run
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def dispatch(self, method, path, body):
+        """
+        Route one request.
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable response body)
+        """
+        if path == "/health":
+            return 200, {"status": "ok",
+                         "batches": {name: {"batches": batcher.batches, "requests": batcher.items}
+                                     for name, batcher in self.batchers.items()}}
+        if path not in self.batchers:
+            raise RequestError(404, f"Unknown endpoint {path}. Available: {sorted(self.batchers)}")
+        if method != "POST":
+            raise RequestError(405, f"{path} only accepts POST")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError as e:
+            raise RequestError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise RequestError(400, "Expected a JSON object")
+
+        item = _tax_item(payload) if path == "/tax" else payload
+        result = await self.batchers[path].submit(item)
+        return (400 if "error" in result else 200), result
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close")
+                try:
+                    length = _content_length(headers)
+                except RequestError as e:
+                    # The body's extent is unknown, so the connection cannot be reused
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, response = await self.dispatch(method, target.split("?", 1)[0], body)
+                except RequestError as e:
+                    status, response = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, response = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive=True):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(host="127.0.0.1", port=8080, workers=None, batch_window_ms=2, max_batch=256):
+    """Run a TaxServer until cancelled"""
+    tax_server = TaxServer(workers, batch_window_ms, max_batch)
+    server = await tax_server.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        tax_server.close()
@@ -0,0 +1,161 @@
+import json
+import sys
+
+from forms_utils import calculate_form_2441
+from schedule_utils import schedule3_Form1040
+from return_utils import compute_return
+from record_utils import loads, parse_household
+
+class JsonlError(ValueError):
+    """An unparseable line in a JSONL stream"""
+
+    def __init__(self, line_number, message):
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+
+def iter_jsonl(stream, invalid="raise"):
+    """
+    Read newline-delimited JSON records one at a time.
+
+    Args:
+        stream: An open text stream, a path to a JSONL file, or "-" for stdin.
+        invalid (str): "raise" to raise JsonlError on a bad line, or "yield" to yield
+                       the JsonlError in place of the record and keep reading.
+
+    Yields:
+        dict: One parsed record per non-blank line.
+    """
+    if stream == "-":
+        stream = sys.stdin
+    if isinstance(stream, str):
+        with open(stream, 'r') as file:
+            yield from iter_jsonl(file, invalid)
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield loads(line)
+        except json.JSONDecodeError as e:
+            error = JsonlError(line_number, e.msg)
+            if invalid != "yield":
+                raise error from e
+            yield error
+
+def write_jsonl(results, stream=None, flush_every=1000):
+    """
+    Write results to a JSONL stream as they are produced.
+
+    Args:
+        results (iterable): Dicts (or other JSON-serializable values) to write
+        stream: An open text stream, a path, or None/"-" for stdout
+        flush_every (int): Flush after this many lines so downstream readers see progress
+
+    Returns:
+        int: Number of lines written.
+    """
+    if stream is None or stream == "-":
+        stream = sys.stdout
+    if isinstance(stream, str):
+        with open(stream, 'w') as file:
+            return write_jsonl(results, file, flush_every)
+
+    count = 0
+    for result in results:
+        stream.write(json.dumps(result) + "\n")
+        count += 1
+        if count % flush_every == 0:
+            stream.flush()
+    stream.flush()
+    return count
+
+def _records(records):
+    """
+    Accept either an iterable of records or a stream/path/"-" to read JSONL from.
+    Unparseable lines come through as JsonlError instances.
+    """
+    if isinstance(records, str) or hasattr(records, "read"):
+        return iter_jsonl(records, invalid="yield")
+    return records
+
+def stream_form_2441(records, print_output: bool = False, registry=None):
+    """
+    Calculate Form 2441 for each record as it arrives.
+
+    Args:
+        records: Iterable of taxpayer dicts or file paths, or a JSONL stream/path/"-"
+        registry (ProviderRegistry): Optional provider index that accumulates Part I payments
+
+    Yields:
+        dict: {"form_2441_credit": float}, or {"error": str} for an unparseable line or a
+              malformed record (rather than a credit of 0)
+    """
+    for data in _records(records):
+        if isinstance(data, JsonlError):
+            yield {"error": str(data)}
+            continue
+        try:
+            credit = calculate_form_2441(data, print_output=print_output, registry=registry, strict=True)
+        except Exception as e:
+            yield {"error": f"{type(e).__name__}: {e}"}
+            continue
+        yield {"form_2441_credit": credit}
+
+def stream_schedule3(records, print_output: bool = False):
+    """
+    Calculate Schedule 3 Part I for each record as it arrives.
+
+    Args:
+        records: Iterable of taxpayer dicts or file paths, or a JSONL stream/path/"-"
+
+    Yields:
+        dict: {"schedule_3_total": float}, or {"error": str} for an unparseable line or a
+              malformed record (rather than a total of 0)
+    """
+    for data in _records(records):
+        if isinstance(data, JsonlError):
+            yield {"error": str(data)}
+            continue
+        try:
+            total = schedule3_Form1040(data, print_output=print_output, strict=True)
+        except Exception as e:
+            yield {"error": f"{type(e).__name__}: {e}"}
+            continue
+        yield {"schedule_3_total": total}
+
+def stream_returns(records):
+    """
+    Compute the full return for each record as it arrives. Records are validated with
+    record_utils.parse_household first. A record that fails to parse, validate or compute
+    yields {"error": ...} instead of stopping the stream.
+
+    Args:
+        records: Iterable of taxpayer dicts, or a JSONL stream/path/"-"
+
+    Yields:
+        dict: The lines from return_utils.compute_return, or {"error": str}.
+    """
+    for data in _records(records):
+        if isinstance(data, JsonlError):
+            yield {"error": str(data)}
+            continue
+        try:
+            yield compute_return(parse_household(data))
+        except Exception as e:
+            yield {"error": f"{type(e).__name__}: {e}"}
+
+STREAMS = {
+    "form_2441": stream_form_2441,
+    "schedule3": stream_schedule3,
+    "return": stream_returns,
+}
+
+# Example usage:
+#   python modules/stream_utils.py return < households.jsonl > results.jsonl
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "return"
+    if mode not in STREAMS:
+        print(f"Error: unknown mode {mode!r}. Must be one of: {list(STREAMS)}", file=sys.stderr)
+        sys.exit(1)
+    write_jsonl(STREAMS[mode]("-"))
@@ -0,0 +1,158 @@
+from fractions import Fraction
+
+from table_utils import FILING_STATUSES, FormulaTaxTable, get_tax_table, get_rate_schedule
+from curve_utils import derive_table_brackets, round_half_up
+
+# Consistency checks for the tax table and rate schedule.
+#
+# Each check returns a list of (severity, message) issues: "error" for data that
+# cannot be right (gaps, overlaps, decreasing tax), "warning" for jumps in the tax
+# function that are in the published data but are worth knowing about.
+
+TABLE_LIMIT = 100000
+
+def check_table_bands(tax_table):
+    """Bands must be non-empty, sorted, and each must start where the previous one ended"""
+    issues = []
+    lower_bounds, upper_bounds = tax_table.lower_bounds, tax_table.upper_bounds
+    for index, (lower_bound, upper_bound) in enumerate(zip(lower_bounds, upper_bounds)):
+        if upper_bound <= lower_bound:
+            issues.append(("error", f"Band {lower_bound}-{upper_bound} is empty"))
+        if index == 0:
+            continue
+        previous = upper_bounds[index - 1]
+        if lower_bound > previous:
+            issues.append(("error", f"Gap between {previous} and {lower_bound}"))
+        elif lower_bound < previous:
+            issues.append(("error", f"Band {lower_bound}-{upper_bound} overlaps the band ending at {previous}"))
+    if lower_bounds and lower_bounds[0] != 0:
+        issues.append(("error", f"Table starts at {lower_bounds[0]} instead of 0"))
+    if upper_bounds and upper_bounds[-1] != TABLE_LIMIT:
+        issues.append(("error", f"Table ends at {upper_bounds[-1]} instead of {TABLE_LIMIT}"))
+    return issues
+
+def check_table_monotonic(tax_table):
+    """Tax must never decrease as income rises"""
+    issues = []
+    for status in FILING_STATUSES:
+        column = tax_table.columns[status]
+        for index in range(1, len(column)):
+            if column[index] < column[index - 1]:
+                issues.append(("error", f"{status}: tax falls from {column[index - 1]} to {column[index]} "
+                                        f"at {tax_table.lower_bounds[index]}"))
+    return issues
+
+def check_schedule_brackets(rate_schedule):
+    """Brackets must be contiguous, and the tax must not jump at a bracket boundary"""
+    issues = []
+    for status in rate_schedule.statuses:
+        minimums = rate_schedule.minimums[status]
+        maximums = rate_schedule.maximums[status]
+        rates = rate_schedule.rates[status]
+        subtract_amounts = rate_schedule.subtract_amounts[status]
+        for index in range(1, len(minimums)):
+            if maximums[index - 1] != minimums[index]:
+                issues.append(("error", f"{status}: bracket ending at {maximums[index - 1]} is followed by one "
+                                        f"starting at {minimums[index]}"))
+                continue
+            boundary = minimums[index]
+            below = Fraction(str(rates[index - 1])) * boundary - Fraction(str(subtract_amounts[index - 1]))
+            above = Fraction(str(rates[index])) * boundary - Fraction(str(subtract_amounts[index]))
+            if below != above:
+                issues.append(("warning", f"{status}: tax jumps by {float(above - below):+.2f} at {boundary:,}"))
+        if maximums and maximums[-1] is not None:
+            issues.append(("error", f"{status}: top bracket ends at {maximums[-1]} instead of being open"))
+    return issues
+
+def check_table_schedule_continuity(tax_table, rate_schedule):
+    """
+    At $100,000 the schedule must pick up where the table stops: the last table row
+    must be the schedule formula at that band's midpoint, rounded half up.
+    """
+    issues = []
+    index = len(tax_table.lower_bounds) - 1
+    midpoint = Fraction(tax_table.lower_bounds[index] + tax_table.upper_bounds[index], 2)
+    for status in FILING_STATUSES:
+        if status not in rate_schedule.statuses:
+            issues.append(("error", f"{status}: no rate schedule"))
+            continue
+        if rate_schedule.minimums[status][0] != TABLE_LIMIT:
+            issues.append(("error", f"{status}: rate schedule starts at {rate_schedule.minimums[status][0]} "
+                                    f"instead of {TABLE_LIMIT}"))
+        expected = round_half_up(Fraction(str(rate_schedule.rates[status][0])) * midpoint
+                                 - Fraction(str(rate_schedule.subtract_amounts[status][0])))
+        actual = tax_table.columns[status][index]
+        if actual != expected:
+            issues.append(("error", f"{status}: last table row is {actual}, the schedule gives {expected} "
+                                    f"at {float(midpoint):,}"))
+    return issues
+
+def check_tax_data(tax_table=None, rate_schedule=None):
+    """Run every check on the tax table and rate schedule (the process-wide ones by default)"""
+    tax_table = tax_table or get_tax_table()
+    rate_schedule = rate_schedule or get_rate_schedule()
+    return (check_table_bands(tax_table) + check_table_monotonic(tax_table)
+            + check_schedule_brackets(rate_schedule) + check_table_schedule_continuity(tax_table, rate_schedule))
+
+
+def band_runs(tax_table):
+    """Group the table bands into {"start", "end", "width"} runs of equal width"""
+    runs = []
+    for lower_bound, upper_bound in zip(tax_table.lower_bounds, tax_table.upper_bounds):
+        width = upper_bound - lower_bound
+        if runs and runs[-1]["width"] == width and runs[-1]["end"] == lower_bound:
+            runs[-1]["end"] = upper_bound
+        else:
+            runs.append({"start": lower_bound, "end": upper_bound, "width": width})
+    return runs
+
+def _json_number(value):
+    """A Fraction as the int or float it would be written as in the data files"""
+    return int(value) if value.denominator == 1 else float(value)
+
+def derive_formula_table(tax_table=None, rate_schedule=None):
+    """
+    Build the FormulaTaxTable that reproduces a stored tax table: its band layout plus
+    the brackets recovered by curve_utils.derive_table_brackets. The result still has to
+    pass verify_formula_table before it can stand in for the table.
+    """
+    tax_table = tax_table or get_tax_table()
+    rate_schedule = rate_schedule or get_rate_schedule()
+    brackets = {}
+    for status in FILING_STATUSES:
+        derived = derive_table_brackets(status, tax_table, rate_schedule)
+        brackets[status] = [{"min": minimum, "tax_rate": _json_number(rate), "subtract_amount": _json_number(amount)}
+                            for minimum, rate, amount in derived]
+    return FormulaTaxTable(band_runs(tax_table), brackets)
+
+def verify_formula_table(formula_table, tax_table=None):
+    """
+    Prove formula_table equivalent to tax_table.
+
+    Both are constant on each band and undefined outside [first bound, last bound), so
+    comparing the bounds and every value of every band covers every possible income.
+
+    Returns:
+        list: (severity, message) issues; empty if the two are equivalent.
+    """
+    tax_table = tax_table or get_tax_table()
+    issues = []
+    if len(formula_table) != len(tax_table.lower_bounds):
+        return [("error", f"Formula table has {len(formula_table)} bands, the table has {len(tax_table.lower_bounds)}")]
+    for index, (lower_bound, upper_bound) in enumerate(zip(tax_table.lower_bounds, tax_table.upper_bounds)):
+        if formula_table.bounds(index) != (lower_bound, upper_bound):
+            issues.append(("error", f"Band {index} is {formula_table.bounds(index)}, the table has "
+                                    f"{(lower_bound, upper_bound)}"))
+            continue
+        for status in FILING_STATUSES:
+            value = formula_table.value(index, status)
+            if value != tax_table.columns[status][index]:
+                issues.append(("error", f"{status}: band {lower_bound}-{upper_bound} computes to {value}, "
+                                        f"the table has {tax_table.columns[status][index]}"))
+    return issues
+
+if __name__ == "__main__":
+    for severity, message in check_tax_data():
+        print(f"{severity}: {message}")
+    formula_table = derive_formula_table()
+    print(f"{len(formula_table.bands)} band runs, equivalent: {not verify_formula_table(formula_table)}")
@@ -0,0 +1,654 @@
+import bisect
+import json
+import os
+import sys
+import time
+from array import array
+from data_utils import cached, data_path, load_config, load_json, read_json_file
+from instrument_utils import record_io
+
+FILING_STATUSES = ("single", "married_filing_jointly", "married_filing_separately", "head_of_household")
+
+
+class TaxTable:
+    """
+    Column-oriented, sorted view of the tax table (Complete_Tax_Tables.json).
+
+    The table is stored as parallel lists: one list of lower bounds, one of upper
+    bounds and one value column per filing status. Lookups use direct bucket
+    arithmetic over the uniform $50 bands and fall back to bisect for the narrower
+    bands at the bottom of the table.
+    """
+
+    def __init__(self, lower_bounds, upper_bounds, columns):
+        self.lower_bounds = lower_bounds
+        self.upper_bounds = upper_bounds
+        self.columns = columns
+        self._arrays = None
+        self._find_uniform_tail()
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build a table from the list of dicts stored in Complete_Tax_Tables.json"""
+        entries = sorted(entries, key=lambda entry: entry["taxable_income_range"]["LowerBound"])
+        lower_bounds = [entry["taxable_income_range"]["LowerBound"] for entry in entries]
+        upper_bounds = [entry["taxable_income_range"]["UpperBound"] for entry in entries]
+        columns = {status: [entry[status] for entry in entries] for status in FILING_STATUSES}
+        return cls(lower_bounds, upper_bounds, columns)
+
+    @classmethod
+    def from_json(cls, path):
+        """Load and index a tax table JSON file"""
+        return cls.from_entries(read_json_file(path))
+
+    def __len__(self):
+        return len(self.lower_bounds)
+
+    def _find_uniform_tail(self):
+        """Locate the contiguous run of equal-width bands at the top of the table"""
+        self.uniform_start_index = len(self.lower_bounds)
+        self.uniform_start = None
+        self.uniform_width = None
+        if not self.lower_bounds:
+            return
+
+        width = self.upper_bounds[-1] - self.lower_bounds[-1]
+        index = len(self.lower_bounds) - 1
+        while (index > 0
+               and self.upper_bounds[index - 1] - self.lower_bounds[index - 1] == width
+               and self.upper_bounds[index - 1] == self.lower_bounds[index]):
+            index -= 1
+
+        self.uniform_start_index = index
+        self.uniform_start = self.lower_bounds[index]
+        self.uniform_width = width
+
+    def find_index(self, taxable_income):
+        """
+        Return the index of the band containing taxable_income, or None if no band
+        satisfies LowerBound <= taxable_income < UpperBound.
+        """
+        if self.uniform_width and taxable_income >= self.uniform_start:
+            index = self.uniform_start_index + int((taxable_income - self.uniform_start) // self.uniform_width)
+        else:
+            index = bisect.bisect_right(self.lower_bounds, taxable_income) - 1
+
+        if 0 <= index < len(self.lower_bounds) and self.lower_bounds[index] <= taxable_income < self.upper_bounds[index]:
+            return index
+        return None
+
+    def lookup(self, taxable_income, filing_status):
+        """
+        Look up the tax for taxable_income in the column for filing_status.
+
+        Returns:
+            float: The tax from the matching band.
+            None: If no band contains taxable_income.
+        """
+        index = self.find_index(taxable_income)
+        if index is None:
+            return None
+        return float(self.columns[filing_status][index])
+
+    def arrays(self):
+        """
+        Return NumPy views of the table, built on first use.
+
+        Returns:
+            tuple: (lower_bounds, upper_bounds, values) where values has one column
+                   per entry in FILING_STATUSES.
+        """
+        if self._arrays is None:
+            import numpy as np
+            lower_bounds = np.asarray(self.lower_bounds, dtype=np.float64)
+            upper_bounds = np.asarray(self.upper_bounds, dtype=np.float64)
+            values = np.column_stack([np.asarray(self.columns[status], dtype=np.float64) for status in FILING_STATUSES])
+            self._arrays = (lower_bounds, upper_bounds, values)
+        return self._arrays
+
+    def lookup_batch(self, taxable_incomes, status_codes):
+        """
+        Vectorized lookup over arrays of incomes and filing status codes.
+
+        Args:
+            taxable_incomes (numpy.ndarray): Float array of taxable incomes.
+            status_codes (numpy.ndarray): Integer array of indexes into FILING_STATUSES.
+
+        Returns:
+            numpy.ndarray: Tax amounts, NaN where no band contains the income.
+        """
+        import numpy as np
+        lower_bounds, upper_bounds, values = self.arrays()
+        index = np.searchsorted(lower_bounds, taxable_incomes, side='right') - 1
+        clipped = np.clip(index, 0, len(lower_bounds) - 1)
+        found = (index >= 0) & (taxable_incomes < upper_bounds[clipped])
+        return np.where(found, values[clipped, status_codes], np.nan)
+
+
+class FormulaTaxTable:
+    """
+    The tax table computed arithmetically instead of stored (Tax_Table_Formula.json).
+
+    The IRS tax table is a band layout plus, per filing status, the brackets below
+    $100,000: each row is the bracket formula at the band midpoint, rounded half up to
+    whole dollars. Storing just those is a few hundred bytes instead of ~2,000 rows,
+    and a lookup is arithmetic on the band layout and bracket list, both a handful of
+    entries. table_check_utils.verify_formula_table proves it equal to a stored table.
+
+    Provides the TaxTable interface (find_index, lookup, lookup_batch and the
+    lower_bounds/upper_bounds/columns lists, which are only built if asked for).
+    """
+
+    def __init__(self, bands, brackets):
+        """
+        Args:
+            bands (list): {"start", "end", "width"} runs of equal-width bands, contiguous from the first start
+            brackets (dict): filing status -> [{"min", "tax_rate", "subtract_amount"}], lowest first
+        """
+        self.bands = bands
+        self.brackets = brackets
+        self.band_starts = [band["start"] for band in bands]
+        self.band_widths = [band["width"] for band in bands]
+        self.band_first_index = []
+        count = 0
+        for band in bands:
+            self.band_first_index.append(count)
+            count += (band["end"] - band["start"]) // band["width"]
+        self.limit = bands[-1]["end"] if bands else 0
+        self.count = count
+
+        # Rates in parts per million and subtract amounts in cents keep every row exact in integers
+        self.bracket_minimums = {status: [row["min"] for row in rows] for status, rows in brackets.items()}
+        self.bracket_rates = {status: [_scaled(row["tax_rate"], RATE_SCALE, 'tax_rate') for row in rows]
+                              for status, rows in brackets.items()}
+        self.bracket_subtract_amounts = {status: [_scaled(row["subtract_amount"], CENTS_SCALE, 'subtract_amount')
+                                                  for row in rows]
+                                         for status, rows in brackets.items()}
+        self._materialized = None
+        self._arrays = None
+
+    @classmethod
+    def from_json(cls, path):
+        """Load a Tax_Table_Formula.json file"""
+        raw = read_json_file(path)
+        return cls(raw["bands"], raw["brackets"])
+
+    def as_dict(self):
+        """The JSON form read by from_json"""
+        return {"bands": self.bands, "brackets": self.brackets}
+
+    def __len__(self):
+        return self.count
+
+    def _run_for_index(self, index):
+        run = bisect.bisect_right(self.band_first_index, index) - 1
+        return run, self.band_starts[run] + (index - self.band_first_index[run]) * self.band_widths[run]
+
+    def bounds(self, index):
+        """(LowerBound, UpperBound) of band index"""
+        run, lower_bound = self._run_for_index(index)
+        return lower_bound, lower_bound + self.band_widths[run]
+
+    def find_index(self, taxable_income):
+        """Index of the band containing taxable_income, or None outside the table"""
+        if not self.band_starts or not self.band_starts[0] <= taxable_income < self.limit:
+            return None
+        run = len(self.band_starts) - 1
+        while self.band_starts[run] > taxable_income:
+            run -= 1
+        return self.band_first_index[run] + int((taxable_income - self.band_starts[run]) // self.band_widths[run])
+
+    def value(self, index, filing_status):
+        """Tax for band index: the bracket formula at the band midpoint, rounded half up"""
+        lower_bound, upper_bound = self.bounds(index)
+        minimums = self.bracket_minimums[filing_status]
+        bracket = bisect.bisect_right(minimums, lower_bound) - 1
+        # Twice the midpoint times the rate, in units of 1 / (2 * RATE_SCALE) dollars
+        scaled = (self.bracket_rates[filing_status][bracket] * (lower_bound + upper_bound)
+                  - self.bracket_subtract_amounts[filing_status][bracket] * (2 * RATE_SCALE // CENTS_SCALE))
+        return (scaled + RATE_SCALE) // (2 * RATE_SCALE)
+
+    def lookup(self, taxable_income, filing_status):
+        """
+        Look up the tax for taxable_income in the column for filing_status.
+
+        Returns:
+            float: The tax from the matching band.
+            None: If no band contains taxable_income.
+        """
+        band_starts = self.band_starts
+        if not band_starts or not band_starts[0] <= taxable_income < self.limit:
+            return None
+        run = len(band_starts) - 1
+        while band_starts[run] > taxable_income:
+            run -= 1
+        # Same arithmetic as find_index and value, without going back through the band index
+        width = self.band_widths[run]
+        lower_bound = band_starts[run] + int((taxable_income - band_starts[run]) // width) * width
+        bracket = bisect.bisect_right(self.bracket_minimums[filing_status], lower_bound) - 1
+        scaled = (self.bracket_rates[filing_status][bracket] * (2 * lower_bound + width)
+                  - self.bracket_subtract_amounts[filing_status][bracket] * (2 * RATE_SCALE // CENTS_SCALE))
+        return float((scaled + RATE_SCALE) // (2 * RATE_SCALE))
+
+    def _materialize(self):
+        if self._materialized is None:
+            bounds = [self.bounds(index) for index in range(self.count)]
+            columns = {status: [self.value(index, status) for index in range(self.count)] for status in self.brackets}
+            self._materialized = ([lower for lower, _ in bounds], [upper for _, upper in bounds], columns)
+        return self._materialized
+
+    @property
+    def lower_bounds(self):
+        return self._materialize()[0]
+
+    @property
+    def upper_bounds(self):
+        return self._materialize()[1]
+
+    @property
+    def columns(self):
+        return self._materialize()[2]
+
+    def to_entries(self):
+        """The table as the list of dicts stored in Complete_Tax_Tables.json"""
+        lower_bounds, upper_bounds, columns = self._materialize()
+        return [dict({"taxable_income_range": {"LowerBound": lower, "UpperBound": upper}},
+                     **{status: columns[status][index] for status in FILING_STATUSES})
+                for index, (lower, upper) in enumerate(zip(lower_bounds, upper_bounds))]
+
+    def lookup_batch(self, taxable_incomes, status_codes):
+        """
+        Vectorized lookup over arrays of incomes and filing status codes.
+
+        Returns:
+            numpy.ndarray: Tax amounts, NaN where no band contains the income.
+        """
+        import numpy as np
+        taxable_incomes = np.asarray(taxable_incomes, dtype=np.float64)
+        if not self.band_starts:
+            return np.full(taxable_incomes.shape, np.nan)
+        if self._arrays is None:
+            self._arrays = (np.asarray(self.band_starts, dtype=np.float64),
+                            np.asarray(self.band_widths, dtype=np.float64),
+                            {status: (np.asarray(self.bracket_minimums[status], dtype=np.float64),
+                                      np.asarray(self.bracket_rates[status], dtype=np.int64),
+                                      np.asarray(self.bracket_subtract_amounts[status], dtype=np.int64))
+                             for status in FILING_STATUSES})
+        band_starts, band_widths, brackets = self._arrays
+
+        status_codes = np.broadcast_to(status_codes, taxable_incomes.shape)
+        found = (taxable_incomes >= self.band_starts[0]) & (taxable_incomes < self.limit)
+        run = np.clip(np.searchsorted(band_starts, taxable_incomes, side='right') - 1, 0, len(band_starts) - 1)
+        lower_bounds = band_starts[run] + np.floor((taxable_incomes - band_starts[run]) / band_widths[run]) * band_widths[run]
+        midpoints_doubled = (2 * lower_bounds + band_widths[run]).astype(np.int64)
+
+        taxes = np.full(taxable_incomes.shape, np.nan)
+        for code, status in enumerate(FILING_STATUSES):
+            mask = found & (status_codes == code)
+            if not mask.any():
+                continue
+            minimums, rates, subtract_amounts = brackets[status]
+            bracket = np.searchsorted(minimums, lower_bounds[mask], side='right') - 1
+            scaled = (rates[bracket] * midpoints_doubled[mask]
+                      - subtract_amounts[bracket] * (2 * RATE_SCALE // CENTS_SCALE))
+            taxes[mask] = (scaled + RATE_SCALE) // (2 * RATE_SCALE)
+        return taxes
+
+
+class RateSchedule:
+    """
+    Indexed view of the tax rate schedule (Tax_computations_Line16.json).
+
+    Each filing status keeps parallel lists of bracket minimums, maximums
+    (None for the open top bracket), tax rates and subtract amounts.
+    """
+
+    def __init__(self, minimums, maximums, rates, subtract_amounts):
+        self.statuses = list(minimums.keys())
+        self.minimums = minimums
+        self.maximums = maximums
+        self.rates = rates
+        self.subtract_amounts = subtract_amounts
+        self._arrays = {}
+
+    @classmethod
+    def from_brackets(cls, brackets):
+        """Build a schedule from the 'tax_brackets' mapping in Tax_computations_Line16.json"""
+        minimums, maximums, rates, subtract_amounts = {}, {}, {}, {}
+        for status, entries in brackets.items():
+            entries = sorted(entries, key=lambda entry: entry['income_range']['min'])
+            minimums[status] = [entry['income_range']['min'] for entry in entries]
+            maximums[status] = [entry['income_range']['max'] for entry in entries]
+            rates[status] = [entry['tax_rate'] for entry in entries]
+            subtract_amounts[status] = [entry['subtract_amount'] for entry in entries]
+        return cls(minimums, maximums, rates, subtract_amounts)
+
+    @classmethod
+    def from_json(cls, path):
+        """Load and index a rate schedule JSON file"""
+        return cls.from_brackets(read_json_file(path)['tax_brackets'])
+
+    def find_index(self, taxable_income, filing_status):
+        """Return the index of the bracket containing taxable_income, or None"""
+        minimums = self.minimums[filing_status]
+        index = bisect.bisect_right(minimums, taxable_income) - 1
+        if index < 0:
+            return None
+        upper_bound = self.maximums[filing_status][index]
+        if upper_bound is not None and taxable_income >= upper_bound:
+            return None
+        return index
+
+    def compute(self, taxable_income, filing_status):
+        """
+        Apply the bracket formula (taxable_income * tax_rate) - subtract_amount.
+
+        Returns:
+            float: The computed tax amount.
+            None: If no bracket contains taxable_income.
+        """
+        index = self.find_index(taxable_income, filing_status)
+        if index is None:
+            return None
+        return (taxable_income * self.rates[filing_status][index]) - self.subtract_amounts[filing_status][index]
+
+    def arrays(self, filing_status):
+        """
+        Return NumPy arrays (minimums, maximums, rates, subtract_amounts) for one
+        filing status, with the open top bracket's maximum stored as infinity.
+        """
+        if filing_status not in self._arrays:
+            import numpy as np
+            maximums = [float('inf') if maximum is None else maximum for maximum in self.maximums[filing_status]]
+            self._arrays[filing_status] = (
+                np.asarray(self.minimums[filing_status], dtype=np.float64),
+                np.asarray(maximums, dtype=np.float64),
+                np.asarray(self.rates[filing_status], dtype=np.float64),
+                np.asarray(self.subtract_amounts[filing_status], dtype=np.float64),
+            )
+        return self._arrays[filing_status]
+
+    def compute_batch(self, taxable_incomes, filing_status):
+        """
+        Vectorized bracket formula for an array of incomes sharing one filing status.
+
+        Returns:
+            numpy.ndarray: Tax amounts, NaN where no bracket contains the income.
+        """
+        import numpy as np
+        minimums, maximums, rates, subtract_amounts = self.arrays(filing_status)
+        index = np.searchsorted(minimums, taxable_incomes, side='right') - 1
+        clipped = np.clip(index, 0, len(minimums) - 1)
+        found = (index >= 0) & (taxable_incomes < maximums[clipped])
+        return np.where(found, (taxable_incomes * rates[clipped]) - subtract_amounts[clipped], np.nan)
+
+
+# Compiled tax data
+#
+# The compiled file packs the tax table, rate schedule and standard deductions into
+# fixed-width little-endian integer arrays so workers can mmap it instead of parsing
+# JSON. Layout: MAGIC, a 4-byte header length, a JSON header describing the sources
+# hash and the array directory, then the arrays themselves at 8-byte aligned offsets.
+# Rates are stored in parts per million and dollar amounts in cents.
+#
+# The header also records each source's path, mtime and size. A load whose sources
+# still match them skips rehashing the JSON; only a changed signature falls back to
+# comparing the sources hash.
+
+COMPILED_MAGIC = b"TAXB"
+COMPILED_VERSION = 1
+COMPILED_SOURCES = ('tax_table', 'rate_schedule', 'standard_deductions')
+RATE_SCALE = 1000000
+CENTS_SCALE = 100
+
+def source_data_hash(paths=None):
+    """
+    Return the sha256 hex digest of the JSON source files used to build the compiled tax data.
+
+    Args:
+        paths (dict): Optional mapping of COMPILED_SOURCES keys to file paths. Defaults to config.json.
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    for key in COMPILED_SOURCES:
+        path = paths[key] if paths else data_path(key)
+        with open(path, 'rb') as file:
+            raw = file.read()
+        record_io(files_opened=1, bytes_read=len(raw))
+        digest.update(key.encode() + b"\0" + raw)
+    return digest.hexdigest()
+
+def _source_signatures(paths):
+    """[path, mtime_ns, size] of each JSON source, keyed by COMPILED_SOURCES key"""
+    signatures = {}
+    for key in COMPILED_SOURCES:
+        path = os.path.abspath(paths[key])
+        stat = os.stat(path)
+        signatures[key] = [path, stat.st_mtime_ns, stat.st_size]
+    return signatures
+
+def _scaled(value, scale, label):
+    """Convert value to an integer count of 1/scale units, refusing values that would lose precision"""
+    scaled = round(value * scale)
+    if scaled / scale != value:
+        raise ValueError(f"{label} value {value} cannot be stored exactly with scale {scale}")
+    return scaled
+
+def _unscaled(value, scale):
+    """Inverse of _scaled, keeping whole amounts as ints like the JSON sources"""
+    return value // scale if value % scale == 0 else value / scale
+
+def compile_tax_data(output_path=None, paths=None):
+    """
+    Compile the tax table, rate schedule and standard deductions into one binary file.
+
+    Args:
+        output_path (str): Destination file. Defaults to data_paths.compiled_tables in config.json.
+        paths (dict): Optional mapping of COMPILED_SOURCES keys to JSON source paths.
+
+    Returns:
+        str: The path of the written file.
+    """
+    paths = paths or {key: data_path(key) for key in COMPILED_SOURCES}
+    output_path = output_path or data_path('compiled_tables')
+
+    tax_table = TaxTable.from_json(paths['tax_table'])
+    rate_schedule = RateSchedule.from_json(paths['rate_schedule'])
+    with open(paths['standard_deductions'], 'r') as file:
+        deductions = json.load(file)
+
+    arrays = {
+        'table.lower_bounds': array('i', tax_table.lower_bounds),
+        'table.upper_bounds': array('i', tax_table.upper_bounds),
+    }
+    for status in FILING_STATUSES:
+        arrays[f'table.{status}'] = array('i', tax_table.columns[status])
+    for status in rate_schedule.statuses:
+        arrays[f'schedule.{status}.minimums'] = array('q', rate_schedule.minimums[status])
+        # -1 marks the open top bracket, stored as None in the JSON
+        arrays[f'schedule.{status}.maximums'] = array('q', [-1 if maximum is None else maximum
+                                                             for maximum in rate_schedule.maximums[status]])
+        arrays[f'schedule.{status}.rates'] = array('q', [_scaled(rate, RATE_SCALE, 'tax_rate')
+                                                          for rate in rate_schedule.rates[status]])
+        arrays[f'schedule.{status}.subtract_amounts'] = array('q', [_scaled(amount, CENTS_SCALE, 'subtract_amount')
+                                                                     for amount in rate_schedule.subtract_amounts[status]])
+    arrays['deductions'] = array('q', [_scaled(amount, CENTS_SCALE, 'standard deduction')
+                                       for amount in deductions.values()])
+
+    directory = {}
+    offset = 0
+    for name, values in arrays.items():
+        directory[name] = {"typecode": values.typecode, "offset": offset, "length": len(values)}
+        offset += (len(values) * values.itemsize + 7) // 8 * 8
+
+    header = json.dumps({
+        "version": COMPILED_VERSION,
+        "source_hash": source_data_hash(paths),
+        "source_signatures": _source_signatures(paths),
+        "schedule_statuses": rate_schedule.statuses,
+        "deduction_statuses": list(deductions.keys()),
+        "arrays": directory,
+    }).encode()
+    header += b" " * (-(len(COMPILED_MAGIC) + 4 + len(header)) % 8)
+
+    with open(output_path, 'wb') as file:
+        file.write(COMPILED_MAGIC)
+        file.write(len(header).to_bytes(4, 'little'))
+        file.write(header)
+        for values in arrays.values():
+            if sys.byteorder != 'little':
+                values = array(values.typecode, values)
+                values.byteswap()
+            data = values.tobytes()
+            file.write(data + b"\0" * (-len(data) % 8))
+    return output_path
+
+def load_compiled_tax_data(path=None, expected_hash=None, paths=None):
+    """
+    Memory-map a compiled tax data file.
+
+    Args:
+        path (str): Compiled file. Defaults to data_paths.compiled_tables in config.json.
+        expected_hash (str): Hash of the JSON sources. Defaults to source_data_hash(paths), which
+                             is only computed when a source's mtime or size differs from the
+                             ones recorded at compile time.
+        paths (dict): Optional mapping of COMPILED_SOURCES keys to JSON source paths.
+
+    Returns:
+        dict: {'tax_table', 'rate_schedule', 'standard_deductions'} backed by the mapped file.
+        None: If the file is missing, unreadable on this platform or stale.
+    """
+    import mmap
+
+    if sys.byteorder != 'little':
+        return None
+    path = path or data_path('compiled_tables')
+    try:
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        if mapped[:len(COMPILED_MAGIC)] != COMPILED_MAGIC:
+            return None
+        header_start = len(COMPILED_MAGIC) + 4
+        header_length = int.from_bytes(mapped[len(COMPILED_MAGIC):header_start], 'little')
+        parse_start = time.perf_counter()
+        header = json.loads(mapped[header_start:header_start + header_length])
+        record_io(files_opened=1, bytes_read=header_start + header_length,
+                  json_parse_seconds=time.perf_counter() - parse_start)
+        if header.get("version") != COMPILED_VERSION:
+            return None
+        if expected_hash is None:
+            paths = paths or {key: data_path(key) for key in COMPILED_SOURCES}
+            if header.get("source_signatures") != _source_signatures(paths):
+                expected_hash = source_data_hash(paths)
+        if expected_hash is not None and header.get("source_hash") != expected_hash:
+            return None
+    except (ValueError, OSError):
+        return None
+
+    buffer = memoryview(mapped)
+    data_start = header_start + header_length
+    def column(name):
+        entry = header["arrays"][name]
+        itemsize = array(entry["typecode"]).itemsize
+        start = data_start + entry["offset"]
+        return buffer[start:start + entry["length"] * itemsize].cast(entry["typecode"])
+
+    tax_table = TaxTable(column('table.lower_bounds'), column('table.upper_bounds'),
+                         {status: column(f'table.{status}') for status in FILING_STATUSES})
+    minimums, maximums, rates, subtract_amounts = {}, {}, {}, {}
+    for status in header["schedule_statuses"]:
+        minimums[status] = column(f'schedule.{status}.minimums')
+        maximums[status] = [None if maximum == -1 else maximum
+                            for maximum in column(f'schedule.{status}.maximums')]
+        rates[status] = [rate / RATE_SCALE for rate in column(f'schedule.{status}.rates')]
+        subtract_amounts[status] = [amount / CENTS_SCALE for amount in column(f'schedule.{status}.subtract_amounts')]
+    rate_schedule = RateSchedule(minimums, maximums, rates, subtract_amounts)
+    standard_deductions = {status: _unscaled(amount, CENTS_SCALE)
+                           for status, amount in zip(header["deduction_statuses"], column('deductions'))}
+
+    # Keep the mapping alive for as long as the tables reference it
+    tax_table.mapped_file = mapped
+    return {'tax_table': tax_table, 'rate_schedule': rate_schedule, 'standard_deductions': standard_deductions}
+
+
+# Process-wide handles so compute_tax does not stat the data files on every call.
+# reload_tax_tables() drops them; data_utils then re-parses only files that changed.
+_TAX_TABLE = None
+_RATE_SCHEDULE = None
+_STANDARD_DEDUCTIONS = None
+
+def _get_compiled():
+    """Return the compiled tax data if a current compiled file is available, else None"""
+    if not load_config()['data_paths'].get('compiled_tables'):
+        return None
+    paths = [data_path('compiled_tables')] + [data_path(key) for key in COMPILED_SOURCES]
+    try:
+        return cached(('compiled_tax_data',) + tuple(paths), paths, lambda: load_compiled_tax_data() or False) or None
+    except FileNotFoundError:
+        return None
+
+def get_tax_table():
+    """
+    Return the process-wide TaxTable, loading it on first use. With "tax_table_source":
+    "formula" in config.json this is a FormulaTaxTable built from data_paths.tax_table_formula.
+    """
+    global _TAX_TABLE
+    if _TAX_TABLE is None:
+        if load_config().get('tax_table_source') == 'formula':
+            # Compute rows from the bracket formula instead of loading the full table
+            path = data_path('tax_table_formula')
+            _TAX_TABLE = cached(('tax_table_formula', path), [path], lambda: FormulaTaxTable.from_json(path))
+            return _TAX_TABLE
+        compiled = _get_compiled()
+        if compiled:
+            _TAX_TABLE = compiled['tax_table']
+        else:
+            path = data_path('tax_table')
+            _TAX_TABLE = cached(('tax_table', path), [path], lambda: TaxTable.from_json(path))
+    return _TAX_TABLE
+
+def get_rate_schedule():
+    """Return the process-wide RateSchedule, loading it on first use"""
+    global _RATE_SCHEDULE
+    if _RATE_SCHEDULE is None:
+        compiled = _get_compiled()
+        if compiled:
+            _RATE_SCHEDULE = compiled['rate_schedule']
+        else:
+            path = data_path('rate_schedule')
+            _RATE_SCHEDULE = cached(('rate_schedule', path), [path], lambda: RateSchedule.from_json(path))
+    return _RATE_SCHEDULE
+
+def get_standard_deductions():
+    """Return the process-wide standard deduction amounts keyed by filing status"""
+    global _STANDARD_DEDUCTIONS
+    if _STANDARD_DEDUCTIONS is None:
+        compiled = _get_compiled()
+        _STANDARD_DEDUCTIONS = compiled['standard_deductions'] if compiled else load_json(data_path('standard_deductions'))
+    return _STANDARD_DEDUCTIONS
+
+def reload_tax_tables():
+    """
+    Drop the process-wide tables so the next lookup checks the data files again.
+    Call this after the files referenced in config.json have changed; only files
+    whose modification time or size changed are parsed again.
+    """
+    global _TAX_TABLE, _RATE_SCHEDULE, _STANDARD_DEDUCTIONS
+    _TAX_TABLE = None
+    _RATE_SCHEDULE = None
+    _STANDARD_DEDUCTIONS = None
+
+    # The tax year registry (if in use) holds the old tables for the default year
+    year_utils = sys.modules.get('year_utils')
+    if year_utils is not None:
+        year_utils.reset_registry()
+
+if __name__ == "__main__":
+    # Build step: compile the JSON sources listed in config.json into the binary format
+    output_path = compile_tax_data(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Compiled tax data written to {output_path}")
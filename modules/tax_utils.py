@@ -1,30 +1,27 @@
-import json
-import os
+from table_utils import FILING_STATUSES, get_tax_table, get_rate_schedule, get_standard_deductions
+from instrument_utils import instrumented
+from year_utils import get_tax_year_data
 
-def load_config():
-    """Load configuration from config.json"""
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
-    with open(config_path, 'r') as f:
-        return json.load(f)
-
-CONFIG = load_config()
-
-def adjust_for_standard_deduction(income, filing_status):
+@instrumented()
+def adjust_for_standard_deduction(income, filing_status, tax_year=None, jurisdiction=None):
     """
     Adjust income by subtracting the standard deduction for the given filing status.
     
     Parameters:
         income (float): The income amount to adjust
         filing_status (str): The filing status to determine standard deduction
+        tax_year (int): Tax year of the return. Defaults to default_tax_year in config.json.
+        jurisdiction (str): Jurisdiction of the return. Defaults to default_jurisdiction in config.json.
         
     Returns:
         float: Income minus standard deduction (minimum 0)
     """
-    # Load standard deductions from JSON file
-    deductions_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), CONFIG['data_paths']['standard_deductions'])
-    with open(deductions_path, 'r') as file:
-        deductions = json.load(file)
-        
+    # Load standard deductions (compiled data file when current, JSON otherwise)
+    if tax_year is None and jurisdiction is None:
+        deductions = get_standard_deductions()
+    else:
+        deductions = get_tax_year_data(tax_year, jurisdiction).standard_deductions
+
     # Validate filing status
     if filing_status not in deductions:
         raise ValueError(f"Invalid filing status. Must be one of: {list(deductions.keys())}")
@@ -32,14 +29,9 @@ def adjust_for_standard_deduction(income, filing_status):
     # Subtract standard deduction and ensure result is not negative
     return max(0, income - deductions[filing_status])
 
-# Example usage
-print(adjust_for_standard_deduction(170000, "married_filing_jointly"))
-
-
-
-import json
 
-def compute_tax(taxable_income, filing_status):
+@instrumented()
+def compute_tax(taxable_income, filing_status, tax_year=None, jurisdiction=None):
     """
     Compute the tax for a given taxable income and filing status, using tax tables for income < $100,000
     and tax rate schedules for income >= $100,000.
@@ -48,51 +40,45 @@ def compute_tax(taxable_income, filing_status):
         taxable_income (float): The taxable income.
         filing_status (str): The filing status. One of "single", "married_filing_jointly",
                              "married_filing_separately", "head_of_household".
+        tax_year (int): Tax year of the return. Defaults to default_tax_year in config.json.
+        jurisdiction (str): Jurisdiction of the return. Defaults to default_jurisdiction in config.json.
 
     Returns:
         float: The computed tax amount.
         None: If the filing status is invalid or no matching tax bracket is found.
+
+    Raises:
+        ValueError: If no tax data is configured for tax_year and jurisdiction.
     """
+    year_data = None if tax_year is None and jurisdiction is None else get_tax_year_data(tax_year, jurisdiction)
     try:
         if taxable_income < 100000:
             # Use tax table for incomes below $100,000
-            tax_table_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), CONFIG['data_paths']['tax_table'])
-            with open(tax_table_path, 'r') as file:
-                tax_table = json.load(file)
+            tax_table = get_tax_table() if year_data is None else year_data.tax_table
 
             # Validate filing status
             filing_status = filing_status.lower()
-            valid_statuses = ["single", "married_filing_jointly", "married_filing_separately", "head_of_household"]
+            valid_statuses = list(FILING_STATUSES)
             if filing_status not in valid_statuses:
                 raise ValueError(f"Invalid filing status. Must be one of: {valid_statuses}")
 
-            # Search for the matching tax range
-            for entry in tax_table:
-                lower_bound = float(entry["taxable_income_range"]["LowerBound"])
-                upper_bound = float(entry["taxable_income_range"]["UpperBound"])
-
-                if lower_bound <= taxable_income < upper_bound:
-                    return float(entry[filing_status])
+            # Find the matching tax range in the precompiled table
+            tax = tax_table.lookup(taxable_income, filing_status)
+            if tax is not None:
+                return tax
 
         else:
             # Use tax rate schedule for incomes $100,000 or more
-            rate_schedule_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), CONFIG['data_paths']['rate_schedule'])
-            with open(rate_schedule_path, 'r') as json_file:
-                tax_data = json.load(json_file)
+            rate_schedule = get_rate_schedule() if year_data is None else year_data.rate_schedule
 
             # Validate filing status
-            if filing_status not in tax_data['tax_brackets']:
-                raise ValueError(f"Invalid filing status. Available options are: {list(tax_data['tax_brackets'].keys())}")
+            if filing_status not in rate_schedule.statuses:
+                raise ValueError(f"Invalid filing status. Available options are: {rate_schedule.statuses}")
 
-            # Iterate through the data to find the applicable tax bracket
-            for entry in tax_data['tax_brackets'][filing_status]:
-                lower_bound = entry['income_range']['min']
-                upper_bound = entry['income_range']['max'] if entry['income_range']['max'] is not None else float('inf')
-
-                if lower_bound <= taxable_income < upper_bound:
-                    tax_rate = entry['tax_rate']
-                    subtract_amount = entry['subtract_amount']
-                    return (taxable_income * tax_rate) - subtract_amount
+            # Find the applicable tax bracket and apply its rate
+            tax = rate_schedule.compute(taxable_income, filing_status)
+            if tax is not None:
+                return tax
 
         # If no matching bracket is found, return None
         return None
@@ -104,8 +90,84 @@ def compute_tax(taxable_income, filing_status):
     except Exception as e:
         raise RuntimeError(f"An error occurred while computing tax: {e}")
 
+def _filing_status_codes(filing_statuses, shape):
+    """
+    Convert one filing status, or an array of them, into an integer array of
+    indexes into FILING_STATUSES with the given shape.
+    """
+    import numpy as np
+
+    if isinstance(filing_statuses, str):
+        filing_statuses = [filing_statuses]
+
+    # Validate and lowercase each distinct status once rather than once per income
+    codes = {}
+    def code_for(status):
+        status_lower = status.lower()
+        if status_lower not in FILING_STATUSES:
+            raise ValueError(f"Invalid filing status {status!r}. Must be one of: {list(FILING_STATUSES)}")
+        codes[status] = FILING_STATUSES.index(status_lower)
+        return codes[status]
+
+    statuses = np.asarray(filing_statuses, dtype=object).ravel().tolist()
+    status_codes = np.fromiter((codes[status] if status in codes else code_for(status) for status in statuses),
+                               dtype=np.intp, count=len(statuses))
+    return np.broadcast_to(status_codes.reshape(np.shape(filing_statuses)), shape)
+
+@instrumented()
+def compute_tax_batch(incomes, filing_statuses, tax_year=None, jurisdiction=None):
+    """
+    Vectorized version of compute_tax for arrays of taxable incomes.
+
+    Incomes below $100,000 are looked up in the tax table with searchsorted; the rest
+    go through the tax rate schedule brackets. Both data files are read once per
+    process through table_utils. Filing statuses are matched case-insensitively.
+    Requires NumPy.
+
+    Parameters:
+        incomes (array-like): Taxable incomes.
+        filing_statuses (str or array-like): One filing status for every income, or an
+                                             array of statuses with the same shape as incomes.
+        tax_year (int): Tax year for every income. Defaults to default_tax_year in config.json.
+        jurisdiction (str): Jurisdiction for every income. Defaults to default_jurisdiction in config.json.
+
+    Returns:
+        numpy.ndarray: Tax amounts as floats. NaN where compute_tax would return None.
+
+    Raises:
+        ValueError: If any filing status is not one of FILING_STATUSES.
+    """
+    import numpy as np
+
+    if tax_year is None and jurisdiction is None:
+        tax_table, rate_schedule = get_tax_table(), get_rate_schedule()
+    else:
+        year_data = get_tax_year_data(tax_year, jurisdiction)
+        tax_table, rate_schedule = year_data.tax_table, year_data.rate_schedule
+
+    incomes = np.asarray(incomes, dtype=np.float64)
+    status_codes = _filing_status_codes(filing_statuses, incomes.shape)
+
+    taxes = np.full(incomes.shape, np.nan)
+
+    # Tax table for incomes below $100,000
+    below = incomes < 100000
+    if below.any():
+        taxes[below] = tax_table.lookup_batch(incomes[below], status_codes[below])
+
+    # Tax rate schedule for incomes $100,000 or more, one pass per filing status
+    for code, status in enumerate(FILING_STATUSES):
+        mask = ~below & (status_codes == code)
+        if mask.any():
+            taxes[mask] = rate_schedule.compute_batch(incomes[mask], status)
+
+    return taxes
+
 # Example usage:
-# tax = compute_tax(95000, "single")
-# print(tax)
-tax = compute_tax(140800, "married_filing_jointly")
-print(tax)
+if __name__ == "__main__":
+    print(adjust_for_standard_deduction(170000, "married_filing_jointly"))
+    # tax = compute_tax(95000, "single")
+    # print(tax)
+    tax = compute_tax(140800, "married_filing_jointly")
+    print(tax)
+
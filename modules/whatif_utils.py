@@ -0,0 +1,85 @@
+from graph_utils import ReturnGraph
+from return_utils import RETURN_LINES
+from dependent_utils import Dependent
+from record_utils import parse_dependents
+from year_utils import default_tax_year
+
+class WhatIfSession:
+    """
+    Interactive what-if session for one household.
+
+    The session keeps a ReturnGraph for the household. Each edit changes one input
+    and recomputes only the cached lines downstream of it, stopping wherever a
+    recomputed line comes out unchanged.
+
+    Example:
+        session = WhatIfSession(load_taxpayer_information())
+        session.set_childcare_cost(0, 7200)
+        session.set("total_income", 150000)
+        session.results()          # every line in RETURN_LINES
+        session.last_recomputed    # form lines recomputed by the last edit
+    """
+
+    def __init__(self, data, lines=None):
+        """
+        Args:
+            data (dict or Household): Taxpayer record shaped like data/taxpayer_information.json
+            lines (dict): Result name -> form line to report. Defaults to RETURN_LINES.
+        """
+        self.graph = ReturnGraph.from_household(data)
+        self.lines = RETURN_LINES if lines is None else lines
+        self.last_recomputed = 0
+        self.last_changed = set()
+        self._results = self.results()
+
+    def results(self):
+        """Return {result name: value} for the reported lines"""
+        return {name: self.graph[line_name] for name, line_name in self.lines.items()}
+
+    def set(self, name, value):
+        """
+        Change one input, such as "total_income" (AGI) or "filing_status", and recompute
+        the affected lines.
+
+        Returns:
+            dict: The result lines whose value changed, with their new values.
+        """
+        before = self.graph.computed
+        try:
+            _, self.last_changed = self.graph.update(name, value)
+            results = self.results()
+        finally:
+            self.last_recomputed = self.graph.computed - before
+
+        changed = {result: new_value for result, new_value in results.items() if self._results.get(result) != new_value}
+        self._results = results
+        return changed
+
+    def set_childcare_cost(self, dependent_index, annual_cost):
+        """
+        Change one dependent's childcare annual_cost. The household record passed to
+        the session is not modified.
+
+        Returns:
+            dict: The result lines whose value changed, with their new values.
+        """
+        dependents = list(self.graph.inputs["dependents"])
+        dependent = dependents[dependent_index]
+        if isinstance(dependent, Dependent):
+            # A session built from a Household holds parsed records; rebuild this one with
+            # the new cost (the birth date only needs to give the same age)
+            tax_year = self.graph.inputs["tax_year"] or default_tax_year()
+            childcare = {"provider_name": dependent.provider_name, "ein": dependent.provider_ein,
+                         "address": dependent.provider_address, "annual_cost": annual_cost}
+            record = {"name": dependent.name, "date_of_birth": f"{tax_year - dependent.age}-01-01",
+                      "childcare": {key: value for key, value in childcare.items() if value is not None}}
+            dependent, = parse_dependents([record], tax_year)
+        else:
+            dependent = dict(dependent)
+            dependent["childcare"] = dict(dependent.get("childcare") or {}, annual_cost=annual_cost)
+        dependents[dependent_index] = dependent
+        return self.set("dependents", dependents)
+
+    def depends_on(self, result_name):
+        """Return the set of inputs a reported line depends on"""
+        return self.graph.input_dependencies(self.lines[result_name])
@@ -1,28 +1,48 @@
-import os
-import json
+from data_utils import data_path, load_taxpayer_information
 from tax_utils import compute_tax
 from forms_utils import calculate_form_2441
+from instrument_utils import instrumented
+from dependent_utils import normalize_dependents
+from year_utils import get_tax_year_data
 
-def load_config():
-    """Load configuration from config.json"""
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
-    with open(config_path, 'r') as f:
-        return json.load(f)
+def credit_limit_worksheet_a_line_5(line_1_amount: float, line_2_amount: float) -> float:
+    """
+    Credit Limit Worksheet A lines 3 to 5, given the Form 1040 line 18 tax (line 1)
+    and the Form 2441 credit (line 2).
+    """
+    # Calculate line 3
+    line_3_amount = line_1_amount - line_2_amount
+    # print(f"Line 3 (line 1 - line 2): {line_3_amount}")
+
+    # Calculate Line 4
+    line_4_amount = 0 
+    # print(f"Line 4: {line_4_amount}")
+
+    # Calculate Line 5
+    line_5_amount = line_3_amount - line_4_amount
+    # print(f"Line 5 (line 3 - line 4): {line_5_amount}")
 
-CONFIG = load_config()
+    return line_5_amount
 
-def calculate_credit_limit_worksheet_a() -> float:
+@instrumented()
+def calculate_credit_limit_worksheet_a(taxable_income: float = 105800,
+                                       filing_status: str = "married_filing_jointly",
+                                       form_2441_credit: float = None) -> float:
     """
     Calculate credit limit using Credit Limit Worksheet A.
-    Uses existing tax calculation with hardcoded values.
+    Uses existing tax calculation; the defaults are the sample taxpayer's values.
+
+    Args:
+        taxable_income (float): Taxable income used for the Form 1040 line 18 tax
+        filing_status (str): Filing status used for the Form 1040 line 18 tax
+        form_2441_credit (float): Form 2441 credit for line 2. If None, it is calculated
+                                  from the taxpayer information file in config.json.
     
     Returns:
         float: Credit limit amount
     """
     try:
         # Step 1: Get tax amount from Form 1040, line 18
-        taxable_income = 105800
-        filing_status = "married_filing_jointly"
         
         # Get tax computation (note: removed rate_schedule_path as it's handled inside compute_tax)
         try:
@@ -32,26 +52,17 @@ def calculate_credit_limit_worksheet_a() -> float:
             line_1_amount = 0
         
         # Step 2: Use calculate_form_2441 to get the credit amount
-        try:
-            taxpayer_info_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), CONFIG['data_paths']['taxpayer_information'])
-            line_2_amount = calculate_form_2441(taxpayer_info_path, print_output=False)
-        except Exception as form_error:
-            print(f"An error occurred while calculating Form 2441: {form_error}")
-            line_2_amount = 0
-        
-        # Calculate line 3
-        line_3_amount = line_1_amount - line_2_amount
-        # print(f"Line 3 (line 1 - line 2): {line_3_amount}")
-
-        # Calculate Line 4
-        line_4_amount = 0 
-        # print(f"Line 4: {line_4_amount}")
-
-        # Calculate Line 5
-        line_5_amount = line_3_amount - line_4_amount
-        # print(f"Line 5 (line 3 - line 4): {line_5_amount}")
-
-        return line_5_amount
+        if form_2441_credit is not None:
+            line_2_amount = form_2441_credit
+        else:
+            try:
+                taxpayer_info_path = data_path('taxpayer_information')
+                line_2_amount = calculate_form_2441(taxpayer_info_path, print_output=False)
+            except Exception as form_error:
+                print(f"An error occurred while calculating Form 2441: {form_error}")
+                line_2_amount = 0
+
+        return credit_limit_worksheet_a_line_5(line_1_amount, line_2_amount)
 
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -61,13 +72,24 @@ if __name__ == "__main__":
      print(f"Final result: {result}")
 
 
-def Credits_Qualifying_Children_and_Other_Dependents():
+def count_qualifying_children(dependents, tax_year=None) -> int:
     """
-    Calculate the credits for qualifying children and other dependents.
+    Lines 4 and 5: count qualifying children (under age 17 in the tax year)
+
+    Args:
+        dependents: Dependent dicts, or Dependent records from normalize_dependents
+        tax_year (int): Tax year ages are measured against, for dependent dicts
     """
-    # Identify the adjusted gross income
-    adjusted_gross_income = 135000
+    return sum(1 for dependent in normalize_dependents(dependents, tax_year) if dependent.under_17)
 
+def child_tax_credit_line_12(adjusted_gross_income, Number_of_Qualifying_Children, tax_year=None, jurisdiction=None):
+    """
+    Lines 2 to 12 of the child tax credit worksheet: the credit for qualifying children
+    and other dependents after the income threshold, before the Line 13 credit limit.
+    Credit amounts and the threshold come from the Credit_Thresholds.json for the tax
+    year and jurisdiction.
+    """
+    child_tax_credit = get_tax_year_data(tax_year, jurisdiction).credit_thresholds.child_tax_credit
 
     # Line 2: Enter the amount from Form 2555, line 45, or Form 2555-EZ, line 50
     puerto_rico_exclusions = 0
@@ -77,32 +99,17 @@ def Credits_Qualifying_Children_and_Other_Dependents():
     # Add Lines 1 and 2d (Additional_Exclusions)
     Line_3 = adjusted_gross_income + Additional_Exclusions
 
-    # Regarding Lines 4 and 5
-    # Load taxpayer information
-    taxpayer_info_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), CONFIG['data_paths']['taxpayer_information'])
-    with open(taxpayer_info_path, 'r') as f:
-        taxpayer_data = json.load(f)
-    
-    # Count qualifying children (under age 17)
-    from datetime import datetime
-    current_year = datetime.now().year
-    Number_of_Qualifying_Children = sum(
-        1 for dependent in taxpayer_data.get('dependents', [])
-        if (current_year - datetime.strptime(dependent['date_of_birth'], '%Y-%m-%d').year) < 17
-    )
-    
-    Credit_per_Qualifying_Child = 2000
+    Credit_per_Qualifying_Child = child_tax_credit["credit_per_qualifying_child"]
     # Line 6: Number of other dependents under age 17 or who do not the required social security number
     # Line 7: Credit per other dependent
     Number_of_Other_Dependents = 0
-    Credit_per_Other_Dependent = 500
+    Credit_per_Other_Dependent = child_tax_credit["credit_per_other_dependent"]
 
     # Line 8: Total credit for qualifying children and other dependents
     Total_Credit_for_Qualifying_Children_and_Other_Dependents = (Number_of_Qualifying_Children * Credit_per_Qualifying_Child) + (Number_of_Other_Dependents * Credit_per_Other_Dependent)
 
     # Line 9: Identify the threshold amount for the filing status
-    filing_status = "married_filing_jointly"
-    Threshold_Amount = 200000
+    Threshold_Amount = child_tax_credit["threshold"]
 
     # Line 10: Subtract the threshold amount from line 3
     difference = Line_3 - Threshold_Amount
@@ -111,8 +118,37 @@ def Credits_Qualifying_Children_and_Other_Dependents():
     else:
         # If income is below threshold, no reduction needed
         Line_12 = Total_Credit_for_Qualifying_Children_and_Other_Dependents - max(0, (difference // 1000) * 50)
+    return Line_12
+
+@instrumented()
+def Credits_Qualifying_Children_and_Other_Dependents(taxpayer_data=None, adjusted_gross_income=135000,
+                                                     filing_status="married_filing_jointly", credit_limit=None):
+    """
+    Calculate the credits for qualifying children and other dependents.
+
+    Args:
+        taxpayer_data (dict): Taxpayer information. If None, loaded from the file in config.json.
+        adjusted_gross_income (float): Line 1 adjusted gross income
+        filing_status (str): Filing status for the line 9 threshold
+        credit_limit (float): Line 13 amount from Credit Limit Worksheet A. If None, it is
+                              calculated with calculate_credit_limit_worksheet_a().
+    """
+    # Line 1: adjusted_gross_income
+
+    # Regarding Lines 4 and 5
+    # Load taxpayer information
+    if taxpayer_data is None:
+        taxpayer_data = load_taxpayer_information()
+    
+    # Count qualifying children (under age 17)
+    tax_year = taxpayer_data.get('tax_year')
+    Number_of_Qualifying_Children = count_qualifying_children(taxpayer_data.get('dependents', []), tax_year)
+
+    # Lines 2 to 12
+    Line_12 = child_tax_credit_line_12(adjusted_gross_income, Number_of_Qualifying_Children, tax_year,
+                                       taxpayer_data.get('jurisdiction'))
 
-    Line_13 = calculate_credit_limit_worksheet_a()
+    Line_13 = credit_limit if credit_limit is not None else calculate_credit_limit_worksheet_a()
 
     child_tax_credit_and_credit_for_other_dependents = min(Line_13, Line_12)
     return child_tax_credit_and_credit_for_other_dependents
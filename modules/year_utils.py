@@ -0,0 +1,203 @@
+import os
+import sys
+from collections import OrderedDict
+
+from data_utils import PROJECT_ROOT, load_config, load_json, read_json_file, data_path
+from table_utils import TaxTable, RateSchedule, get_tax_table, get_rate_schedule, get_standard_deductions
+
+DEFAULT_JURISDICTION = "federal"
+DEFAULT_MEMORY_BUDGET_MB = 64
+
+def approximate_size(value, seen=None):
+    """Approximate the memory held by value and everything it references, in bytes"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, memoryview):
+        return value.nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key, seen) + approximate_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(approximate_size(item, seen) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += approximate_size(vars(value), seen)
+    return size
+
+
+class CreditThresholds:
+    """
+    Year-specific credit parameters from a Credit_Thresholds.json file.
+
+    Attributes:
+        form_2441_percentages (list): (min AGI, max AGI, rate) rows of the Form 2441 line 8 ladder
+        form_8863_income_limits (dict): Form 8863 line 2 amount by filing status ("default" for the rest)
+        form_8863_phaseout_ranges (dict): Form 8863 line 5 amount by filing status ("default" for the rest)
+        child_tax_credit (dict): credit_per_qualifying_child, credit_per_other_dependent, threshold
+    """
+
+    def __init__(self, raw):
+        self.form_2441_percentages = [
+            (row["min"], float("inf") if row["max"] is None else row["max"], row["rate"])
+            for row in raw["form_2441"]["applicable_percentages"]
+        ]
+        self.form_8863_income_limits = raw["form_8863"]["income_limits"]
+        self.form_8863_phaseout_ranges = raw["form_8863"]["phaseout_ranges"]
+        self.child_tax_credit = raw["child_tax_credit"]
+
+    def form_8863_income_limit(self, filing_status):
+        return self.form_8863_income_limits.get(filing_status, self.form_8863_income_limits["default"])
+
+    def form_8863_phaseout_range(self, filing_status):
+        return self.form_8863_phaseout_ranges.get(filing_status, self.form_8863_phaseout_ranges["default"])
+
+
+class TaxYearData:
+    """Tax table, rate schedule, standard deductions and credit thresholds for one (year, jurisdiction)"""
+
+    def __init__(self, tax_year, jurisdiction, tax_table, rate_schedule, standard_deductions, credit_thresholds):
+        self.tax_year = tax_year
+        self.jurisdiction = jurisdiction
+        self.tax_table = tax_table
+        self.rate_schedule = rate_schedule
+        self.standard_deductions = standard_deductions
+        self.credit_thresholds = credit_thresholds
+
+    @classmethod
+    def from_paths(cls, tax_year, jurisdiction, paths):
+        """
+        Load every file for one year. The files are parsed directly rather than through the
+        data_utils cache, so evicting the entry frees them.
+
+        Args:
+            paths (dict): tax_table, rate_schedule, standard_deductions and credit_thresholds
+                          paths, relative to the project root.
+        """
+        def resolve(key):
+            return os.path.join(PROJECT_ROOT, paths[key])
+        return cls(tax_year, jurisdiction,
+                   TaxTable.from_json(resolve("tax_table")),
+                   RateSchedule.from_json(resolve("rate_schedule")),
+                   read_json_file(resolve("standard_deductions")),
+                   CreditThresholds(read_json_file(resolve("credit_thresholds"))))
+
+    @classmethod
+    def from_process_tables(cls, tax_year, jurisdiction):
+        """Wrap the process-wide tables from table_utils (the data_paths files in config.json)"""
+        return cls(tax_year, jurisdiction, get_tax_table(), get_rate_schedule(), get_standard_deductions(),
+                   CreditThresholds(load_json(data_path("credit_thresholds"))))
+
+
+class TaxDataRegistry:
+    """
+    Registry of TaxYearData keyed by (tax year, jurisdiction).
+
+    Entries load on first use. When the loaded entries exceed the memory budget, the
+    least recently used ones are evicted (the entry just requested is always kept).
+    The default year is served from the process-wide tables in table_utils; it is
+    pinned and does not count towards the budget.
+    """
+
+    def __init__(self, sources, default_year, default_jurisdiction=DEFAULT_JURISDICTION,
+                 budget_bytes=DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024):
+        """
+        Args:
+            sources (dict): (tax year, jurisdiction) -> file paths for TaxYearData.from_paths
+            default_year (int): Year used when a caller does not ask for one
+            default_jurisdiction (str): Jurisdiction used when a caller does not ask for one
+            budget_bytes (int): Approximate memory allowed for non-default entries
+        """
+        self.sources = sources
+        self.default_key = (default_year, default_jurisdiction)
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @classmethod
+    def from_config(cls, config=None):
+        """Build a registry from the tax_years section of config.json"""
+        config = config or load_config()
+        sources = {(int(year), jurisdiction): paths
+                   for year, jurisdictions in config.get("tax_years", {}).items()
+                   for jurisdiction, paths in jurisdictions.items()}
+        budget_mb = config.get("tax_data_memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB)
+        return cls(sources, config["default_tax_year"], config.get("default_jurisdiction", DEFAULT_JURISDICTION),
+                   int(budget_mb * 1024 * 1024))
+
+    @property
+    def default_year(self):
+        return self.default_key[0]
+
+    def get(self, tax_year=None, jurisdiction=None):
+        """
+        Return the TaxYearData for (tax_year, jurisdiction), loading it if needed.
+
+        Raises:
+            ValueError: If no data files are configured for that year and jurisdiction.
+        """
+        key = (self.default_key[0] if tax_year is None else int(tax_year),
+               self.default_key[1] if jurisdiction is None else jurisdiction)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry
+
+        self.stats["misses"] += 1
+        if key == self.default_key:
+            entry = TaxYearData.from_process_tables(*key)
+            size = 0
+        elif key in self.sources:
+            entry = TaxYearData.from_paths(*key, self.sources[key])
+            size = approximate_size(entry)
+        else:
+            available = sorted(set(self.sources) | {self.default_key})
+            raise ValueError(f"No tax data configured for {key[0]} {key[1]}. Available: {available}")
+
+        self.entries[key] = entry
+        self.sizes[key] = size
+        self.total_bytes += size
+        self._evict(keep=key)
+        return entry
+
+    def _evict(self, keep):
+        """Evict least recently used entries until the loaded ones fit the budget"""
+        for key in list(self.entries):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if key == keep or key == self.default_key:
+                continue
+            del self.entries[key]
+            self.total_bytes -= self.sizes.pop(key)
+            self.stats["evictions"] += 1
+
+    def loaded(self):
+        """Return the loaded (year, jurisdiction) keys, least recently used first"""
+        return list(self.entries)
+
+
+_REGISTRY = None
+
+def get_registry():
+    """Return the process-wide TaxDataRegistry, building it from config.json on first use"""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = TaxDataRegistry.from_config()
+    return _REGISTRY
+
+def get_tax_year_data(tax_year=None, jurisdiction=None):
+    """Return the TaxYearData for a year and jurisdiction (defaults from config.json)"""
+    return get_registry().get(tax_year, jurisdiction)
+
+def default_tax_year():
+    """Return the default_tax_year from config.json"""
+    return get_registry().default_year
+
+def reset_registry():
+    """Drop every loaded year; called by table_utils.reload_tax_tables()"""
+    global _REGISTRY
+    _REGISTRY = None
@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Make the modules folder importable when running from the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modules'))
+
+from server_utils import serve
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve tax computations over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, default=8080)
+    parser.add_argument("--workers", "-w", type=int, default=None,
+                        help="Worker processes (default: all CPUs; 0 computes in a thread of the server)")
+    parser.add_argument("--batch-window-ms", type=float, default=2,
+                        help="How long to collect concurrent requests into one batch (default: 2)")
+    parser.add_argument("--max-batch", type=int, default=256, help="Largest batch per worker task (default: 256)")
+    args = parser.parse_args(argv)
+
+    print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.batch_window_ms, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Make the modules folder importable when running from the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modules'))
+
+from batch_utils import iter_record_sources
+from montecarlo_utils import DEFAULT_CHUNK_SAMPLES, DEFAULT_QUANTILES, parse_distributions, simulate_batch
+from record_utils import load_household
+
+def load_records(source):
+    """(record_id, Household or the load error) for every record in a batch source"""
+    for record_id, kind, payload in iter_record_sources(source):
+        try:
+            if kind == "file":
+                with open(payload, 'rb') as file:
+                    payload = file.read()
+            yield record_id, load_household(payload)
+        except Exception as e:
+            yield record_id, e
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo quantiles of tax and credits over uncertain inputs")
+    parser.add_argument("source", help="Directory of taxpayer JSON files, a JSONL file, - for stdin, or a single JSON file")
+    parser.add_argument("--distributions", "-d", required=True,
+                        help='JSON file of input distributions, e.g. {"total_income": {"relative": '
+                             '{"normal": {"mean": 1.0, "sd": 0.1}}}, "annual_cost": {"uniform": {"low": 2000, "high": 8000}}}')
+    parser.add_argument("--samples", "-n", type=int, default=10000, help="Draws per household (default: 10000)")
+    parser.add_argument("--quantiles", default=",".join(f"{q:g}" for q in DEFAULT_QUANTILES),
+                        help="Comma-separated quantiles between 0 and 1 (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--output", "-o", help="Results file (default: stdout)")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--chunk-samples", type=int, default=DEFAULT_CHUNK_SAMPLES,
+                        help=f"Draws per worker task (default: {DEFAULT_CHUNK_SAMPLES})")
+    parser.add_argument("--fixed-wages", action="store_true",
+                        help="Keep wages at the record's values instead of scaling them with total_income")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.distributions, 'r') as file:
+            distributions = parse_distributions(json.load(file))
+        quantiles = [float(quantile) for quantile in args.quantiles.split(",")]
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not all(0 <= quantile <= 1 for quantile in quantiles):
+        parser.error("--quantiles must be between 0 and 1")
+    if args.samples < 1:
+        parser.error("--samples must be at least 1")
+    if args.chunk_samples < 1:
+        parser.error("--chunk-samples must be at least 1")
+
+    processed = errors = 0
+    start = time.perf_counter()
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in simulate_batch(load_records(args.source), distributions, args.samples, args.seed, quantiles,
+                                     args.workers, args.chunk_samples, not args.fixed_wages):
+            processed += 1
+            if "error" in result:
+                errors += 1
+            output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    rate = processed * args.samples / elapsed if elapsed else 0
+    print(f"Simulated {processed:,} households ({errors:,} errors) x {args.samples:,} samples in {elapsed:.2f}s, "
+          f"{rate:,.0f} samples/s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Make the modules and tools folders importable, as the entry points do
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'modules'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'tools'))
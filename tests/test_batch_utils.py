@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from batch_utils import iter_record_sources, run_batch
+from data_utils import load_taxpayer_information
+from return_utils import compute_return
+
+def _households():
+    data = load_taxpayer_information()
+    return [dict(data, income=dict(data["income"], total_income=income)) for income in (30000, 95000, 180000)]
+
+@pytest.fixture
+def record_dir(tmp_path):
+    for i, household in enumerate(_households()):
+        (tmp_path / f"h{i}.json").write_text(json.dumps(household))
+    (tmp_path / "broken.json").write_text("{not json")
+    (tmp_path / "notes.txt").write_text("ignored")
+    return tmp_path
+
+def test_directory_sources_are_sorted_json_files(record_dir):
+    assert [record_id for record_id, _, _ in iter_record_sources(str(record_dir))] == \
+        ["broken.json", "h0.json", "h1.json", "h2.json"]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_directory_batch_matches_compute_return(record_dir, workers):
+    results = list(run_batch(str(record_dir), workers=workers, chunksize=1))
+    assert [result["record_id"] for result in results] == ["broken.json", "h0.json", "h1.json", "h2.json"]
+    assert "error" in results[0]
+    for result, household in zip(results[1:], _households()):
+        assert result == {"record_id": result["record_id"], **compute_return(household)}
+
+def test_jsonl_batch_keeps_line_numbers(tmp_path):
+    source = tmp_path / "records.jsonl"
+    lines = [json.dumps(household) for household in _households()]
+    source.write_text(lines[0] + "\n\n" + lines[1] + "\n[]\n" + lines[2] + "\n")
+    results = list(run_batch(str(source), workers=1))
+    assert [result["record_id"] for result in results] == \
+        ["records.jsonl:1", "records.jsonl:3", "records.jsonl:4", "records.jsonl:5"]
+    assert "error" in results[2]
+    assert results[3] == {"record_id": "records.jsonl:5", **compute_return(_households()[2])}
@@ -0,0 +1,64 @@
+from cache_utils import ResultCache, data_version
+from data_utils import load_taxpayer_information
+from return_utils import compute_return
+
+def _with_income(data, total_income):
+    return dict(data, income=dict(data["income"], total_income=total_income))
+
+def test_hits_and_misses(tmp_path):
+    data = load_taxpayer_information()
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    assert cache.compute_return(data) == compute_return(data)
+    assert cache.compute_return(data) == compute_return(data)
+    # Names and TINs are not inputs to any form, so a renamed household hits
+    renamed = dict(data, taxpayer=dict(data["taxpayer"], name="Someone Else", tin="000-00-0000"))
+    assert cache.compute_return(renamed) == compute_return(data)
+    # Education expenses change the return but not the Form 2441 or worksheet lines
+    education = dict(data, education={"qualified_expenses": 1234})
+    assert cache.compute_return(education) == compute_return(education)
+    assert cache.compute_return(data, cents=True) == compute_return(data, cents=True)
+    assert cache.stats == {"hits": 2, "misses": 3, "line_hits": 2, "line_misses": 2, "evictions": 0}
+    cache.close()
+
+def test_counters_persist_across_instances(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    data = load_taxpayer_information()
+    for _ in range(2):
+        cache = ResultCache(path)
+        cache.compute_return(data)
+        cache.close()
+    cache = ResultCache(path)
+    assert cache.stored_counters()["hits"] == 1
+    assert cache.stored_counters()["misses"] == 1
+    assert cache.summary()["entries"] == 3
+    cache.close()
+
+def test_data_version_change_drops_entries(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    data = load_taxpayer_information()
+    cache = ResultCache(path)
+    cache.compute_return(data)
+    cache.close()
+
+    cache = ResultCache(path, version="other tables")
+    assert cache.summary()["entries"] == 0
+    cache.compute_return(data)
+    assert cache.stats["misses"] == 1
+    cache.close()
+
+    cache = ResultCache(path, version=data_version())
+    assert cache.summary()["entries"] == 0
+    cache.close()
+
+def test_eviction_keeps_the_cache_under_budget(tmp_path):
+    data = load_taxpayer_information()
+    cache = ResultCache(str(tmp_path / "results.sqlite"), max_bytes=2000)
+    for income in range(50000, 60000, 500):
+        cache.compute_return(_with_income(data, income))
+        cache.flush()
+    assert cache.stats["evictions"] > 0
+    assert cache.summary()["bytes"] <= 2000
+    # The most recent household is still cached
+    cache.compute_return(_with_income(data, 59500))
+    assert cache.stats["hits"] == 1
+    cache.close()
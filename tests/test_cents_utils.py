@@ -0,0 +1,18 @@
+from cents_utils import from_cents, get_cents_engine, to_cents
+from forms_utils import calculate_form_8863_part_i, calculate_form_8863_part_ii
+from return_utils import compute_return_batch
+
+def test_separate_return_gets_no_education_credit():
+    engine = get_cents_engine()
+    line_30, refundable, nonrefundable = engine.form_8863_cents("married_filing_separately", to_cents(40000),
+                                                                to_cents(4000))
+    assert (line_30, refundable, nonrefundable) == (to_cents(2500), 0, 0)
+    assert calculate_form_8863_part_i(False, "married_filing_separately", 40000, 4000) == 0
+    assert calculate_form_8863_part_ii(False, "married_filing_separately", 40000, 4000) == 0
+    batch = compute_return_batch("married_filing_separately", [40000], 40000, 0, 0, 0, 0, 4000)
+    assert batch["form_8863_refundable"][0] == batch["form_8863_nonrefundable"][0] == 0
+
+def test_single_return_keeps_its_education_credit():
+    _, refundable, nonrefundable = get_cents_engine().form_8863_cents("single", to_cents(40000), to_cents(4000))
+    assert from_cents(refundable) == calculate_form_8863_part_i(False, "single", 40000, 4000) == 1000
+    assert refundable + nonrefundable == to_cents(2500)
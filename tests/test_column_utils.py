@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+import math
+
+import pytest
+
+from batch_utils import run_batch
+from column_utils import ColumnSink
+from data_utils import load_taxpayer_information
+from return_utils import RETURN_LINES, compute_return
+
+@pytest.fixture
+def sink(tmp_path):
+    data = load_taxpayer_information()
+    source = tmp_path / "records.jsonl"
+    source.write_text(json.dumps(data) + "\n{broken\n")
+    sink = ColumnSink()
+    for record_id, values, error in run_batch(str(source), workers=1, values=True):
+        sink.append(record_id, values, error)
+    return sink
+
+def test_columns_match_compute_return(sink):
+    expected = compute_return(load_taxpayer_information())
+    assert len(sink) == 2 and sink.error_count == 1
+    for name in RETURN_LINES:
+        assert sink.column(name)[0] == expected[name]
+        assert math.isnan(sink.column(name)[1])
+    assert sink.to_numpy()["tax"][0] == expected["tax"]
+
+def test_csv_round_trip(sink, tmp_path):
+    path = sink.write(str(tmp_path / "results.csv"))
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    expected = compute_return(load_taxpayer_information())
+    assert [row["record_id"] for row in rows] == ["records.jsonl:1", "records.jsonl:2"]
+    assert {name: float(rows[0][name]) for name in RETURN_LINES} == expected
+    assert rows[0]["error"] == ""
+    assert rows[1]["tax"] == "" and rows[1]["error"]
+
+    stream = io.StringIO()
+    sink.write_csv(stream)
+    with open(path, newline="") as file:
+        assert stream.getvalue() == file.read()
+
+def test_parquet_needs_pyarrow(sink, tmp_path):
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        with pytest.raises(ImportError):
+            sink.write(str(tmp_path / "results.parquet"))
+        return
+    table = pyarrow.parquet.read_table(sink.write(str(tmp_path / "results.parquet")))
+    assert table.column("record_id").to_pylist() == sink.record_ids
+    assert table.column("tax").to_pylist()[0] == sink.column("tax")[0]
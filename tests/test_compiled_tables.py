@@ -0,0 +1,68 @@
+import os
+import shutil
+
+import pytest
+
+import table_utils
+from data_utils import data_path
+from table_utils import COMPILED_SOURCES, FILING_STATUSES, compile_tax_data, load_compiled_tax_data
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = {}
+    for key in COMPILED_SOURCES:
+        paths[key] = str(tmp_path / os.path.basename(data_path(key)))
+        shutil.copyfile(data_path(key), paths[key])
+    compiled = str(tmp_path / "compiled.bin")
+    compile_tax_data(compiled, paths)
+    return compiled, paths
+
+def _count_hashes(monkeypatch):
+    calls = []
+    original = table_utils.source_data_hash
+    monkeypatch.setattr(table_utils, "source_data_hash", lambda *args: calls.append(args) or original(*args))
+    return calls
+
+def test_compiled_data_matches_json(sources):
+    compiled, paths = sources
+    data = load_compiled_tax_data(compiled, paths=paths)
+    table = table_utils.TaxTable.from_json(paths['tax_table'])
+    schedule = table_utils.RateSchedule.from_json(paths['rate_schedule'])
+    assert list(data['tax_table'].lower_bounds) == table.lower_bounds
+    for status in FILING_STATUSES:
+        assert list(data['tax_table'].columns[status]) == table.columns[status]
+        for income in (100000, 150000.5, 609350, 1000000):
+            assert data['rate_schedule'].compute(income, status) == schedule.compute(income, status)
+    assert data['standard_deductions'] == table_utils.read_json_file(paths['standard_deductions'])
+
+def test_unchanged_sources_are_not_rehashed(sources, monkeypatch):
+    compiled, paths = sources
+    calls = _count_hashes(monkeypatch)
+    assert load_compiled_tax_data(compiled, paths=paths) is not None
+    assert calls == []
+
+def test_touched_sources_are_rehashed_and_accepted(sources, monkeypatch):
+    compiled, paths = sources
+    os.utime(paths['rate_schedule'], ns=(1, 1))
+    calls = _count_hashes(monkeypatch)
+    assert load_compiled_tax_data(compiled, paths=paths) is not None
+    assert len(calls) == 1
+
+def test_edited_source_is_rejected(sources):
+    compiled, paths = sources
+    with open(paths['standard_deductions']) as file:
+        text = file.read()
+    # Same size, different content
+    with open(paths['standard_deductions'], 'w') as file:
+        file.write(text.replace("14600", "14700", 1))
+    assert load_compiled_tax_data(compiled, paths=paths) is None
+
+def test_explicit_hash_mismatch_is_rejected(sources):
+    compiled, paths = sources
+    assert load_compiled_tax_data(compiled, expected_hash="0" * 64, paths=paths) is None
+
+def test_bad_magic_is_rejected(sources, tmp_path):
+    _, paths = sources
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"NOPE" + b"\0" * 64)
+    assert load_compiled_tax_data(str(bad), paths=paths) is None
@@ -0,0 +1,41 @@
+import pytest
+
+from curve_utils import derive_table_brackets, get_tax_curve, round_half_up
+from table_utils import FILING_STATUSES, get_tax_table
+from tax_utils import compute_tax
+
+INCOMES = [0, 3, 11599, 11600, 47150, 60000, 94300, 99999, 100000, 100524, 100525, 250000, 800000]
+
+def test_single_brackets():
+    curve = get_tax_curve("single")
+    assert curve.bracket_minimums == [0, 11600, 47150, 100525, 191950, 243725, 609350]
+    assert curve.bracket_rates == [0.1, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37]
+    assert curve.marginal_rate(47149) == 0.12
+    assert curve.marginal_rate(47150) == 0.22
+    assert curve.next_breakpoint(47150) == 100525
+    assert curve.next_breakpoint(700000) is None
+
+@pytest.mark.parametrize("filing_status", FILING_STATUSES)
+def test_derived_brackets_reproduce_every_table_row(filing_status):
+    tax_table = get_tax_table()
+    brackets = derive_table_brackets(filing_status)
+    minimums = [minimum for minimum, _, _ in brackets]
+    for index, value in enumerate(tax_table.columns[filing_status]):
+        midpoint = (tax_table.lower_bounds[index] + tax_table.upper_bounds[index]) / 2
+        _, rate, subtract_amount = brackets[max(0, sum(minimum <= midpoint for minimum in minimums) - 1)]
+        assert round_half_up(rate * midpoint - subtract_amount) == value, (filing_status, index)
+
+@pytest.mark.parametrize("filing_status", FILING_STATUSES)
+def test_tax_at_and_inverse(filing_status):
+    curve = get_tax_curve(filing_status)
+    for income in INCOMES:
+        assert curve.tax_at(income) == compute_tax(income, filing_status)
+    for target in (0.5, 1000, 15000, 17000, 60000, 250000):
+        income = curve.income_for_tax(target)
+        assert curve.tax_at(income) >= target - 1e-6
+        assert curve.tax_at(income - 0.01) < target
+
+def test_curves_are_shared_and_statuses_checked():
+    assert get_tax_curve("single") is get_tax_curve("single")
+    with pytest.raises(ValueError):
+        get_tax_curve("widowed")
@@ -0,0 +1,54 @@
+import json
+import os
+
+import data_utils
+from data_utils import cache_stats, cached, clear_cache, load_json, load_taxpayer_information
+
+def _write(path, value, mtime_ns=None):
+    path.write_text(json.dumps(value))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_hits_until_mtime_or_size_changes(tmp_path):
+    clear_cache()
+    path = tmp_path / "data.json"
+    _write(path, {"a": 1}, mtime_ns=1_000_000_000)
+
+    assert load_json(str(path)) == {"a": 1}
+    assert load_json(str(path)) == {"a": 1}
+    assert cache_stats()["hits"] == 1 and cache_stats()["misses"] == 1
+
+    # Same size, new mtime
+    _write(path, {"a": 2}, mtime_ns=2_000_000_000)
+    assert load_json(str(path)) == {"a": 2}
+    # Same mtime, new size
+    _write(path, {"a": 33}, mtime_ns=2_000_000_000)
+    assert load_json(str(path)) == {"a": 33}
+    assert cache_stats()["misses"] == 3
+
+def test_cached_tracks_every_dependency(tmp_path):
+    clear_cache()
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.write_text("1")
+    second.write_text("2")
+    calls = []
+    load = lambda: calls.append(1) or len(calls)
+
+    assert cached("key", [str(first), str(second)], load) == 1
+    assert cached("key", [str(first), str(second)], load) == 1
+    second.write_text("22")
+    assert cached("key", [str(first), str(second)], load) == 2
+
+def test_household_files_are_not_cached(tmp_path):
+    clear_cache()
+    load_taxpayer_information()
+    entries = cache_stats()["entries"]
+    for index in range(20):
+        path = tmp_path / f"household_{index}.json"
+        _write(path, {"filing_status": "single", "income": {"total_income": index}})
+        assert load_taxpayer_information(str(path))["income"]["total_income"] == index
+    assert cache_stats()["entries"] == entries
+
+def test_sample_file_is_cached():
+    clear_cache()
+    assert load_taxpayer_information() is load_taxpayer_information(data_utils.data_path('taxpayer_information'))
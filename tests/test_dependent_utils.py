@@ -0,0 +1,42 @@
+import pytest
+
+from dependent_utils import Dependent, normalize_dependent, normalize_dependents
+from forms_utils import form_2441_qualifying_expenses
+from worksheet_utils import count_qualifying_children
+
+CARE = {"annual_cost": 4000, "provider_name": "Little Steps", "ein": "12-3456789", "address": "1 Main St"}
+
+DEPENDENTS = [
+    {"name": "A", "date_of_birth": "2012-06-30", "childcare": CARE},
+    {"name": "B", "date_of_birth": "2011-01-01", "childcare": dict(CARE, annual_cost=2500)},
+    {"name": "C", "date_of_birth": "2008-12-31"},
+    {"name": "D", "date_of_birth": "2007-05-05", "childcare": {}},
+]
+
+def test_ages_and_eligibility_are_against_the_tax_year():
+    a, b, c, d = normalize_dependents(DEPENDENTS, 2024)
+    assert [dependent.age for dependent in (a, b, c, d)] == [12, 13, 16, 17]
+    assert (a.under_13, b.under_13, b.under_17, c.under_17, d.under_17) == (True, False, True, True, False)
+    assert a.has_childcare and a.annual_cost == 4000
+    assert not c.has_childcare and c.annual_cost == 0 and c.provider_ein is None
+    assert not d.has_childcare
+
+def test_forms_read_the_parsed_records():
+    parsed = normalize_dependents(DEPENDENTS, 2024)
+    assert normalize_dependents(parsed) == parsed
+    assert all(normalize_dependent(dependent) is dependent for dependent in parsed)
+    assert form_2441_qualifying_expenses(parsed) == form_2441_qualifying_expenses(DEPENDENTS, 2024) == (4000, 1)
+    assert count_qualifying_children(parsed) == count_qualifying_children(DEPENDENTS, 2024) == 3
+
+def test_provider_text_is_shared():
+    # Equal names built separately, as they would be when parsed from different records
+    copy = dict(DEPENDENTS[0], name="E", childcare=dict(CARE, provider_name="".join(["Little ", "Steps"])))
+    first, second = normalize_dependents([DEPENDENTS[0], copy], 2024)
+    assert copy["childcare"]["provider_name"] is not CARE["provider_name"]
+    assert first.provider_name is second.provider_name
+    assert first != second
+    assert first == Dependent("A", 12, CARE)
+
+def test_bad_date_of_birth_raises():
+    with pytest.raises(ValueError):
+        normalize_dependents([{"name": "X", "date_of_birth": "05/05/2015"}], 2024)
@@ -0,0 +1,20 @@
+from differential import DEFAULT_ENGINES, check_cases, generate_chunk, init_worker, main
+
+def test_engines_match_reference():
+    init_worker()
+    cases = generate_chunk("ci", 0, 500)
+    assert any(case["household"]["filing_status"] == "married_filing_separately" for case in cases)
+    assert list(check_cases(cases, DEFAULT_ENGINES)) == []
+
+def test_runner_exit_status(capsys):
+    assert main(["--cases", "200", "--seed", "ci", "--workers", "1"]) == 0
+    assert "No mismatches" in capsys.readouterr().out
+
+def test_scalar_engine_catches_a_form_function_bug(monkeypatch):
+    import forms_utils
+    init_worker()
+    cases = generate_chunk("ci", 1, 300)
+    # Pretend Form 2441 line 8 had an off-by-one-band bug
+    monkeypatch.setattr(forms_utils, "form_2441_applicable_percentage", lambda *args: 0.19)
+    lines = {line for _, engine, line, _, _ in check_cases(cases, ["scalar"])}
+    assert "2441.line_11" in lines
@@ -0,0 +1,41 @@
+from data_utils import load_taxpayer_information
+from graph_utils import RETURN_NODES, ReturnGraph
+from instrument_utils import instrument
+from return_utils import RETURN_LINES, compute_return
+
+def test_each_line_is_computed_once():
+    graph = ReturnGraph.from_household(load_taxpayer_information())
+    with instrument() as stats:
+        first = graph.compute()
+        assert graph.compute() == first
+    assert graph.computed == len(RETURN_NODES)
+    # 1040.line_16 is shared by 2441.line_10 and worksheet_a.line_5 but taxed once
+    assert stats.totals["tax_utils.compute_tax"]["calls"] == 1
+    assert all(totals["calls"] == 1 for name, totals in stats.totals.items() if name.startswith("graph."))
+
+def test_set_input_drops_only_downstream_lines():
+    graph = ReturnGraph.from_household(load_taxpayer_information())
+    graph.compute()
+    stale = graph.set_input("qualified_education_expenses", 1234)
+    assert stale == {"8863.line_30", "8863.line_7", "8863.line_8", "8863.line_19"}
+    assert "2441.line_11" in graph.values and "8863.line_19" not in graph.values
+    assert graph.set_input("qualified_education_expenses", 1234) == set()
+
+def test_edits_match_a_fresh_graph():
+    data = load_taxpayer_information()
+    lazy, eager = ReturnGraph.from_household(data), ReturnGraph.from_household(data)
+    lazy.compute()
+    eager.compute()
+    lazy.set_input("total_income", 400000)
+    recomputed, changed = eager.update("total_income", 400000)
+    assert changed <= recomputed
+
+    edited = dict(data, income=dict(data["income"], total_income=400000))
+    expected = ReturnGraph.from_household(edited).compute()
+    assert lazy.compute() == eager.compute() == expected
+    assert compute_return(edited) == {name: expected[line_name] for name, line_name in RETURN_LINES.items()}
+
+def test_input_dependencies():
+    graph = ReturnGraph.from_household(load_taxpayer_information())
+    assert graph.input_dependencies("2441.line_10") == {"total_income", "filing_status", "tax_year", "jurisdiction"}
+    assert graph.input_dependencies("8863.line_30") == {"qualified_education_expenses"}
@@ -0,0 +1,11 @@
+import os
+
+from check_import_time import EXCLUDED, MODULES, MODULES_DIR, check_import_time
+
+def test_every_module_is_checked():
+    names = {name[:-3] for name in os.listdir(MODULES_DIR) if name.endswith(".py")}
+    assert names == set(MODULES) | set(EXCLUDED)
+
+def test_import_time_budget():
+    passed, median_ms, problems = check_import_time(runs=5)
+    assert passed, problems
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+from batch_utils import run_batch
+from data_utils import data_path
+from graph_utils import ReturnGraph
+from instrument_utils import MemorySink, _SINKS, instrument, instrumented, record_io
+
+@instrumented("outer")
+def _outer(path):
+    record_io(files_opened=1, bytes_read=10)
+    return _inner(path)
+
+@instrumented("inner")
+def _inner(path):
+    record_io(files_opened=1, bytes_read=5)
+    if path is None:
+        raise ValueError("no path")
+    return path
+
+def test_io_counters_are_inclusive():
+    with instrument() as stats:
+        _outer("x")
+        with pytest.raises(ValueError):
+            _outer(None)
+    assert stats.totals["inner"]["files_opened"] == 2
+    assert stats.totals["inner"]["errors"] == 1
+    assert stats.totals["outer"]["files_opened"] == 4
+    assert stats.totals["outer"]["bytes_read"] == 30
+    assert not _SINKS
+
+def test_graph_reports_each_line():
+    with open(data_path("taxpayer_information")) as file:
+        data = json.load(file)
+    with instrument() as stats:
+        ReturnGraph.from_household(data).compute()
+    assert stats.totals["graph.1040.line_16"]["calls"] == 1
+    assert stats.totals["graph.2441.line_9"]["calls"] == 1
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_profile_counts_household_file_reads(tmp_path, workers):
+    sizes = []
+    with open(data_path("taxpayer_information"), "rb") as file:
+        raw = file.read()
+    for i in range(3):
+        record = tmp_path / f"h{i}.json"
+        record.write_bytes(raw + b" " * i)
+        sizes.append(os.path.getsize(record))
+
+    profile = MemorySink()
+    results = list(run_batch(str(tmp_path), workers=workers, profile=profile))
+    assert not any("error" in result for result in results)
+    totals = profile.totals["batch.load_record"]
+    assert totals["calls"] == 3
+    assert totals["files_opened"] == 3
+    assert totals["bytes_read"] == sum(sizes)
@@ -0,0 +1,47 @@
+from multiprocessing.pool import ThreadPool
+
+import pytest
+
+from batch_utils import bounded_imap
+from data_utils import load_taxpayer_information
+from montecarlo_utils import Normal, Relative, Triangular, simulate, simulate_batch
+
+DISTRIBUTIONS = {
+    "total_income": Relative(Normal(1.0, 0.15)),
+    "annual_cost": Triangular(3000, 5000, 9000),
+}
+
+def test_results_do_not_depend_on_workers_or_chunking():
+    data = load_taxpayer_information()
+    serial = simulate(data, DISTRIBUTIONS, samples=3000, seed=7, workers=1, chunk_samples=1000)
+    assert simulate(data, DISTRIBUTIONS, samples=3000, seed=7, workers=2, chunk_samples=1000) == serial
+    assert simulate(data, DISTRIBUTIONS, samples=3000, seed=8, workers=1, chunk_samples=1000) != serial
+
+def test_bad_household_reports_error_and_batch_continues():
+    data = load_taxpayer_information()
+    results = list(simulate_batch([("bad", {"filing_status": "single"}), ("good", data)],
+                                  DISTRIBUTIONS, samples=200, workers=1))
+    assert [result["record_id"] for result in results] == ["bad", "good"]
+    assert "error" in results[0]
+    assert "error" not in results[1]
+
+def test_invalid_sample_counts_raise_on_call():
+    with pytest.raises(ValueError):
+        simulate_batch([], DISTRIBUTIONS, samples=0)
+    with pytest.raises(ValueError):
+        simulate_batch([], DISTRIBUTIONS, chunk_samples=0)
+
+def test_bounded_imap_keeps_order_and_limits_read_ahead():
+    consumed = []
+
+    def items():
+        for i in range(50):
+            consumed.append(i)
+            yield i
+
+    with ThreadPool(2) as pool:
+        results = bounded_imap(pool, abs, items(), chunksize=3, max_pending=2)
+        assert next(results) == 0
+        # Two chunks of three submitted; nothing else read from the input
+        assert len(consumed) <= 2 * 3
+        assert [0] + list(results) == list(range(50))
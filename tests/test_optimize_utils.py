@@ -0,0 +1,83 @@
+import pytest
+
+from data_utils import load_taxpayer_information
+from forms_utils import calculate_form_2441
+from optimize_utils import FilingOptimizer
+from record_utils import parse_household
+from return_utils import compute_return, compute_return_batch
+
+def _separate_household():
+    data = load_taxpayer_information()
+    return dict(data, filing_status="married_filing_separately", education={"qualified_expenses": 4000})
+
+def test_separate_return_gets_no_2441_or_8863_credit_in_any_engine():
+    data = _separate_household()
+    household = parse_household(data)
+    assert calculate_form_2441(data, print_output=False, strict=True) == 0
+
+    result = compute_return(data)
+    assert result["form_2441_credit"] == result["schedule_3_total"] == 0
+    assert result["form_8863_refundable"] == result["form_8863_nonrefundable"] == 0
+    assert compute_return(data, cents=True)["form_2441_credit"] == 0
+
+    qualifying = [dependent for dependent in household.dependents if dependent.under_13]
+    batch = compute_return_batch("married_filing_separately", [household.total_income], household.total_income, 0,
+                                 sum(dependent.annual_cost for dependent in qualifying), len(qualifying), 2, 4000)
+    assert batch["form_2441_credit"][0] == batch["form_8863_refundable"][0] == 0
+
+@pytest.mark.parametrize("considered_unmarried", [False, True])
+def test_optimizer_returns_match_the_engines(considered_unmarried):
+    optimizer = FilingOptimizer(load_taxpayer_information(), considered_unmarried)
+    plan = optimizer.separate_plan(float("inf"))
+    for filed in plan["returns"]:
+        result = compute_return({"filing_status": filed["filing_status"],
+                                 "income": {"total_income": filed["total_income"],
+                                            "taxpayer": {"wages": filed["total_income"]}},
+                                 "taxpayer": {"name": "Taxpayer"},
+                                 "education": {"qualified_expenses": filed["qualified_education_expenses"]},
+                                 "dependents": [dependent for dependent in load_taxpayer_information()["dependents"]
+                                                if dependent["name"] in filed["dependents"]]})
+        for line, value in result.items():
+            assert filed[line] == pytest.approx(value), line
+
+def _brute_force(optimizer):
+    """Lowest separate liability over every assignment, status and education choice"""
+    import itertools
+    incomes = optimizer.separate_incomes()
+    earned = (optimizer.taxpayer_income, optimizer.spouse_income)
+    dependents = optimizer.household.dependents
+    best = float("inf")
+    for owners in itertools.product((0, 1), repeat=len(dependents)):
+        claimed = [tuple(dependent for dependent, owner in zip(dependents, owners) if owner == person)
+                   for person in (0, 1)]
+        for education_owner in (0, 1):
+            total = 0
+            for person in (0, 1):
+                education = optimizer.education if person == education_owner else 0
+                results = [optimizer.evaluate_return(filing_status, incomes[person], earned[person], 0,
+                                                     claimed[person], education)
+                           for filing_status in optimizer._separate_statuses(claimed[person])]
+                total += min(result["net_liability"] for result in results if result is not None)
+            best = min(best, total)
+    return best
+
+@pytest.mark.parametrize("considered_unmarried", [False, True])
+@pytest.mark.parametrize("seed", range(6))
+def test_search_matches_brute_force(seed, considered_unmarried):
+    import random
+    rng = random.Random(seed)
+    taxpayer_wages, spouse_wages = rng.randint(0, 120000), rng.randint(0, 120000)
+    data = {
+        "filing_status": "married_filing_jointly",
+        "taxpayer": {"name": "Taxpayer"}, "spouse": {"name": "Spouse"},
+        "income": {"total_income": taxpayer_wages + spouse_wages + rng.randint(0, 20000),
+                   "taxpayer": {"wages": taxpayer_wages}, "spouse": {"wages": spouse_wages}},
+        "education": {"qualified_expenses": rng.choice((0, 1500, 4000))},
+        "dependents": [{"name": f"Child{index}", "date_of_birth": f"{2024 - rng.randint(0, 18)}-06-01",
+                        "childcare": {"annual_cost": rng.choice((0, 2500, 5000))}}
+                       for index in range(rng.randint(0, 5))],
+    }
+    optimizer = FilingOptimizer(data, considered_unmarried)
+    plan = optimizer.separate_plan(float("inf"))
+    assert plan["net_liability"] == pytest.approx(_brute_force(optimizer))
+    assert sum(filed["qualified_education_expenses"] for filed in plan["returns"]) == optimizer.education
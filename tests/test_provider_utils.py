@@ -0,0 +1,46 @@
+import io
+import json
+
+from forms_utils import process_form_2441_part_i
+from provider_utils import ProviderRegistry, aggregate_providers
+
+def _household(*children):
+    return {"dependents": [
+        {"name": name, "date_of_birth": "2018-01-01",
+         "childcare": {"annual_cost": cost, "ein": ein, "provider_name": f"Provider {ein}", "address": "1 Main St"}}
+        for name, ein, cost in children
+    ]}
+
+HOUSEHOLDS = [
+    _household(("A", "11", 3000), ("B", "11", 2000)),
+    _household(("C", "22", 5000)),
+    _household(("D", "11", 1000), ("E", "22", 500)),
+    {"dependents": [{"name": "F", "date_of_birth": "2018-01-01"}]},
+]
+
+def test_totals_across_households():
+    registry, skipped = aggregate_providers(HOUSEHOLDS)
+    assert skipped == 0
+    assert registry.households == 4
+    assert registry.report() == [
+        {"ein": "11", "name": "Provider 11", "address": "1 Main St", "amount_paid": 6000, "households": 2, "dependents": 3},
+        {"ein": "22", "name": "Provider 22", "address": "1 Main St", "amount_paid": 5500, "households": 2, "dependents": 2},
+    ]
+
+def test_part_i_fills_the_callers_registry():
+    registry = ProviderRegistry()
+    for data in HOUSEHOLDS:
+        process_form_2441_part_i(data, registry=registry)
+    assert registry.report() == aggregate_providers(HOUSEHOLDS)[0].report()
+
+def test_bad_lines_and_records_are_skipped():
+    bad_dependents = {"dependents": [HOUSEHOLDS[1]["dependents"][0], {"name": "X", "date_of_birth": "not a date"}]}
+    lines = [json.dumps(HOUSEHOLDS[0]), "{broken", json.dumps(bad_dependents), json.dumps(HOUSEHOLDS[1])]
+    registry = ProviderRegistry()
+    same, skipped = aggregate_providers(io.StringIO("\n".join(lines) + "\n"), registry)
+    assert same is registry
+    assert skipped == 2
+    assert registry.households == 2
+    # The household with the bad dependent added nothing, even for its valid child
+    assert registry.get("22").amount_paid == 5000
+    assert registry.get("11").amount_paid == 5000
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from data_utils import load_taxpayer_information
+from graph_utils import household_inputs
+from record_utils import Household, ValidationError, dumps, load_household, loads, parse_household
+
+def _with(data, **changes):
+    return dict(data, **changes)
+
+def test_household_matches_dict_inputs():
+    data = load_taxpayer_information()
+    household = parse_household(data)
+    assert isinstance(household, Household)
+    assert parse_household(household) is household
+    assert household.graph_inputs() == dict(household_inputs(data), dependents=household.dependents)
+    assert load_household(json.dumps(data).encode()).graph_inputs() == household.graph_inputs()
+
+@pytest.mark.parametrize("change, path", [
+    (lambda data: _with(data, filing_status="widowed"), "filing_status"),
+    (lambda data: {key: value for key, value in data.items() if key != "income"}, "income"),
+    (lambda data: _with(data, income={}), "income.total_income"),
+    (lambda data: _with(data, income=dict(data["income"], total_income="100")), "income.total_income"),
+    (lambda data: _with(data, income=dict(data["income"], total_income=True)), "income.total_income"),
+    (lambda data: _with(data, tax_year="2024"), "tax_year"),
+    (lambda data: _with(data, jurisdiction=7), "jurisdiction"),
+    (lambda data: _with(data, dependents={}), "dependents"),
+    (lambda data: _with(data, dependents=[{"name": "A"}]), "dependents[0].date_of_birth"),
+    (lambda data: _with(data, dependents=[{"date_of_birth": "2020-13-01"}]), "dependents[0].date_of_birth"),
+    (lambda data: _with(data, dependents=[{"date_of_birth": "2020-01-01", "childcare": []}]),
+     "dependents[0].childcare"),
+    (lambda data: _with(data, dependents=[{"date_of_birth": "2020-01-01", "childcare": {"annual_cost": "5"}}]),
+     "dependents[0].childcare.annual_cost"),
+    (lambda data: _with(data, education={"qualified_expenses": "x"}), "education.qualified_expenses"),
+])
+def test_errors_name_the_field(change, path):
+    with pytest.raises(ValidationError) as error:
+        parse_household(change(load_taxpayer_information()))
+    assert error.value.path == path
+    assert str(error.value).startswith(path)
+
+def test_null_annual_cost_is_zero():
+    data = _with(load_taxpayer_information(),
+                 dependents=[{"date_of_birth": "2020-01-01", "childcare": {"ein": "1", "annual_cost": None}}])
+    dependent, = parse_household(data).dependents
+    assert dependent.has_childcare and dependent.annual_cost == 0
+
+def test_invalid_json_is_a_validation_error():
+    with pytest.raises(ValidationError):
+        load_household(b"{not json")
+    assert loads(dumps({"a": [1, 2.5, None]})) == {"a": [1, 2.5, None]}
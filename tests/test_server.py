@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+from server_utils import TaxServer, compute_taxes
+
+async def _post(port, path, body):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode()
+                 + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+def _post_together(bodies, path="/tax"):
+    """POST the bodies concurrently, so they land in one micro-batch"""
+    async def run():
+        server = TaxServer(workers=0, batch_window_ms=50)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await asyncio.gather(*(_post(port, path, body) for body in bodies))
+        finally:
+            server.close()
+            await listener.wait_closed()
+    return asyncio.run(run())
+
+def test_malformed_request_does_not_fail_its_batch():
+    valid, malformed = _post_together([
+        {"taxable_income": 50000, "filing_status": "single"},
+        {"taxable_income": 50000, "filing_status": "single", "tax_year": [2024]},
+    ])
+    assert valid[0] == 200 and valid[1]["tax"] > 0
+    assert malformed[0] == 400 and "tax_year" in malformed[1]["error"]
+
+def test_rejects_bool_year_and_non_string_jurisdiction():
+    results = _post_together([
+        {"taxable_income": 50000, "filing_status": "single", "tax_year": True},
+        {"taxable_income": 50000, "filing_status": "single", "jurisdiction": 7},
+    ])
+    assert [status for status, _ in results] == [400, 400]
+
+def test_compute_taxes_isolates_unhashable_items():
+    results = compute_taxes([(50000.0, "single", None, None), (50000.0, "single", [2024], None)])
+    assert results[0]["tax"] > 0
+    assert results[1]["error"].startswith("TypeError")
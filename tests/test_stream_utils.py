@@ -0,0 +1,31 @@
+import io
+import json
+
+from data_utils import load_taxpayer_information
+from stream_utils import iter_jsonl, stream_form_2441, stream_returns, stream_schedule3, write_jsonl
+
+def _jsonl(records):
+    return io.StringIO("".join((record if isinstance(record, str) else json.dumps(record)) + "\n"
+                               for record in records))
+
+def test_streams_isolate_bad_records():
+    sample = load_taxpayer_information()
+    malformed = dict(sample, dependents=[{"name": "A", "date_of_birth": "2015-02-30"}])
+    for stream in (stream_form_2441, stream_schedule3, stream_returns):
+        results = list(stream(_jsonl([sample, "{not json", malformed, sample])))
+        assert len(results) == 4, stream.__name__
+        assert "error" not in results[0] and results[0] == results[3]
+        assert results[1]["error"].startswith("line 2")
+        assert "date_of_birth" in results[2]["error"]
+
+def test_schedule3_matches_form_2441():
+    sample = load_taxpayer_information()
+    [credit] = stream_form_2441([sample])
+    [total] = stream_schedule3([sample])
+    assert total["schedule_3_total"] == credit["form_2441_credit"] > 0
+
+def test_jsonl_round_trip():
+    output = io.StringIO()
+    assert write_jsonl(({"index": index} for index in range(5)), output, flush_every=2) == 5
+    output.seek(0)
+    assert [record["index"] for record in iter_jsonl(output)] == list(range(5))
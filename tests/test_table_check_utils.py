@@ -0,0 +1,36 @@
+import math
+
+from data_utils import data_path, read_json_file
+from table_check_utils import check_tax_data, derive_formula_table, verify_formula_table
+from table_utils import FILING_STATUSES, FormulaTaxTable, TaxTable, get_tax_table
+
+def test_bundled_data_passes_every_check():
+    assert [issue for issue in check_tax_data() if issue[0] == "error"] == []
+
+def test_committed_formula_table_is_equivalent():
+    committed = FormulaTaxTable.from_json(data_path('tax_table_formula'))
+    assert verify_formula_table(committed) == []
+    assert committed.as_dict() == derive_formula_table().as_dict()
+
+def test_formula_table_matches_at_band_edges():
+    table, formula = get_tax_table(), derive_formula_table()
+    incomes = [bound + offset for bound in table.lower_bounds[::97] for offset in (0, 0.01, -0.01)]
+    for status in FILING_STATUSES:
+        assert [formula.lookup(income, status) for income in incomes] == \
+               [table.lookup(income, status) for income in incomes]
+    codes = [index % len(FILING_STATUSES) for index in range(len(incomes))]
+    batch = formula.lookup_batch(incomes, codes)
+    for income, code, tax in zip(incomes, codes, batch):
+        expected = table.lookup(income, FILING_STATUSES[code])
+        assert (math.isnan(tax) and expected is None) or tax == expected
+
+def test_altered_row_is_reported():
+    entries = read_json_file(data_path('tax_table'))
+    entries[10]["single"] += 1
+    issues = verify_formula_table(derive_formula_table(), TaxTable.from_entries(entries))
+    assert len(issues) == 1 and "single" in issues[0][1]
+
+def test_empty_formula_table():
+    empty = FormulaTaxTable([], {status: [] for status in FILING_STATUSES})
+    assert empty.lookup(1000, "single") is None
+    assert all(math.isnan(tax) for tax in empty.lookup_batch([0, 1000, 150000], [0, 1, 2]))
@@ -0,0 +1,61 @@
+import pytest
+
+from data_utils import data_path, read_json_file
+from table_utils import FILING_STATUSES, RateSchedule, TaxTable, get_rate_schedule, get_tax_table
+from tax_utils import compute_tax
+
+def _scan_table(entries, taxable_income, filing_status):
+    # The linear scan compute_tax used before the index
+    entry = _scan_entry(entries, taxable_income)
+    return None if entry is None else float(entry[filing_status])
+
+def _scan_entry(entries, taxable_income):
+    for entry in entries:
+        if entry["taxable_income_range"]["LowerBound"] <= taxable_income < entry["taxable_income_range"]["UpperBound"]:
+            return entry
+    return None
+
+def _scan_schedule(brackets, taxable_income, filing_status):
+    for entry in brackets[filing_status]:
+        upper_bound = entry["income_range"]["max"]
+        if entry["income_range"]["min"] <= taxable_income < (float("inf") if upper_bound is None else upper_bound):
+            return taxable_income * entry["tax_rate"] - entry["subtract_amount"]
+    return None
+
+def _edges(bounds):
+    return sorted({bound + offset for bound in bounds for offset in (-0.01, 0, 0.01)})
+
+@pytest.fixture(scope="module")
+def entries():
+    return read_json_file(data_path("tax_table"))
+
+@pytest.fixture(scope="module")
+def brackets():
+    return read_json_file(data_path("rate_schedule"))["tax_brackets"]
+
+def test_tax_table_matches_linear_scan_at_band_edges(entries):
+    incomes = _edges([entry["taxable_income_range"]["LowerBound"] for entry in entries] + [100000, -1])
+    tables = [TaxTable.from_entries(entries), get_tax_table()]
+    for income in incomes:
+        entry = _scan_entry(entries, income)
+        for filing_status in FILING_STATUSES:
+            expected = None if entry is None else float(entry[filing_status])
+            for table in tables:
+                assert table.lookup(income, filing_status) == expected, (income, filing_status)
+
+def test_rate_schedule_matches_linear_scan_at_bracket_edges(brackets):
+    schedules = [RateSchedule.from_brackets(brackets), get_rate_schedule()]
+    for filing_status, entries in brackets.items():
+        incomes = _edges([entry["income_range"]["min"] for entry in entries] + [10 ** 7])
+        for income in incomes:
+            expected = _scan_schedule(brackets, income, filing_status)
+            for schedule in schedules:
+                assert schedule.compute(income, filing_status) == pytest.approx(expected), (income, filing_status)
+
+def test_compute_tax_uses_both_sources(entries, brackets):
+    assert compute_tax(99999.99, "single") == _scan_table(entries, 99999.99, "single")
+    assert compute_tax(100000, "single") == pytest.approx(_scan_schedule(brackets, 100000, "single"))
+    assert compute_tax(50000, "SINGLE") == _scan_table(entries, 50000, "single")
+    assert compute_tax(-5, "single") is None
+    with pytest.raises(RuntimeError):
+        compute_tax(50000, "widowed")
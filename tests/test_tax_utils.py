@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from table_utils import FILING_STATUSES
+from tax_utils import compute_tax, compute_tax_batch
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    incomes = np.concatenate([rng.uniform(-100, 700000, 4000), [0, 4.99, 5, 99999.99, 100000, 609350]])
+    statuses = rng.choice(FILING_STATUSES, incomes.size)
+    taxes = compute_tax_batch(incomes, statuses)
+    for income, status, tax in zip(incomes.tolist(), statuses.tolist(), taxes.tolist()):
+        expected = compute_tax(income, status)
+        if expected is None:
+            assert np.isnan(tax), income
+        else:
+            assert tax == pytest.approx(expected), (income, status)
+
+def test_one_status_broadcasts_and_shape_is_kept():
+    incomes = np.array([[20000, 150000], [99999, 100000]])
+    taxes = compute_tax_batch(incomes, "Married_Filing_Jointly")
+    assert taxes.shape == (2, 2)
+    assert taxes[0, 1] == pytest.approx(compute_tax(150000, "married_filing_jointly"))
+
+def test_invalid_status_raises():
+    with pytest.raises(ValueError):
+        compute_tax_batch([50000, 60000], ["single", "widowed"])
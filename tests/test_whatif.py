@@ -0,0 +1,51 @@
+import pytest
+
+from data_utils import load_taxpayer_information
+from graph_utils import ReturnGraph
+from record_utils import parse_household
+from whatif_utils import WhatIfSession
+
+def test_edit_matches_fresh_graph():
+    session = WhatIfSession(load_taxpayer_information())
+    session.set("total_income", 150000)
+
+    data = load_taxpayer_information()
+    edited = dict(data, income=dict(data["income"], total_income=150000))
+    assert session.results() == WhatIfSession(edited).results()
+
+def test_failed_edit_leaves_no_stale_lines():
+    data = load_taxpayer_information()
+    session = WhatIfSession(data)
+
+    # No standard deduction for this status: adjust_for_standard_deduction raises
+    with pytest.raises(ValueError):
+        session.set("filing_status", "qualifying_surviving_spouse")
+
+    fresh = ReturnGraph.from_household(dict(data, filing_status="qualifying_surviving_spouse"))
+    assert session.graph.inputs["filing_status"] == "qualifying_surviving_spouse"
+    for name in list(session.graph.values):
+        assert session.graph.values[name] == fresh[name], name
+    assert session.graph["2441.line_5"] == fresh["2441.line_5"] == 75000
+    assert session.graph["8863.line_6"] is fresh["8863.line_6"] is None
+    with pytest.raises(ValueError):
+        session.graph["1040.line_15"]
+
+def test_childcare_edit_on_parsed_household():
+    data = load_taxpayer_information()
+    session = WhatIfSession(parse_household(data))
+    session.set_childcare_cost(0, 7200)
+
+    edited = dict(data, dependents=[dict(data["dependents"][0], childcare=dict(data["dependents"][0]["childcare"],
+                                                                                annual_cost=7200)),
+                                    *data["dependents"][1:]])
+    assert session.results() == WhatIfSession(edited).results()
+    dependent = session.graph.inputs["dependents"][0]
+    assert dependent.annual_cost == 7200 and dependent.age == parse_household(data).dependents[0].age
+
+def test_childcare_edit_with_null_childcare():
+    data = load_taxpayer_information()
+    data = dict(data, dependents=[dict(data["dependents"][0], childcare=None), *data["dependents"][1:]])
+    session = WhatIfSession(data)
+    session.set_childcare_cost(0, 2000)
+    assert session.graph.inputs["dependents"][0]["childcare"] == {"annual_cost": 2000}
+    assert data["dependents"][0]["childcare"] is None
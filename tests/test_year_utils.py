@@ -0,0 +1,49 @@
+import pytest
+
+from data_utils import load_config
+from tax_utils import compute_tax
+from year_utils import TaxDataRegistry, get_tax_year_data
+
+def _registry(budget_bytes):
+    # Three extra years backed by the committed files
+    paths = load_config()["tax_years"]["2024"]["federal"]
+    sources = {(2021, "federal"): paths, (2022, "federal"): paths, (2023, "state"): paths}
+    return TaxDataRegistry(sources, 2024, "federal", budget_bytes)
+
+def test_least_recently_used_entries_are_evicted():
+    probe = _registry(10 ** 9)
+    probe.get(2021)
+    size = probe.total_bytes
+    assert size > 0
+
+    registry = _registry(int(size * 2.5))
+    registry.get()
+    registry.get(2021)
+    registry.get(2022)
+    registry.get(2021)
+    registry.get(2023, "state")
+    # 2022 was the least recently used year; the default year is pinned and free
+    assert registry.loaded() == [(2024, "federal"), (2021, "federal"), (2023, "state")]
+    assert registry.stats == {"hits": 1, "misses": 4, "evictions": 1}
+    assert registry.total_bytes == sum(registry.sizes.values()) <= registry.budget_bytes
+
+def test_requested_entry_is_kept_over_budget():
+    registry = _registry(1)
+    registry.get(2021)
+    registry.get(2022)
+    assert registry.loaded() == [(2022, "federal")]
+    assert registry.stats["evictions"] == 1
+
+def test_default_year_uses_process_tables():
+    from table_utils import get_tax_table
+    assert _registry(0).get().tax_table is get_tax_table()
+    assert get_tax_year_data(2024, "federal") is get_tax_year_data()
+
+def test_unknown_year_or_jurisdiction():
+    with pytest.raises(ValueError):
+        _registry(0).get(1999)
+    with pytest.raises(ValueError):
+        _registry(0).get(2021, "state")
+    with pytest.raises(ValueError):
+        compute_tax(50000, "single", tax_year=1999)
+    assert compute_tax(50000, "single", tax_year=2024, jurisdiction="federal") == compute_tax(50000, "single")
@@ -0,0 +1,275 @@
+"""
+Benchmarks for the tax engine hot paths.
+
+Each benchmark runs one entry point over synthetic households at several record scales
+and reports throughput, p50/p99 per-call latency and peak RSS. Every benchmark and scale
+runs in its own fresh interpreter, so the peak RSS is that run's alone. The cold import time of the modules folder is measured once in a fresh interpreter (see
+check_import_time.py).
+
+Results can be saved as a baseline and later runs compared against it; a benchmark whose
+throughput drops or whose p99 latency grows by more than the tolerance is a regression
+(exit status 1). Runs with fewer than MIN_COMPARED_RECORDS records are not compared,
+since their p99 is a single sample.
+
+Usage:
+    python tools/benchmark.py [--scales 1,1000,1000000] [--only compute_tax_table,...]
+                              [--baseline tools/benchmark_baseline.json] [--save-baseline]
+                              [--tolerance 0.25] [--seed 0] [--json results.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'modules'))
+
+from check_import_time import measure_import
+
+SCALES = (1, 1000, 1000000)
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, 'tools', 'benchmark_baseline.json')
+DEFAULT_TOLERANCE = 0.25
+MIN_COMPARED_RECORDS = 1000
+
+# Generated households keep to the statuses the earlier baselines used, so timings stay comparable
+HOUSEHOLD_STATUSES = ("single", "married_filing_jointly", "head_of_household")
+TAX_STATUSES = ("single", "married_filing_jointly", "married_filing_separately", "head_of_household")
+
+PROVIDERS = [
+    ("Sunny Daycare", "40-0001111"),
+    ("Little Steps Preschool", "40-0002222"),
+    ("Maple Street Aftercare", "40-0003333"),
+    ("Kinder Camp", "40-0004444"),
+    ("Grandma's Home Care", "40-0005555"),
+]
+
+def generate_household(rng, max_dependents=6):
+    """
+    Build one synthetic taxpayer record shaped like data/taxpayer_information.json.
+
+    Dependents (0 to max_dependents), their birth years, childcare providers and costs,
+    wages and education expenses are all drawn from rng.
+    """
+    filing_status = rng.choice(HOUSEHOLD_STATUSES)
+    taxpayer_wages = rng.randrange(0, 250000, 50)
+    spouse_wages = rng.randrange(0, 200000, 50) if filing_status == "married_filing_jointly" else 0
+
+    dependents = []
+    for number in range(rng.randint(0, max_dependents)):
+        dependent = {
+            "name": f"Dependent{number} Household",
+            "date_of_birth": f"{rng.randint(2003, 2023)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "relationship": rng.choice(["Son", "Daughter", "Foster Child", "Niece"]),
+            "months_in_home": rng.randint(6, 12),
+        }
+        if rng.random() < 0.7:
+            provider_name, ein = rng.choice(PROVIDERS)
+            monthly_cost = rng.randrange(100, 1500, 25)
+            dependent["childcare"] = {
+                "provider_name": provider_name,
+                "ein": ein,
+                "monthly_cost": monthly_cost,
+                "annual_cost": monthly_cost * 12,
+            }
+        dependents.append(dependent)
+
+    household = {
+        "taxpayer": {"name": "Taxpayer Household"},
+        "dependents": dependents,
+        "filing_status": filing_status,
+        "income": {
+            "taxpayer": {"wages": taxpayer_wages},
+            "total_income": taxpayer_wages + spouse_wages,
+        },
+        "education": {"qualified_expenses": rng.choice([0, 0, 1500, 2500, 4000, 6000])},
+    }
+    if filing_status == "married_filing_jointly":
+        household["spouse"] = {"name": "Spouse Household"}
+        household["income"]["spouse"] = {"wages": spouse_wages}
+    return household
+
+def iter_households(count, seed=0):
+    """Yield count synthetic households; the same seed always yields the same households"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_household(rng)
+
+def iter_tax_cases(count, seed=0, low=0, high=100000):
+    """Yield (taxable_income, filing_status) pairs with incomes in [low, high)"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng.uniform(low, high), rng.choice(TAX_STATUSES)
+
+
+def _benchmarks():
+    """Name -> (case generator, function of one case). Imported here so import time is measured separately."""
+    from tax_utils import compute_tax, adjust_for_standard_deduction
+    from forms_utils import (calculate_form_2441, calculate_form_8863_part_iii, calculate_form_8863_part_i,
+                             calculate_form_8863_part_ii)
+    from worksheet_utils import Credits_Qualifying_Children_and_Other_Dependents
+
+    def form_8863_chain(data):
+        expenses = data["education"]["qualified_expenses"]
+        agi = data["income"]["total_income"]
+        status = data["filing_status"]
+        calculate_form_8863_part_iii(print_output=False, qualified_expenses=expenses)
+        calculate_form_8863_part_i(False, status, agi, expenses)
+        return calculate_form_8863_part_ii(False, status, agi, expenses)
+
+    return {
+        "compute_tax_table": (lambda count, seed: iter_tax_cases(count, seed, 0, 100000),
+                              lambda case: compute_tax(*case)),
+        "compute_tax_schedule": (lambda count, seed: iter_tax_cases(count, seed, 100000, 1000000),
+                                 lambda case: compute_tax(*case)),
+        "adjust_for_standard_deduction": (iter_households,
+                                          lambda data: adjust_for_standard_deduction(data["income"]["total_income"],
+                                                                                     data["filing_status"])),
+        "calculate_form_2441": (iter_households,
+                                lambda data: calculate_form_2441(data, print_output=False)),
+        "form_8863_chain": (iter_households, form_8863_chain),
+        "child_credit": (iter_households,
+                         lambda data: Credits_Qualifying_Children_and_Other_Dependents(
+                             data, data["income"]["total_income"], data["filing_status"])),
+    }
+
+def peak_rss_kb():
+    """Peak resident set size of this process so far in KB, or None where resource is unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def _percentile(sorted_samples, fraction):
+    return sorted_samples[min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))]
+
+def run_benchmark(func, cases):
+    """
+    Time func over each case individually.
+
+    Returns:
+        dict: {"records", "seconds", "throughput", "p50_us", "p99_us", "peak_rss_kb"}
+    """
+    from array import array
+    samples = array('d')
+    clock = time.perf_counter
+    total = 0.0
+    for case in cases:
+        start = clock()
+        func(case)
+        elapsed = clock() - start
+        samples.append(elapsed)
+        total += elapsed
+
+    ordered = sorted(samples)
+    return {
+        "records": len(samples),
+        "seconds": total,
+        "throughput": len(samples) / total if total else 0.0,
+        "p50_us": _percentile(ordered, 0.50) * 1e6,
+        "p99_us": _percentile(ordered, 0.99) * 1e6,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+def run_isolated(name, scale, seed=0):
+    """
+    Run one benchmark at one scale in this process. Called in a fresh interpreter by
+    run_benchmarks, so peak_rss_kb covers this benchmark only.
+    """
+    # Warm the tables outside the timed region so the 1-record scale measures a lookup, not a load
+    from batch_utils import warm_tables
+    warm_tables()
+
+    cases, func = _benchmarks()[name]
+    return run_benchmark(func, cases(scale, seed))
+
+def run_benchmarks(scales=SCALES, only=None, seed=0, import_runs=3):
+    """
+    Run every benchmark (or those named in only) at each scale, each in its own
+    spawned process.
+
+    Returns:
+        dict: {"cold_import_ms": float, "results": {"<name>@<scale>": run_benchmark dict}}
+    """
+    cold_import_ms = statistics.median(measure_import()["elapsed_ms"] for _ in range(import_runs))
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in _benchmarks():
+        if only and name not in only:
+            continue
+        for scale in scales:
+            with context.Pool(1) as pool:
+                results[f"{name}@{scale}"] = pool.apply(run_isolated, (name, scale, seed))
+    return {"cold_import_ms": cold_import_ms, "results": results}
+
+def compare_to_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare a run_benchmarks report against a saved one. Scales with fewer than
+    MIN_COMPARED_RECORDS records are skipped: their p99 is one sample, and their
+    throughput is the inverse of it.
+
+    Returns:
+        list: Regression messages (empty if nothing regressed beyond tolerance).
+    """
+    regressions = []
+    for key, result in report["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None or min(result["records"], previous["records"]) < MIN_COMPARED_RECORDS:
+            continue
+        if result["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {result['throughput']:,.0f}/s vs baseline {previous['throughput']:,.0f}/s")
+        if result["p99_us"] > previous["p99_us"] * (1 + tolerance):
+            regressions.append(f"{key}: p99 {result['p99_us']:.1f} us vs baseline {previous['p99_us']:.1f} us")
+    if report["cold_import_ms"] > baseline["cold_import_ms"] * (1 + tolerance):
+        regressions.append(f"cold import {report['cold_import_ms']:.1f} ms vs baseline {baseline['cold_import_ms']:.1f} ms")
+    return regressions
+
+def print_report(report):
+    print(f"Cold import: {report['cold_import_ms']:.1f} ms")
+    print(f"{'benchmark':<42}{'records':>10}{'records/s':>14}{'p50 us':>10}{'p99 us':>10}{'peak RSS MB':>13}")
+    for key, result in report["results"].items():
+        rss = f"{result['peak_rss_kb'] / 1024:.1f}" if result["peak_rss_kb"] is not None else "n/a"
+        print(f"{key:<42}{result['records']:>10,}{result['throughput']:>14,.0f}"
+              f"{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}{rss:>13}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the tax engine hot paths")
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)),
+                        help="Comma-separated record counts (default: 1,1000,1000000)")
+    parser.add_argument("--only", help="Comma-separated benchmark names to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed fractional slowdown before a regression is reported")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    only = set(args.only.split(",")) if args.only else None
+    report = run_benchmarks(scales, only, args.seed)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        sys.exit(0)
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as file:
+            regressions = compare_to_baseline(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        sys.exit(1 if regressions else 0)
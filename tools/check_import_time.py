@@ -0,0 +1,92 @@
+"""
+Import-time budget check for the modules folder.
+
+Imports every module in a fresh interpreter and fails (exit status 1) if any of these hold:
+- the median cold import time is over the budget
+- importing opened a file other than Python source/bytecode (e.g. config.json or the tax tables)
+- importing wrote anything to stdout
+
+Usage:
+    python tools/check_import_time.py [--budget-ms 50] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES_DIR = os.path.join(PROJECT_ROOT, 'modules')
+MODULES = ["data_utils", "table_utils", "tax_utils", "forms_utils", "worksheet_utils", "schedule_utils",
+           "graph_utils", "return_utils", "batch_utils", "stream_utils", "curve_utils",
+           "instrument_utils", "dependent_utils",
+           "provider_utils", "year_utils", "cents_utils", "table_check_utils",
+           "record_utils", "cache_utils", "column_utils", "montecarlo_utils", "optimize_utils",
+           "whatif_utils"]
+# Modules left out of the budget: the server needs asyncio, which takes longer than the
+# budget to import on its own
+EXCLUDED = ["server_utils"]
+DEFAULT_BUDGET_MS = 50
+
+# Runs in the child interpreter. Results are written to stderr so that anything the
+# imports print to stdout can be detected separately.
+_PROBE = """
+import io, json, sys, time
+opened = []
+def audit(event, args):
+    if event == "open" and isinstance(args[0], str) and not args[0].endswith((".py", ".pyc")):
+        opened.append(args[0])
+sys.addaudithook(audit)
+sys.path.insert(0, {modules_dir!r})
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed_ms = (time.perf_counter() - start) * 1000
+project_files = [path for path in opened if path.startswith({project_root!r})]
+sys.stderr.write(json.dumps({{"elapsed_ms": elapsed_ms, "opened": project_files}}))
+"""
+
+def measure_import(modules=MODULES):
+    """
+    Import modules in a fresh interpreter.
+
+    Returns:
+        dict: {"elapsed_ms": float, "opened": list of project files opened, "stdout": str}
+    """
+    probe = _PROBE.format(modules_dir=MODULES_DIR, modules=list(modules), project_root=PROJECT_ROOT)
+    completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    result = json.loads(completed.stderr.strip().splitlines()[-1])
+    result["stdout"] = completed.stdout
+    return result
+
+def check_import_time(budget_ms=DEFAULT_BUDGET_MS, runs=5):
+    """
+    Run measure_import several times and compare against the budget.
+
+    Returns:
+        tuple: (passed, median_ms, problems) where problems is a list of messages.
+    """
+    results = [measure_import() for _ in range(runs)]
+    median_ms = statistics.median(result["elapsed_ms"] for result in results)
+    problems = []
+    if median_ms > budget_ms:
+        problems.append(f"median import time {median_ms:.1f} ms exceeds budget of {budget_ms} ms")
+    opened = sorted({path for result in results for path in result["opened"]})
+    if opened:
+        problems.append(f"import opened data files: {opened}")
+    if any(result["stdout"] for result in results):
+        problems.append(f"import wrote to stdout: {results[0]['stdout']!r}")
+    return not problems, median_ms, problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the cold import time of the modules folder")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    passed, median_ms, problems = check_import_time(args.budget_ms, args.runs)
+    print(f"Cold import of {', '.join(MODULES)}: {median_ms:.1f} ms (budget {args.budget_ms} ms)")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(0 if passed else 1)
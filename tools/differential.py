@@ -0,0 +1,723 @@
+"""
+Differential test of the fast engines against the reference scalar functions.
+
+Random households (with incomes, childcare costs, ages and education expenses drawn
+near the bracket, band and credit thresholds where off-by-one errors live) are run
+through a reference that shares no code with the engines: a linear scan over the rows
+of the tax table JSON, the rate schedule JSON, and the form lines written out directly,
+with every input read from the raw household dict. It covers the default tax year and
+jurisdiction in config.json. Each household also goes through each engine:
+
+    scalar     the scalar form functions called one after another (adjust_for_standard_deduction,
+               compute_tax, process_form_2441_part_ii, calculate_form_8863_part_i and part_ii,
+               the child tax credit worksheet, schedule3_part_i_total), so a bug in them or a
+               misreading of the data files they share with the engines shows up too
+    graph      compute_return (the memoized ReturnGraph)
+    batch      return_utils.compute_return_batch (NumPy, one call per filing status)
+    cache      cache_utils.ResultCache.compute_return, on a miss and again on a hit
+    tax_batch  compute_tax_batch
+    formula    FormulaTaxTable.lookup (Tax_Table_Formula.json) below $100,000
+    cents      cents_utils.CentsEngine, lines 15 and 16 compared to the cent
+
+Every case also carries a tax probe (a taxable income and any filing status) that the
+tax engines are checked on directly. Values must be equal exactly; an engine must raise
+the same exception type as the reference. Each failing case is shrunk to a minimal one
+(dependents dropped, amounts rounded, wages removed) that still fails on the same line,
+and mismatches are reported per engine and form line. Exits with status 1 on any
+mismatch.
+
+Cases are generated in chunks seeded from (seed, chunk), so a run is reproducible for
+any worker count, and a case ID (seed:chunk:index) can be replayed on its own.
+
+Usage:
+    python tools/differential.py [--cases 1000000] [--seed 0] [--workers N] [--chunk 2000]
+                                 [--engines graph,batch,...] [--report mismatches.jsonl]
+    python tools/differential.py --replay SEED:CHUNK:INDEX
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'modules'))
+
+from data_utils import data_path
+from return_utils import RETURN_LINES, compute_return, compute_return_batch
+from record_utils import parse_household
+from table_utils import FILING_STATUSES, FormulaTaxTable, get_rate_schedule, get_standard_deductions, get_tax_table
+from tax_utils import adjust_for_standard_deduction, compute_tax, compute_tax_batch
+from forms_utils import process_form_2441_part_ii, calculate_form_8863_part_i, calculate_form_8863_part_ii
+from worksheet_utils import credit_limit_worksheet_a_line_5, count_qualifying_children, child_tax_credit_line_12
+from schedule_utils import schedule3_part_i_total
+from year_utils import default_tax_year, get_tax_year_data
+
+DEFAULT_ENGINES = ("scalar", "graph", "batch", "cache", "tax_batch", "formula", "cents")
+PROBE_LINE = "probe.1040.line_16"
+TABLE_LIMIT = 100000
+
+
+# Case generation
+
+class CaseGenerator:
+    """Draws households and tax probes, biased toward the thresholds in the loaded tax data"""
+
+    def __init__(self):
+        tax_table, rate_schedule = get_tax_table(), get_rate_schedule()
+        thresholds = get_tax_year_data().credit_thresholds
+        self.tax_year = default_tax_year()
+        self.deductions = dict(get_standard_deductions())
+        self.table_edges = list(tax_table.lower_bounds) + [TABLE_LIMIT]
+        self.bracket_edges = sorted({minimum for status in rate_schedule.statuses
+                                     for minimum in rate_schedule.minimums[status]})
+        limits = thresholds.form_8863_income_limits
+        ranges = thresholds.form_8863_phaseout_ranges
+        self.income_edges = sorted(
+            {row[0] for row in thresholds.form_2441_percentages}
+            | {limits[key] - ranges[key] * step / 1000 for key in limits for step in (0, 1, 499, 500, 501, 999, 1000)}
+            | {thresholds.child_tax_credit["threshold"]})
+
+    @staticmethod
+    def _nudge(rng, value):
+        return value + rng.choice((0, 0, 0, 1, -1, 0.01, -0.01, 0.5, -0.5, 0.005, rng.uniform(-60, 60)))
+
+    @staticmethod
+    def _amount(rng, value):
+        # Mostly whole dollars, sometimes cents, rarely negative
+        value = round(value) if rng.random() < 0.8 else round(value, 2)
+        return value if value >= 0 or rng.random() < 0.05 else -value
+
+    def taxable_income(self, rng):
+        roll = rng.random()
+        if roll < 0.4:
+            value = self._nudge(rng, rng.choice(self.table_edges))
+        elif roll < 0.7:
+            value = self._nudge(rng, rng.choice(self.bracket_edges))
+        else:
+            value = rng.uniform(0, 800000)
+        return self._amount(rng, value)
+
+    def total_income(self, rng, filing_status):
+        roll = rng.random()
+        deduction = self.deductions.get(filing_status, 0)
+        if roll < 0.45:
+            value = deduction + self.taxable_income(rng)
+        elif roll < 0.75:
+            value = self._nudge(rng, rng.choice(self.income_edges))
+        else:
+            value = rng.choice((rng.uniform(0, 60000), rng.uniform(0, 400000)))
+        return self._amount(rng, value)
+
+    def dependent(self, rng, number):
+        age = rng.choice((rng.randint(0, 25), 12, 13, 16, 17))
+        dependent = {"name": f"Dependent{number} Household",
+                     "date_of_birth": f"{self.tax_year - age}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+        if rng.random() < 0.75:
+            cost = rng.choice((0, 2999, 3000, 3001, 5999, 6000, 6001, rng.uniform(0, 15000)))
+            dependent["childcare"] = {"provider_name": "Sunny Daycare", "ein": "40-0001111",
+                                      "annual_cost": self._amount(rng, cost)}
+        return dependent
+
+    def household(self, rng):
+        filing_status = rng.choice(FILING_STATUSES)
+        total_income = self.total_income(rng, filing_status)
+        income = {"total_income": total_income}
+        household = {"taxpayer": {"name": "Taxpayer Household"}, "filing_status": filing_status, "income": income,
+                     "dependents": [self.dependent(rng, number) for number in range(rng.choice((0, 1, 1, 2, 2, 3, 5)))]}
+
+        # No wages (taxpayer_income falls back to total_income), all wages, or a split
+        roll = rng.random()
+        if roll < 0.7:
+            share = 1 if roll < 0.3 else rng.random()
+            taxpayer_wages = self._amount(rng, total_income * share)
+            income["taxpayer"] = {"wages": taxpayer_wages}
+            if filing_status == "married_filing_jointly":
+                household["spouse"] = {"name": "Spouse Household"}
+                income["spouse"] = {"wages": self._amount(rng, total_income - taxpayer_wages)}
+
+        if rng.random() < 0.6:
+            expenses = rng.choice((0, 1999, 2000, 2001, 3999, 4000, 4001, rng.uniform(0, 8000)))
+            household["education"] = {"qualified_expenses": self._amount(rng, expenses)}
+        return household
+
+    def case(self, rng, case_id):
+        return {"id": case_id, "household": self.household(rng),
+                "probe": [self.taxable_income(rng), rng.choice(FILING_STATUSES)]}
+
+_GENERATOR = None
+
+def get_generator():
+    global _GENERATOR
+    if _GENERATOR is None:
+        _GENERATOR = CaseGenerator()
+    return _GENERATOR
+
+def generate_chunk(seed, chunk, size):
+    """The cases of one chunk; the same (seed, chunk, size) always gives the same cases"""
+    rng = random.Random(f"{seed}:{chunk}")
+    generator = get_generator()
+    return [generator.case(rng, f"{seed}:{chunk}:{index}") for index in range(size)]
+
+
+# Reference: the raw data files and the form lines written out, independent of the engines
+
+def _error(e):
+    return {"error": type(e).__name__}
+
+class ReferenceData:
+    """The default year's data files as parsed JSON, with nothing precompiled or indexed"""
+
+    def __init__(self):
+        def load(key):
+            with open(data_path(key)) as file:
+                return json.load(file)
+        self.tax_year = default_tax_year()
+        self.table_rows = load('tax_table')
+        self.brackets = load('rate_schedule')["tax_brackets"]
+        self.deductions = load('standard_deductions')
+        self.thresholds = load('credit_thresholds')
+
+    def tax(self, taxable_income, filing_status):
+        """Form 1040 line 16: the table row below $100,000, the rate schedule above; None if none matches"""
+        if taxable_income < TABLE_LIMIT:
+            for row in self.table_rows:
+                income_range = row["taxable_income_range"]
+                if income_range["LowerBound"] <= taxable_income < income_range["UpperBound"]:
+                    return row[filing_status]
+            return None
+        for bracket in self.brackets[filing_status]:
+            income_range = bracket["income_range"]
+            if income_range["min"] <= taxable_income and (income_range["max"] is None
+                                                          or taxable_income < income_range["max"]):
+                return taxable_income * bracket["tax_rate"] - bracket["subtract_amount"]
+        return None
+
+    def form_2441_percentage(self, adjusted_gross_income):
+        for row in self.thresholds["form_2441"]["applicable_percentages"]:
+            if row["min"] <= adjusted_gross_income and (row["max"] is None or adjusted_gross_income < row["max"]):
+                return row["rate"]
+        return 0.20
+
+    def form_8863_refundable(self, filing_status, adjusted_gross_income, qualified_expenses):
+        """Form 8863 line 8; married filing separately gets no education credit"""
+        line_27 = min(qualified_expenses, 4000)
+        line_28 = max(0, line_27 - 2000)
+        line_30 = line_27 if line_28 == 0 else line_28 * 0.25 + 2000
+        limits = self.thresholds["form_8863"]["income_limits"]
+        ranges = self.thresholds["form_8863"]["phaseout_ranges"]
+        line_4 = limits.get(filing_status, limits["default"]) - adjusted_gross_income
+        if filing_status == "married_filing_separately" or line_4 <= 0:
+            return 0
+        line_5 = ranges.get(filing_status, ranges["default"])
+        line_6 = 1.0 if line_4 >= line_5 else round(line_4 / line_5, 3)
+        return line_30 * line_6 * 0.40
+
+_REFERENCE = None
+
+def get_reference():
+    global _REFERENCE
+    if _REFERENCE is None:
+        _REFERENCE = ReferenceData()
+    return _REFERENCE
+
+def _wages(income, person, position):
+    # The income entry keyed by the person's lowercase first name, else the person-level
+    # entries by position (taxpayer first, spouse second); None if there is none
+    first_name = ((person or {}).get("name") or "").split(" ")[0].lower()
+    if isinstance(income.get(first_name), dict):
+        return income[first_name].get("wages", 0)
+    people = [entry for entry in income.values() if isinstance(entry, dict)]
+    return people[position].get("wages", 0) if position < len(people) else None
+
+def reference_lines(case):
+    """
+    Form line -> value for one case, from the raw household dict and data files.
+
+    Returns:
+        dict: RETURN_LINES form lines plus PROBE_LINE. If the household raises, its lines
+              are replaced by {"error": exception type name}.
+    """
+    reference = get_reference()
+    data = case["household"]
+    probe_income, probe_status = case["probe"]
+    try:
+        probe = {PROBE_LINE: reference.tax(probe_income, probe_status)}
+    except Exception as e:
+        probe = {PROBE_LINE: _error(e)}
+    try:
+        filing_status = data["filing_status"]
+        income = data["income"]
+        total_income = income["total_income"]
+        taxpayer_wages = _wages(income, data.get("taxpayer"), 0)
+        spouse_wages = _wages(income, data.get("spouse"), 1) if data.get("spouse") else None
+        taxpayer_income = total_income if taxpayer_wages is None else taxpayer_wages
+        spouse_income = 0 if spouse_wages is None else spouse_wages
+        education = (data.get("education") or {}).get("qualified_expenses") or 0
+
+        ages, qualifying_expenses = [], 0
+        for dependent in data.get("dependents", []):
+            age = reference.tax_year - int(dependent["date_of_birth"][:4])
+            ages.append(age)
+            if age < 13:
+                qualifying_expenses += (dependent.get("childcare") or {}).get("annual_cost") or 0
+        qualifying_persons = sum(1 for age in ages if age < 13)
+
+        taxable_income = max(0, total_income - reference.deductions[filing_status])
+        tax = reference.tax(taxable_income, filing_status) or 0
+
+        # Form 2441: expenses capped by the number of qualifying persons, then by earned income
+        # (the lower spouse's for a joint return), at the AGI percentage, limited to the tax.
+        # Married filing separately gets no credit
+        eligible_expenses = min(qualifying_expenses, 3000 if qualifying_persons == 1 else 6000)
+        earned_income = (min(taxpayer_income, spouse_income) if filing_status == "married_filing_jointly"
+                         else taxpayer_income)
+        credit = min(eligible_expenses, earned_income) * reference.form_2441_percentage(total_income)
+        if filing_status == "married_filing_separately":
+            credit = 0
+        form_2441_credit = min(credit, tax if tax > 0 else 0)
+
+        refundable = reference.form_8863_refundable(filing_status, total_income, education)
+        credit_limit = tax - form_2441_credit
+        # The worksheet does not phase the child tax credit out yet
+        credit_before_limit = (sum(1 for age in ages if age < 17)
+                               * reference.thresholds["child_tax_credit"]["credit_per_qualifying_child"])
+    except Exception as e:
+        return {"error": _error(e)["error"], **probe}
+    return {
+        "1040.line_15": taxable_income,
+        "1040.line_16": tax,
+        "2441.line_11": form_2441_credit,
+        "8863.line_8": refundable,
+        # The remaining 60% of the phased out credit, derived from line 8 as the forms do
+        "8863.line_19": refundable / 0.4 * 0.6,
+        "worksheet_a.line_5": credit_limit,
+        "child_credit.line_14": min(credit_limit, credit_before_limit),
+        "schedule_3.line_8": form_2441_credit,
+        **probe,
+    }
+
+
+# Engines. Each takes a list of cases and returns one {form line: value} dict per case
+# (an "error" key for a household that raised); lines an engine does not compute are left out.
+
+def _form_lines(result):
+    return {RETURN_LINES[name]: value for name, value in result.items()}
+
+def scalar_engine(cases):
+    """The scalar form functions, one call per line, on the validated household"""
+    results = []
+    for case in cases:
+        try:
+            result = {PROBE_LINE: compute_tax(*case["probe"])}
+        except Exception as e:
+            result = {PROBE_LINE: _error(e)}
+        data = case["household"]
+        try:
+            household = parse_household(data)
+            inputs = household.graph_inputs()
+            filing_status, total_income = household.filing_status, household.total_income
+            tax_year, jurisdiction = household.tax_year, household.jurisdiction
+            education = household.qualified_education_expenses
+
+            taxable_income = adjust_for_standard_deduction(total_income, filing_status, tax_year, jurisdiction)
+            tax = compute_tax(taxable_income, filing_status, tax_year, jurisdiction) or 0
+            form_2441_credit = process_form_2441_part_ii(data, 0, inputs["taxpayer_income"], inputs["spouse_income"],
+                                                         total_income, tax, household.dependents)
+            credit_limit = credit_limit_worksheet_a_line_5(tax, form_2441_credit)
+            credit_before_limit = child_tax_credit_line_12(total_income, count_qualifying_children(household.dependents),
+                                                           tax_year, jurisdiction)
+            result.update({
+                "1040.line_15": taxable_income,
+                "1040.line_16": tax,
+                "2441.line_11": form_2441_credit,
+                "8863.line_8": calculate_form_8863_part_i(False, filing_status, total_income, education, tax_year,
+                                                          jurisdiction),
+                "8863.line_19": calculate_form_8863_part_ii(False, filing_status, total_income, education, tax_year,
+                                                            jurisdiction),
+                "worksheet_a.line_5": credit_limit,
+                "child_credit.line_14": min(credit_limit, credit_before_limit),
+                "schedule_3.line_8": schedule3_part_i_total(form_2441_credit),
+            })
+        except Exception as e:
+            result.update(_error(e))
+        results.append(result)
+    return results
+
+def graph_engine(cases):
+    results = []
+    for case in cases:
+        try:
+            results.append(_form_lines(compute_return(case["household"])))
+        except Exception as e:
+            results.append(_error(e))
+    return results
+
+def batch_engine(cases):
+    results = [None] * len(cases)
+    groups = {}
+    for position, case in enumerate(cases):
+        try:
+            household = parse_household(case["household"])
+        except Exception as e:
+            results[position] = _error(e)
+            continue
+        groups.setdefault((household.filing_status, household.tax_year, household.jurisdiction), []).append(
+            (position, household))
+
+    for (filing_status, tax_year, jurisdiction), members in groups.items():
+        columns = {name: [] for name in ("total_income", "taxpayer_income", "spouse_income", "qualifying_expenses",
+                                         "qualifying_persons", "qualifying_children", "qualified_education_expenses")}
+        for _, household in members:
+            inputs = household.graph_inputs()
+            qualifying = [dependent for dependent in household.dependents if dependent.under_13]
+            columns["total_income"].append(inputs["total_income"])
+            columns["taxpayer_income"].append(inputs["taxpayer_income"])
+            columns["spouse_income"].append(inputs["spouse_income"])
+            columns["qualifying_expenses"].append(sum(dependent.annual_cost for dependent in qualifying))
+            columns["qualifying_persons"].append(len(qualifying))
+            columns["qualifying_children"].append(sum(1 for dependent in household.dependents if dependent.under_17))
+            columns["qualified_education_expenses"].append(inputs["qualified_education_expenses"])
+        try:
+            lines = compute_return_batch(filing_status, tax_year=tax_year, jurisdiction=jurisdiction, **columns)
+        except Exception as e:
+            for position, _ in members:
+                results[position] = _error(e)
+            continue
+        for row, (position, _) in enumerate(members):
+            results[position] = {RETURN_LINES[name]: float(values[row]) for name, values in lines.items()}
+    return results
+
+_CACHE = None
+
+def cache_engine(cases):
+    """Each household through the result cache twice; the second (hit) result is checked as "<line> (hit)" """
+    global _CACHE
+    if _CACHE is None:
+        from cache_utils import ResultCache
+        _CACHE = ResultCache(":memory:")
+    results = []
+    for case in cases:
+        try:
+            result = _form_lines(_CACHE.compute_return(case["household"]))
+            result.update({f"{line} (hit)": value
+                           for line, value in _form_lines(_CACHE.compute_return(case["household"])).items()})
+        except Exception as e:
+            result = _error(e)
+        results.append(result)
+    return results
+
+def tax_batch_engine(cases):
+    """compute_tax_batch over every probe in one call"""
+    incomes = [case["probe"][0] for case in cases]
+    statuses = [case["probe"][1] for case in cases]
+    taxes = compute_tax_batch(incomes, statuses)
+    return [{PROBE_LINE: None if tax != tax else float(tax)} for tax in taxes]
+
+_FORMULA_TABLE = None
+
+def formula_engine(cases):
+    """FormulaTaxTable on the probes and household taxable incomes below the table limit"""
+    global _FORMULA_TABLE
+    if _FORMULA_TABLE is None:
+        _FORMULA_TABLE = FormulaTaxTable.from_json(data_path('tax_table_formula'))
+    deductions = get_standard_deductions()
+    results = []
+    for case in cases:
+        result = {}
+        probe_income, probe_status = case["probe"]
+        if probe_income < TABLE_LIMIT:
+            result[PROBE_LINE] = _FORMULA_TABLE.lookup(probe_income, probe_status)
+        data = case["household"]
+        filing_status = data["filing_status"]
+        if filing_status in deductions and data.get("tax_year") is None:
+            taxable_income = max(0, data["income"]["total_income"] - deductions[filing_status])
+            if taxable_income < TABLE_LIMIT:
+                result["1040.line_16"] = _FORMULA_TABLE.lookup(taxable_income, filing_status) or 0
+        results.append(result)
+    return results
+
+def cents_engine(cases):
+    """CentsEngine lines 15 and 16 and the probe, in cents (compared to the reference rounded to the cent)"""
+    from cents_utils import get_cents_engine, to_cents
+    engine = get_cents_engine()
+    results = []
+    for case in cases:
+        probe_income, probe_status = case["probe"]
+        result = {PROBE_LINE: engine.tax_cents(to_cents(probe_income), probe_status)}
+        data = case["household"]
+        try:
+            taxable_income = engine.taxable_income_cents(to_cents(data["income"]["total_income"]), data["filing_status"])
+            result["1040.line_15"] = taxable_income
+            result["1040.line_16"] = engine.tax_cents(taxable_income, data["filing_status"]) or 0
+        except Exception as e:
+            result.update(_error(e))
+        results.append(result)
+    return results
+
+def _exact(expected, actual):
+    return expected == actual
+
+def _to_the_cent(expected, actual):
+    # The float reference can land a hair below an exact half cent (143537.07499999998 for
+    # 143537.075); rounding to six places first removes that noise before rounding half up
+    from cents_utils import to_cents
+    return (None if expected is None else to_cents(round(expected, 6))) == actual
+
+# Engine name -> (engine function, comparison of a reference value with the engine's value)
+ENGINES = {
+    "scalar": (scalar_engine, _exact),
+    "graph": (graph_engine, _exact),
+    "batch": (batch_engine, _exact),
+    "cache": (cache_engine, _exact),
+    "tax_batch": (tax_batch_engine, _exact),
+    "formula": (formula_engine, _exact),
+    "cents": (cents_engine, _to_the_cent),
+}
+
+
+# Comparison and shrinking
+
+def compare(reference, result, equal=_exact):
+    """
+    Returns:
+        list: (line, expected, actual) for every line where result disagrees with reference.
+    """
+    mismatches = []
+    # Engines that only compute the probe are not expected to reproduce household errors
+    computes_household = any(line != PROBE_LINE for line in result)
+    if computes_household and reference.get("error") != result.get("error"):
+        mismatches.append(("error", reference.get("error"), result.get("error")))
+    for line, actual in result.items():
+        if line == "error":
+            continue
+        reference_line = line[:-len(" (hit)")] if line.endswith(" (hit)") else line
+        if reference_line not in reference:
+            # The household raised in the reference; that is compared as "error" above
+            continue
+        expected = reference[reference_line]
+        if isinstance(expected, dict) or isinstance(actual, dict):
+            if expected != actual:
+                mismatches.append((line, expected, actual))
+        elif not equal(expected, actual):
+            mismatches.append((line, expected, actual))
+    return mismatches
+
+def check_cases(cases, engines):
+    """
+    Yields:
+        tuple: (case, engine name, line, expected, actual) for every mismatch.
+    """
+    references = [reference_lines(case) for case in cases]
+    for name in engines:
+        engine, equal = ENGINES[name]
+        try:
+            results = engine(cases)
+        except Exception as e:
+            results = [_error(e)] * len(cases)
+        for case, reference, result in zip(cases, references, results):
+            for line, expected, actual in compare(reference, result, equal):
+                yield case, name, line, expected, actual
+
+def _fails(case, engine, line):
+    return any(mismatch_line == line for _, _, mismatch_line, _, _ in check_cases([case], [engine]))
+
+def _simpler_numbers(value):
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return []
+    candidates = ([0, abs(value)] + [round(value, digits) for digits in (-5, -4, -3, -2, -1, 0)]
+                  + [int(value), int(value / 2)])
+    seen, simpler = set(), []
+    for candidate in candidates:
+        candidate = int(candidate) if candidate == int(candidate) else candidate
+        if candidate != value and candidate not in seen and (abs(candidate) < abs(value) or candidate == abs(value)):
+            seen.add(candidate)
+            simpler.append(candidate)
+    return simpler
+
+def shrink_candidates(case):
+    """Variants of a case that are one step simpler"""
+    def variant(edit):
+        copy = json.loads(json.dumps(case))
+        edit(copy)
+        return copy
+
+    household = case["household"]
+    for index in range(len(household.get("dependents", [])) - 1, -1, -1):
+        yield variant(lambda copy, index=index: copy["household"]["dependents"].pop(index))
+    if "spouse" in household:
+        yield variant(lambda copy: (copy["household"].pop("spouse"), copy["household"]["income"].pop("spouse", None)))
+    if "education" in household:
+        yield variant(lambda copy: copy["household"].pop("education"))
+    if "taxpayer" in household["income"]:
+        yield variant(lambda copy: copy["household"]["income"].pop("taxpayer"))
+    if household["filing_status"] != "single":
+        yield variant(lambda copy: copy["household"].__setitem__("filing_status", "single"))
+    if case["probe"][1] != "single":
+        yield variant(lambda copy: copy["probe"].__setitem__(1, "single"))
+
+    for index, dependent in enumerate(household.get("dependents", [])):
+        if "childcare" in dependent:
+            yield variant(lambda copy, index=index: copy["household"]["dependents"][index].pop("childcare"))
+            for cost in _simpler_numbers(dependent["childcare"].get("annual_cost")):
+                yield variant(lambda copy, index=index, cost=cost:
+                              copy["household"]["dependents"][index]["childcare"].__setitem__("annual_cost", cost))
+        if not dependent["date_of_birth"].endswith("-01-01"):
+            yield variant(lambda copy, index=index: copy["household"]["dependents"][index].__setitem__(
+                "date_of_birth", copy["household"]["dependents"][index]["date_of_birth"][:4] + "-01-01"))
+
+    amounts = [("total_income",), ("taxpayer", "wages"), ("spouse", "wages")]
+    for path in amounts:
+        container = household["income"]
+        for key in path[:-1]:
+            container = container.get(key) or {}
+        for amount in _simpler_numbers(container.get(path[-1])):
+            def edit(copy, path=path, amount=amount):
+                target = copy["household"]["income"]
+                for key in path[:-1]:
+                    target = target[key]
+                target[path[-1]] = amount
+            yield variant(edit)
+    for amount in _simpler_numbers((household.get("education") or {}).get("qualified_expenses")):
+        yield variant(lambda copy, amount=amount: copy["household"]["education"].__setitem__("qualified_expenses", amount))
+    for amount in _simpler_numbers(case["probe"][0]):
+        yield variant(lambda copy, amount=amount: copy["probe"].__setitem__(0, amount))
+
+def shrink(case, engine, line, max_steps=2000):
+    """
+    Greedily simplify a failing case while the engine still mismatches on the same line.
+
+    Returns:
+        dict: The smallest failing case found (the input case if nothing simpler fails).
+    """
+    steps = 0
+    improved = True
+    while improved and steps < max_steps:
+        improved = False
+        for candidate in shrink_candidates(case):
+            steps += 1
+            if _fails(candidate, engine, line):
+                case, improved = candidate, True
+                break
+            if steps >= max_steps:
+                break
+    return case
+
+
+# Runner
+
+def init_worker():
+    from batch_utils import warm_tables
+    warm_tables()
+    get_generator()
+
+def run_chunk(task):
+    """
+    Check one chunk of cases.
+
+    Returns:
+        tuple: (chunk, cases checked, {"engine line": count}, {"engine line": first mismatch})
+    """
+    seed, chunk, size, engines = task
+    counts, examples = {}, {}
+    for case, engine, line, expected, actual in check_cases(generate_chunk(seed, chunk, size), engines):
+        key = f"{engine} {line}"
+        counts[key] = counts.get(key, 0) + 1
+        if key not in examples:
+            examples[key] = {"engine": engine, "line": line, "case": case, "expected": expected, "actual": actual}
+    return chunk, size, counts, examples
+
+def replay(case_id, engines):
+    seed, chunk, index = case_id.rsplit(":", 2)
+    case = generate_chunk(seed, int(chunk), int(index) + 1)[int(index)]
+    print(json.dumps(case, indent=2))
+    print(json.dumps({"reference": reference_lines(case)}, default=str))
+    mismatches = list(check_cases([case], engines))
+    for _, engine, line, expected, actual in mismatches:
+        print(f"MISMATCH {engine} {line}: expected {expected!r}, got {actual!r}")
+    return 1 if mismatches else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Differential test of the fast engines against the scalar forms")
+    parser.add_argument("--cases", type=int, default=100000, help="Cases to generate (default: 100000)")
+    parser.add_argument("--seed", default="0", help="Seed for case generation (default: 0)")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--chunk", type=int, default=2000, help="Cases per worker task (default: 2000)")
+    parser.add_argument("--engines", default=",".join(DEFAULT_ENGINES),
+                        help="Comma-separated engines to check (default: %(default)s)")
+    parser.add_argument("--report", metavar="PATH", help="Write one JSON line per mismatching engine and line, "
+                                                         "with the shrunk case")
+    parser.add_argument("--no-shrink", action="store_true", help="Report the first failing cases as generated")
+    parser.add_argument("--replay", metavar="CASE_ID", help="Re-run one case by its SEED:CHUNK:INDEX ID and print it")
+    args = parser.parse_args(argv)
+
+    engines = [name for name in args.engines.split(",") if name]
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engines {unknown}, expected some of {list(ENGINES)}")
+
+    if args.replay:
+        init_worker()
+        return replay(args.replay, engines)
+
+    tasks = [(args.seed, chunk, min(args.chunk, args.cases - start), engines)
+             for chunk, start in enumerate(range(0, args.cases, args.chunk))]
+    counts, examples, checked = {}, {}, 0
+    start = time.perf_counter()
+    if args.workers == 1:
+        init_worker()
+        results = map(run_chunk, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(args.workers, initializer=init_worker)
+        results = pool.imap_unordered(run_chunk, tasks)
+    try:
+        for chunk, size, chunk_counts, chunk_examples in results:
+            checked += size
+            for key, count in chunk_counts.items():
+                counts[key] = counts.get(key, 0) + count
+            for key, example in chunk_examples.items():
+                # Keep the earliest chunk's example so reports do not depend on scheduling
+                if key not in examples or chunk < examples[key][0]:
+                    examples[key] = (chunk, example)
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        if pool is not None:
+            pool.terminate()
+    elapsed = time.perf_counter() - start
+    print(f"Checked {checked:,} cases against {', '.join(engines)} in {elapsed:.1f}s "
+          f"({checked / elapsed if elapsed else 0:,.0f} cases/s)")
+
+    if not counts:
+        print("No mismatches")
+        return 0
+
+    if args.workers != 1:
+        init_worker()
+    report = open(args.report, 'w') if args.report else None
+    try:
+        for key in sorted(counts):
+            example = examples[key][1]
+            case = example["case"]
+            if not args.no_shrink:
+                case = shrink(case, example["engine"], example["line"])
+                found = [m for m in check_cases([case], [example["engine"]]) if m[2] == example["line"]]
+                example = {**example, "case": case, "expected": found[0][3], "actual": found[0][4]}
+            print(f"MISMATCH {key}: {counts[key]:,} cases; e.g. {case['id']} expected {example['expected']!r}, "
+                  f"got {example['actual']!r}")
+            print(f"    household {json.dumps(case['household'])} probe {json.dumps(case['probe'])}")
+            if report is not None:
+                report.write(json.dumps({"engine": example["engine"], "line": example["line"], "count": counts[key],
+                                         "case": case, "expected": example["expected"],
+                                         "actual": example["actual"]}, default=str) + "\n")
+    finally:
+        if report is not None:
+            report.close()
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Consistency check for the tax data files, and the formula form of the tax table.
+
+Checks Complete_Tax_Tables.json for gaps, overlaps and decreasing tax, the rate schedule
+for non-contiguous brackets and jumps at bracket boundaries, and that the two agree at
+$100,000. It then derives the formula table (band layout plus brackets) and proves it
+equal to the stored table band by band, and does the same for the committed formula file
+(data_paths.tax_table_formula, or --formula) that the "formula" table source loads, so a
+stale or hand-edited file fails. Exits with status 1 on any error; warnings are printed
+but do not fail the check.
+
+--write-formula saves the derived formula table (data_paths.tax_table_formula by default),
+which config.json can use instead of the full table with "tax_table_source": "formula".
+--regenerate writes Complete_Tax_Tables.json style rows computed from a formula file.
+
+Usage:
+    python tools/verify_tax_tables.py [--formula PATH] [--write-formula [PATH]] [--regenerate OUTPUT]
+"""
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'modules'))
+
+from data_utils import data_path, load_config
+from table_utils import FormulaTaxTable, TaxTable
+from table_check_utils import check_tax_data, derive_formula_table, verify_formula_table
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the tax table and rate schedule for consistency")
+    parser.add_argument("--write-formula", nargs="?", const="", metavar="PATH",
+                        help="Write the verified formula table (default: data_paths.tax_table_formula)")
+    parser.add_argument("--regenerate", metavar="OUTPUT", help="Write the full tax table computed from --formula")
+    parser.add_argument("--formula", metavar="PATH", help="Formula table to check, and to read for --regenerate "
+                                                          "(default: data_paths.tax_table_formula)")
+    args = parser.parse_args(argv)
+
+    # Always check the stored JSON table, not whichever source config.json selects
+    tax_table = TaxTable.from_json(data_path('tax_table'))
+
+    if args.regenerate:
+        formula_table = FormulaTaxTable.from_json(args.formula or data_path('tax_table_formula'))
+        with open(args.regenerate, 'w') as file:
+            json.dump(formula_table.to_entries(), file, indent=4)
+        print(f"Wrote {len(formula_table)} rows to {args.regenerate}")
+        return 0
+
+    issues = check_tax_data(tax_table)
+    formula_table = derive_formula_table(tax_table)
+    issues += verify_formula_table(formula_table, tax_table)
+
+    # The committed formula file is what the "formula" table source computes from. It is
+    # about to be replaced when writing one, so it is only checked otherwise.
+    formula_path = args.formula or data_path('tax_table_formula')
+    if args.write_formula is None:
+        if os.path.exists(formula_path):
+            stored_issues = verify_formula_table(FormulaTaxTable.from_json(formula_path), tax_table)
+            issues += [(severity, f"{os.path.basename(formula_path)}: {message}") for severity, message in stored_issues]
+        else:
+            in_use = load_config().get('tax_table_source') == 'formula'
+            issues.append(("error" if in_use else "warning", f"Formula table {formula_path} not found"))
+    for severity, message in issues:
+        print(f"{severity}: {message}")
+
+    errors = sum(1 for severity, _ in issues if severity == "error")
+    print(f"{len(tax_table)} table rows, {len(formula_table.bands)} band runs: "
+          f"{errors} errors, {len(issues) - errors} warnings")
+    if errors:
+        return 1
+
+    if args.write_formula is not None:
+        path = args.write_formula or data_path('tax_table_formula')
+        with open(path, 'w') as file:
+            json.dump(formula_table.as_dict(), file, indent=4)
+        print(f"Formula table written to {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())